@@ -0,0 +1,229 @@
+#   audio.py
+"""
+Subsistema de áudio do jogo, com três categorias: MUSICA, VOZ e EFEITO.
+- Sons curtos (arquivos de até LIMITE_SOM_CURTO_KB) são decodificados uma
+  vez e guardados no cache de recursos, dentro do orçamento de áudio
+  decodificado (ORCAMENTO_AUDIO_DECODIFICADO_MB). Eles tocam nos canais
+  reservados à sua categoria (CANAIS_AUDIO); com todos ocupados, o som que
+  começou há mais tempo é interrompido.
+- A música e as faixas longas (narrações de vários MB decodificados) tocam
+  em streaming pelo mixer.music: o arquivo é decodificado aos poucos,
+  enquanto toca, e quase não ocupa memória. O stream é um só: uma voz longa
+  o toma da música de fundo, que recomeça (com fade) quando a voz termina.
+Cada categoria é parada e consultada separadamente ('parar', 'tocando'),
+sem o pygame.mixer.stop() e o pygame.mixer.get_busy() globais, que também
+atingiam (e esperavam) as outras categorias.
+ANALOGIA: O stream é um recurso não compartilhável com preempção por
+prioridade (a voz tira a música, que volta depois); os canais reservados são
+uma partição fixa do recurso por classe, para que os efeitos nunca tomem o
+canal da voz.
+"""
+import os   # Importa o módulo os para caminhos e tamanhos de arquivo
+import pygame   # Importa o Pygame para o mixer
+from .settings import PASTA_AUDIO, LIMITE_SOM_CURTO_KB, CANAIS_AUDIO
+from .recursos import recursos  # Cache de sons curtos, com o orçamento de áudio decodificado
+from .registro import obter_registro, AUDIO # Registro não bloqueante
+
+log_audio = obter_registro(AUDIO)
+
+# --- Categorias ---
+MUSICA = "musica"
+VOZ = "voz"
+EFEITO = "efeito"
+
+FADE_RETOMADA_MUSICA_MS = 1000  # A música volta com fade depois de uma voz longa
+CANAIS_LIVRES = 4   # Canais não reservados que sobram para Sound.play() avulso
+
+
+class GerenciadorAudio:
+    """Canais reservados por categoria, cache de sons curtos e o stream compartilhado."""
+
+    def __init__(self, canais_por_categoria=CANAIS_AUDIO, limite_som_curto=LIMITE_SOM_CURTO_KB * 1024):
+        self.canais_por_categoria = dict(canais_por_categoria)
+        self.limite_som_curto = limite_som_curto    # Bytes do arquivo acima dos quais a faixa toca em streaming
+        self.canais = {}    # categoria -> lista de pygame.mixer.Channel reservados
+        self._inicio_canais = {}    # categoria -> instante (ms) em que cada canal começou o som atual
+        self._dono_stream = None    # Categoria que está usando o mixer.music (None: livre)
+        self.musica = None  # (caminho, loops) da música de fundo, retomada quando o stream fica livre
+        self._volume_musica = 1.0
+        self.musica_silenciada = False
+        self._avisados = set()  # Arquivos ausentes já avisados (um aviso por arquivo)
+        # --- Estatísticas ---
+        self.faixas_em_streaming = 0    # Faixas (fora a música) tocadas pelo stream
+        self.sons_tocados = 0   # Sons curtos tocados em canais
+        self.interrupcoes = 0   # Sons interrompidos por falta de canal livre na categoria
+
+    def iniciar(self):
+        """Reserva os canais de cada categoria. Deve ser chamado depois de pygame.mixer.init()."""
+        if not pygame.mixer.get_init():
+            log_audio.aviso("Mixer indisponível: o jogo roda sem áudio")
+            return
+        total = sum(self.canais_por_categoria.values())
+        if pygame.mixer.get_num_channels() < total + CANAIS_LIVRES:
+            pygame.mixer.set_num_channels(total + CANAIS_LIVRES)
+        pygame.mixer.set_reserved(total)    # Os primeiros 'total' canais não são escolhidos por Sound.play()
+        indice = 0
+        for categoria, quantidade in self.canais_por_categoria.items():
+            self.canais[categoria] = [pygame.mixer.Channel(indice + i) for i in range(quantidade)]
+            self._inicio_canais[categoria] = [0] * quantidade
+            indice += quantidade
+
+    # --- Reprodução ---
+    def tocar(self, nome, categoria=EFEITO, loops=0):
+        """
+        Toca um áudio na categoria indicada.
+        Args:
+            nome (str): Nome do arquivo em PASTA_AUDIO (ou caminho absoluto).
+            categoria (str): MUSICA, VOZ ou EFEITO.
+            loops (int): Repetições extras (-1: para sempre).
+        Returns:
+            bool: False se o arquivo não existe ou o áudio está indisponível.
+        """
+        if not pygame.mixer.get_init():
+            return False
+        caminho = self._caminho(nome)
+        if caminho is None:
+            return False
+        if categoria == MUSICA:
+            self.musica = (caminho, loops)
+            if self._dono_stream in (None, MUSICA): # Com uma voz longa no stream, a música espera ela terminar
+                return self._tocar_musica()
+            return True
+        if os.path.getsize(caminho) > self.limite_som_curto:
+            return self._tocar_stream(caminho, categoria, loops)
+        som = recursos.som(caminho)
+        if som is None:
+            return False
+        indice = self._escolher_canal(categoria)
+        if indice is None:  # Categoria sem canais reservados: qualquer canal livre
+            canal = pygame.mixer.find_channel(True)
+            if canal is None:
+                return False
+            canal.play(som, loops)
+        else:
+            self.canais[categoria][indice].play(som, loops)
+            self._inicio_canais[categoria][indice] = pygame.time.get_ticks()
+        self.sons_tocados += 1
+        return True
+
+    def pre_carregar(self, nome):
+        """
+        Decodifica em segundo plano um som curto que vai tocar em breve
+        (faixas longas não precisam: o stream abre na hora).
+        """
+        if not pygame.mixer.get_init():
+            return
+        caminho = self._caminho(nome)
+        if caminho is not None and os.path.getsize(caminho) <= self.limite_som_curto:
+            recursos.pre_carregar(recursos.som, caminho)
+
+    def _caminho(self, nome):
+        """Caminho completo do arquivo, ou None (com um aviso por arquivo) se ele não existir."""
+        caminho = nome if os.path.isabs(nome) else os.path.join(PASTA_AUDIO, nome)
+        if os.path.exists(caminho):
+            return caminho
+        if caminho not in self._avisados:
+            self._avisados.add(caminho)
+            log_audio.aviso("Áudio não encontrado em %s", caminho)
+        return None
+
+    def _escolher_canal(self, categoria):
+        """Índice de um canal livre da categoria; se todos estiverem ocupados, o que começou há mais tempo."""
+        canais = self.canais.get(categoria)
+        if not canais:
+            return None
+        for indice, canal in enumerate(canais):
+            if not canal.get_busy():
+                return indice
+        inicios = self._inicio_canais[categoria]
+        indice = inicios.index(min(inicios))
+        canais[indice].stop()
+        self.interrupcoes += 1
+        return indice
+
+    def _tocar_stream(self, caminho, categoria, loops, volume=1.0, fade_ms=0):
+        """Toca 'caminho' pelo mixer.music (substituindo o que estiver no stream)."""
+        try:
+            pygame.mixer.music.load(caminho)
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(loops, fade_ms=fade_ms)
+        except pygame.error as e:
+            log_audio.aviso("Não foi possível tocar %s: %s", caminho, e)
+            self._dono_stream = None
+            return False
+        self._dono_stream = categoria
+        if categoria != MUSICA:
+            self.faixas_em_streaming += 1
+        return True
+
+    def _tocar_musica(self, fade_ms=0):
+        caminho, loops = self.musica
+        if not self._tocar_stream(caminho, MUSICA, loops, self._volume_musica, fade_ms):
+            return False
+        if self.musica_silenciada:
+            pygame.mixer.music.pause()
+        return True
+
+    def atualizar(self):
+        """Chamado uma vez por frame: devolve o stream à música quando uma faixa longa termina."""
+        if self._dono_stream in (None, MUSICA) or pygame.mixer.music.get_busy():
+            return
+        self._dono_stream = None
+        if self.musica is not None:
+            self._tocar_musica(FADE_RETOMADA_MUSICA_MS)
+
+    # --- Controle por categoria ---
+    def parar(self, categoria):
+        """Para tudo o que toca na categoria (canais e, se for dela, o stream)."""
+        for canal in self.canais.get(categoria, ()):
+            canal.stop()
+        if categoria == MUSICA:
+            self.musica = None
+        if self._dono_stream == categoria:
+            pygame.mixer.music.stop()
+            self._dono_stream = None
+            if self.musica is not None:
+                self._tocar_musica(FADE_RETOMADA_MUSICA_MS)
+
+    def tocando(self, categoria):
+        """True se algum som da categoria está tocando (nos canais dela ou no stream)."""
+        if any(canal.get_busy() for canal in self.canais.get(categoria, ())):
+            return True
+        return self._dono_stream == categoria and pygame.mixer.music.get_busy()
+
+    def silenciar_musica(self, silenciar):
+        """Pausa (ou retoma) a música de fundo; as vozes e os efeitos continuam."""
+        self.musica_silenciada = silenciar
+        if self._dono_stream == MUSICA:
+            if silenciar:
+                pygame.mixer.music.pause()
+            else:
+                pygame.mixer.music.unpause()
+
+    @property
+    def volume_musica(self):
+        return self._volume_musica
+
+    @volume_musica.setter
+    def volume_musica(self, volume):
+        self._volume_musica = volume
+        if self._dono_stream == MUSICA:
+            pygame.mixer.music.set_volume(volume)
+
+    def get_estatisticas(self):
+        """Retorna o dono do stream, o uso dos canais e a memória do áudio decodificado."""
+        estatisticas_cache = recursos.get_estatisticas()
+        return {
+            'stream': self._dono_stream,
+            'canais_ocupados': {categoria: sum(1 for canal in canais if canal.get_busy())
+                                for categoria, canais in self.canais.items()},
+            'faixas_em_streaming': self.faixas_em_streaming,
+            'sons_tocados': self.sons_tocados,
+            'interrupcoes': self.interrupcoes,
+            'bytes_decodificados': estatisticas_cache['bytes_som'],
+            'orcamento_bytes': estatisticas_cache['limite_bytes_som']
+        }
+
+
+# Instância única, compartilhada por todo o processo
+audio = GerenciadorAudio()
@@ -0,0 +1,250 @@
+#   game/agendador.py
+"""
+Agendador de tarefas periódicas com uma única thread despachante.
+Em vez de uma thread por esteira (cada uma dormindo em 'time.sleep'), todas
+as tarefas ficam em um heap ordenado pelo próximo instante de disparo. A
+thread despachante dorme até o disparo mais próximo, executa as tarefas
+vencidas e as reagenda. O custo é uma thread para qualquer número de
+esteiras, e inserir/reagendar custa O(log n).
+ANALOGIA: É o que o escalonador do sistema operacional faz com a fila de
+processos "dormindo" (sleep queue) ordenada pelo instante de acordar: um
+único temporizador acorda o processo certo na hora certa.
+Os intervalos podem ser alterados em tempo de execução (por exemplo, pelo
+'EscalonadorJogo' ao subir de nível). Os disparos seguem uma grade fixa
+(próximo = anterior + intervalo), então atrasos não se acumulam.
+'AgendadorSimulado' oferece a mesma interface sem thread, avançado pelo
+relógio da simulação sem janela.
+"""
+import heapq    # Importa heapq para a fila de prioridade dos próximos disparos
+import itertools    # Importa itertools para desempatar disparos no mesmo instante
+import threading    # Importa threading para a thread despachante e a sincronização
+import time # Importa time para o relógio monotônico
+from ..registro import obter_registro, SISTEMA  # Registro não bloqueante
+
+log_sistema = obter_registro(SISTEMA)
+
+
+class TarefaPeriodica:
+    """
+    Uma tarefa registrada no agendador. Guarde a referência para alterar o
+    intervalo ou cancelar a tarefa.
+    """
+    __slots__ = ('funcao', 'intervalo', 'proximo_disparo', 'disparos', 'ativa', '_geracao', '_agendador')
+
+    def __init__(self, agendador, funcao, intervalo):
+        self._agendador = agendador
+        self.funcao = funcao    # Chamada (sem argumentos) a cada disparo
+        self.intervalo = intervalo  # Segundos entre disparos
+        self.proximo_disparo = 0.0  # Instante (time.monotonic) do próximo disparo
+        self.disparos = 0   # Quantas vezes a tarefa já foi executada
+        self.ativa = True
+        self._geracao = 0   # Invalida entradas antigas do heap quando a tarefa é reagendada
+
+    def alterar_intervalo(self, intervalo):
+        """Troca o intervalo; o próximo disparo passa a ser o último + novo intervalo."""
+        self._agendador.alterar_intervalo(self, intervalo)
+
+    def cancelar(self):
+        """Remove a tarefa do agendador."""
+        self._agendador.cancelar(self)
+
+
+class AgendadorBase:
+    """
+    Heap de próximos disparos, comum ao agendador com thread e ao simulado.
+    Entradas do heap: (instante, desempate, geração, tarefa). Reagendar ou
+    cancelar não remove a entrada antiga do heap: ela é descartada quando
+    chega ao topo porque sua geração não é mais a da tarefa.
+    As subclasses definem o relógio ('_agora', em segundos).
+    """
+    permite_bloqueio = True # Se as tarefas podem esperar (com prazo) sem travar quem avança o relógio
+
+    def __init__(self):
+        self._heap = []
+        self._contador = itertools.count()  # Desempate estável entre disparos no mesmo instante
+        self._condicao = threading.Condition()  # Protege o heap (e acorda a despachante, se houver)
+        self.tarefas_ativas = 0
+
+    def _agora(self):
+        """Relógio do agendador (s); implementado pelas subclasses."""
+        raise NotImplementedError("As subclasses de AgendadorBase definem o relógio ('_agora')")
+
+    def instante(self):
+        """Instante atual (s) no relógio do agendador, para carimbar eventos das tarefas."""
+        return self._agora()
+
+    # --- Registro de tarefas ---
+    def agendar(self, funcao, intervalo, primeiro_disparo=None):
+        """
+        Registra 'funcao' para ser chamada a cada 'intervalo' segundos.
+        Args:
+            funcao (callable): Executada na thread despachante; deve ser rápida e não bloquear.
+            intervalo (float): Segundos entre disparos.
+            primeiro_disparo (float, optional): Atraso do primeiro disparo (padrão: um intervalo).
+        Returns:
+            TarefaPeriodica: Referência para alterar o intervalo ou cancelar.
+        """
+        tarefa = TarefaPeriodica(self, funcao, intervalo)
+        atraso = intervalo if primeiro_disparo is None else primeiro_disparo
+        with self._condicao:
+            tarefa.proximo_disparo = self._agora() + atraso
+            self._inserir(tarefa)
+            self.tarefas_ativas += 1
+        return tarefa
+
+    def alterar_intervalo(self, tarefa, intervalo):
+        """Troca o intervalo de uma tarefa, reposicionando seu próximo disparo no heap."""
+        with self._condicao:
+            if not tarefa.ativa:
+                tarefa.intervalo = intervalo
+                return
+            # O próximo disparo passa a contar a partir do último (ou do registro)
+            ultimo = tarefa.proximo_disparo - tarefa.intervalo
+            tarefa.intervalo = intervalo
+            tarefa.proximo_disparo = max(ultimo + intervalo, self._agora())
+            tarefa._geracao += 1
+            self._inserir(tarefa)
+
+    def cancelar(self, tarefa):
+        """Desativa a tarefa (a entrada no heap é descartada ao chegar ao topo)."""
+        with self._condicao:
+            if tarefa.ativa:
+                tarefa.ativa = False
+                tarefa._geracao += 1
+                self.tarefas_ativas -= 1
+
+    def _inserir(self, tarefa):
+        """Coloca a tarefa no heap (com o lock adquirido) e acorda a despachante se ela virou a primeira."""
+        entrada = (tarefa.proximo_disparo, next(self._contador), tarefa._geracao, tarefa)
+        heapq.heappush(self._heap, entrada)
+        if self._heap[0] is entrada:    # Disparo mais cedo que o esperado pela despachante
+            self._condicao.notify()
+
+    def _retirar_vencidas(self, agora, vencidas):
+        """
+        Retira do heap (com o lock adquirido) as tarefas vencidas até 'agora',
+        já reagendadas na grade fixa, e as acrescenta a 'vencidas'.
+        Returns:
+            list: Atraso (s) de cada disparo em relação ao instante agendado.
+        """
+        atrasos = []
+        while self._heap and self._heap[0][0] <= agora:
+            instante, _, geracao, tarefa = heapq.heappop(self._heap)
+            if geracao != tarefa._geracao or not tarefa.ativa:
+                continue
+            atrasos.append(agora - instante)
+            tarefa.disparos += 1
+            # Se ficou para trás mais de um intervalo, não dispara em rajada
+            tarefa.proximo_disparo = max(instante + tarefa.intervalo, agora)
+            self._inserir(tarefa)
+            vencidas.append(tarefa)
+        return atrasos
+
+    @staticmethod
+    def _executar(vencidas):
+        """Executa as tarefas fora do lock: elas podem agendar ou alterar intervalos."""
+        for tarefa in vencidas:
+            try:
+                tarefa.funcao()
+            except Exception as e:  # Uma tarefa com erro não derruba as outras
+                log_sistema.erro("Tarefa agendada falhou: %s", e)
+        vencidas.clear()
+
+
+class AgendadorPeriodico(AgendadorBase, threading.Thread):
+    """Thread despachante de tarefas periódicas (heap de próximos disparos)."""
+    def __init__(self, nome="AgendadorPeriodico"):
+        AgendadorBase.__init__(self)
+        threading.Thread.__init__(self, name=nome)
+        self.daemon = True  # Permite que o programa termine mesmo se 'parar' não for chamado
+        self._rodando = True
+        # --- Estatísticas de atraso (instante real do disparo - instante agendado) ---
+        self.disparos = 0
+        self.atraso_total = 0.0
+        self.atraso_maximo = 0.0
+
+    def _agora(self):
+        return time.monotonic()
+
+    # --- Thread despachante ---
+    def run(self):
+        vencidas = []
+        while True:
+            with self._condicao:
+                while self._rodando:
+                    self._descartar_invalidas()
+                    if not self._heap:
+                        self._condicao.wait()
+                        continue
+                    espera = self._heap[0][0] - time.monotonic()
+                    if espera <= 0:
+                        break
+                    self._condicao.wait(espera)
+                if not self._rodando:
+                    return
+                atrasos = self._retirar_vencidas(time.monotonic(), vencidas)
+                self.disparos += len(atrasos)
+                self.atraso_total += sum(atrasos)
+                self.atraso_maximo = max(self.atraso_maximo, max(atrasos, default=0.0))
+            self._executar(vencidas)
+
+    def _descartar_invalidas(self):
+        """Remove do topo do heap as entradas de tarefas canceladas ou reagendadas."""
+        heap = self._heap
+        while heap and (heap[0][2] != heap[0][3]._geracao or not heap[0][3].ativa):
+            heapq.heappop(heap)
+
+    def sinalizar_parada(self):
+        """Pede o encerramento sem esperar: acorda a despachante, que sai do 'wait' na hora."""
+        with self._condicao:
+            self._rodando = False
+            self._condicao.notify_all()
+
+    def parar(self, timeout=1.0):
+        """Encerra a thread despachante (as tarefas deixam de disparar) e aguarda até 'timeout'."""
+        self.sinalizar_parada()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
+
+    def get_estatisticas(self):
+        """Disparos realizados e atraso médio/máximo em relação ao instante agendado (ms)."""
+        with self._condicao:
+            return {
+                'tarefas': self.tarefas_ativas,
+                'disparos': self.disparos,
+                'atraso_medio_ms': (self.atraso_total / self.disparos * 1000.0) if self.disparos else 0.0,
+                'atraso_maximo_ms': self.atraso_maximo * 1000.0
+            }
+
+
+class AgendadorSimulado(AgendadorBase):
+    """
+    Mesma interface do 'AgendadorPeriodico', mas sem thread: as tarefas
+    disparam quando 'avancar' recebe um instante (em segundos) igual ou
+    posterior ao agendado, na thread de quem chamou.
+    Usado pela simulação sem janela, que avança no próprio relógio (muito mais
+    rápido que o tempo real) e continua usando os produtores como origem dos
+    presentes.
+    """
+    permite_bloqueio = False    # Esperar travaria a própria simulação, que é quem avança o relógio
+
+    def __init__(self, agora=0.0):
+        super().__init__()
+        self.agora = agora  # Relógio simulado (s)
+        self.disparos = 0
+
+    def _agora(self):
+        return self.agora
+
+    def avancar(self, agora):
+        """Avança o relógio até 'agora' (s) e executa as tarefas vencidas."""
+        vencidas = []
+        with self._condicao:
+            self.agora = agora
+            self.disparos += len(self._retirar_vencidas(agora, vencidas))
+        self._executar(vencidas)
+
+    def get_estatisticas(self):
+        """Tarefas ativas e disparos realizados."""
+        with self._condicao:
+            return {'tarefas': self.tarefas_ativas, 'disparos': self.disparos}
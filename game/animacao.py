@@ -0,0 +1,147 @@
+#   game/animacao.py
+"""
+Animações pré-calculadas para os sprites do jogo.
+Um 'CicloAnimacao' guarda todos os quadros de um ciclo já prontos (reescalados
+e convertidos) e é compartilhado, pelo gerenciador de recursos, entre todas as
+instâncias que usam a mesma animação. Cada sprite mantém apenas uma
+'Animacao', que escolhe o quadro pelo tempo decorrido: tocar a animação é
+uma indexação em lista, sem reescalar nem alocar superfícies por frame.
+"""
+import math     # Importa math para o seno da animação de pulsar
+import pygame   # Importa o Pygame para superfícies e transformações
+from ..recursos import recursos # Cache compartilhado de imagens e recursos derivados
+
+AMOSTRAS_PULSO = 32 # Quantos quadros são pré-calculados para um ciclo de pulsação
+
+
+class CicloAnimacao:
+    """
+    Sequência imutável de quadros que se repete com duração total fixa.
+    Todos os quadros têm o mesmo tamanho, para que o retângulo do sprite
+    não mude durante a animação.
+    """
+    def __init__(self, quadros, duracao_ms):
+        """
+        Args:
+            quadros (list): Superfícies do ciclo, na ordem de exibição.
+            duracao_ms (float): Duração de um ciclo completo, em milissegundos.
+        """
+        self.quadros = tuple(quadros)
+        self.duracao_ms = duracao_ms
+        self.tamanho = self.quadros[0].get_size()
+
+    def __len__(self):
+        return len(self.quadros)
+
+    def indice_em(self, tempo_ms):
+        """Índice do quadro exibido 'tempo_ms' milissegundos após o início do ciclo."""
+        return int(tempo_ms * len(self.quadros) / self.duracao_ms) % len(self.quadros)
+
+    def custo_bytes(self):
+        """Memória estimada ocupada pelos quadros (usada pelo limite do cache)."""
+        return sum(q.get_width() * q.get_height() * q.get_bytesize() for q in self.quadros)
+
+
+class Animacao:
+    """
+    Reprodução de um ciclo compartilhado por um sprite.
+    Guarda apenas o instante de início e o quadro atual; pausar congela o
+    quadro exibido e retomar continua a partir dele.
+    """
+    def __init__(self, ciclo, agora_ms=None):
+        """
+        Args:
+            ciclo (CicloAnimacao): Ciclo a ser reproduzido.
+            agora_ms (int, optional): Instante de início; por padrão, pygame.time.get_ticks().
+        """
+        self.ciclo = ciclo
+        self.inicio_ms = pygame.time.get_ticks() if agora_ms is None else agora_ms
+        self.indice = 0 # Quadro exibido atualmente
+        self.pausada = False
+        self._pausada_em = 0    # Tempo de ciclo no momento da pausa
+
+    @property
+    def quadro(self):
+        """Superfície do quadro atual."""
+        return self.ciclo.quadros[self.indice]
+
+    def atualizar(self, agora_ms=None):
+        """
+        Avança para o quadro correspondente ao tempo atual.
+        Returns:
+            bool: True se o quadro mudou (o sprite precisa trocar de imagem).
+        """
+        if self.pausada:
+            return False
+        agora_ms = pygame.time.get_ticks() if agora_ms is None else agora_ms
+        indice = self.ciclo.indice_em(agora_ms - self.inicio_ms)
+        if indice == self.indice:
+            return False
+        self.indice = indice
+        return True
+
+    def pausar(self, agora_ms=None):
+        """Congela a animação no quadro atual."""
+        if not self.pausada:
+            agora_ms = pygame.time.get_ticks() if agora_ms is None else agora_ms
+            self._pausada_em = agora_ms - self.inicio_ms
+            self.pausada = True
+
+    def retomar(self, agora_ms=None):
+        """Continua a animação do ponto em que foi pausada."""
+        if self.pausada:
+            agora_ms = pygame.time.get_ticks() if agora_ms is None else agora_ms
+            self.inicio_ms = agora_ms - self._pausada_em
+            self.pausada = False
+
+
+# --- Construção dos ciclos (cada ciclo é criado uma única vez por processo) ---
+def ciclo_quadros(nomes, tamanho, intervalo_ms):
+    """
+    Ciclo formado por arquivos de imagem, cada um exibido por 'intervalo_ms'.
+    Args:
+        nomes (tuple): Nomes dos arquivos em PASTA_IMAGENS, na ordem da animação.
+        tamanho (tuple): Tamanho (largura, altura) dos quadros.
+        intervalo_ms (int): Tempo de exibição de cada quadro.
+    """
+    nomes, tamanho = tuple(nomes), tuple(tamanho)
+
+    def criar():
+        # As imagens já reescaladas vêm do cache de imagens; o ciclo só as referencia
+        ciclo = CicloAnimacao([recursos.imagem(nome, tamanho) for nome in nomes], intervalo_ms * len(nomes))
+        return ciclo, 0 # Os quadros já são contabilizados pelo cache de imagens
+
+    return recursos.derivado(('quadros', nomes, tamanho, intervalo_ms), criar)
+
+
+def ciclo_pulsar(nome, tamanho, amplitude, periodo_ms, amostras=AMOSTRAS_PULSO):
+    """
+    Ciclo de uma imagem que aumenta e diminui de tamanho seguindo um seno.
+    Cada quadro é desenhado centralizado em uma tela do tamanho máximo do
+    pulso, então todos os quadros têm o mesmo tamanho.
+    Args:
+        nome (str): Nome do arquivo em PASTA_IMAGENS.
+        tamanho (tuple): Tamanho base (largura, altura) da imagem.
+        amplitude (float): Variação relativa do tamanho (0.1 = ±10%).
+        periodo_ms (float): Duração de uma pulsação completa.
+        amostras (int): Quantos quadros são pré-calculados no ciclo.
+    """
+    tamanho = tuple(tamanho)
+
+    def criar():
+        base = recursos.imagem(nome, tamanho)
+        largura_max = int(tamanho[0] * (1.0 + amplitude))
+        altura_max = int(tamanho[1] * (1.0 + amplitude))
+        quadros = []
+        for i in range(amostras):
+            escala = 1.0 + math.sin(2 * math.pi * i / amostras) * amplitude
+            img = pygame.transform.scale(base, (int(tamanho[0] * escala), int(tamanho[1] * escala)))
+            quadro = pygame.Surface((largura_max, altura_max), pygame.SRCALPHA)
+            quadro.blit(img, img.get_rect(center=(largura_max // 2, altura_max // 2)))
+            if pygame.display.get_surface() is not None:    # convert_alpha() exige uma janela criada
+                quadro = quadro.convert_alpha()
+            quadros.append(quadro)
+        ciclo = CicloAnimacao(quadros, periodo_ms)
+        return ciclo, ciclo.custo_bytes()
+
+    return recursos.derivado(('pulsar', nome, tamanho, amplitude, periodo_ms, amostras), criar)
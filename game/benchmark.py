@@ -0,0 +1,509 @@
+#   game/benchmark.py
+"""
+Benchmark de tempo de frame dos caminhos de atualização e de desenho.
+Monta a mesma cena do 'game_loop' (esteiras, mesa, elfo, HUD e presentes
+caindo) sem janela visível (SDL_VIDEODRIVER=dummy) e mede, frame a frame:
+    - fisica:   queda dos presentes (estado lógico);
+    - update:   sprites de cenário e dos presentes (update);
+    - desenho:  renderização por retângulos sujos (RenderizadorCena.desenhar);
+    - hud:      atualização do painel de estatísticas e dos textos da cena;
+    - frame:    soma de todas as etapas acima.
+Cada medida é feita com 6, 100, 1.000 e 10.000 presentes na cena e resumida em
+percentis (p50/p95/p99, em ms). As operações do 'GerenciadorMesa' (mutex +
+variáveis de condição) são medidas à parte, por operação, e a vazão da mesa
+(itens/s) é medida com várias capacidades, produtores, consumidores e lotes.
+A física dos presentes em queda (passo + posições de desenho em lote) é
+medida sozinha, com a versão em Python e a vetorizada (NumPy, se instalado),
+com até dezenas de milhares de presentes.
+O atraso de disparo dos produtores (instante real - instante agendado) é
+medido com o 'AgendadorPeriodico' e, para referência, com o modelo antigo
+de uma thread por esteira dormindo em 'time.sleep', em ambos os casos com a
+thread principal ocupada (como no loop de frames, disputando o GIL).
+O resultado pode ser salvo em JSON e comparado com uma execução anterior: uma
+métrica que piorar mais que o limiar é reportada como regressão.
+Uso:
+    python -m so_projeto_final.game.benchmark --saida base.json
+    python -m so_projeto_final.game.benchmark --comparar base.json --limiar 0.15
+"""
+import os   # Importa os para configurar o driver de vídeo antes do Pygame
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")   # Sem janela visível
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import sys  # Importa sys para o código de saída do programa
+import json # Importa json para salvar e comparar resultados
+import time # Importa time para o relógio de alta resolução (perf_counter)
+import random   # Importa random para posicionar os presentes
+import platform # Importa platform para registrar o ambiente da medição
+import threading    # Importa threading para os produtores e consumidores da medição de vazão
+import pygame   # Importa o Pygame para a cena e os sprites
+from ..settings import LARGURA_TELA, ALTURA_TELA, FPS, FONTE_PATH, FONTE_BOLD_PATH, VAGAS_NA_MESA
+from ..recursos import recursos # Cache compartilhado de imagens, fontes e sons
+from ..ui.screens import GameBackground
+from .entities import Esteira, Elfo, MesaDePresentes, Presente
+from .hud import criar_painel_estatisticas, criar_painel_instrucoes
+from .mechanics import GerenciadorMesa
+from .agendador import AgendadorPeriodico
+from .renderizador import RenderizadorCena, SpriteTexto, CAMADA_CENARIO, CAMADA_ELFO, CAMADA_PRESENTES, CAMADA_HUD
+from .simulacao import (LayoutOficina, PresenteLogico, ElfoLogico, MesaLogica, TIPOS_PRESENTE, TAMANHO_PRESENTE,
+                        criar_indice_presentes)
+from .fisica_vetorizada import NUMPY_DISPONIVEL
+
+QUANTIDADES_PRESENTES = (6, 100, 1000, 10000)  # Tamanhos de cena medidos por padrão
+FRAMES_PADRAO = 200 # Frames medidos em cada cena
+FRAMES_AQUECIMENTO = 10 # Frames descartados antes da medição (cache de recursos, primeiro flip)
+OPERACOES_MESA_PADRAO = 20000   # Operações medidas no GerenciadorMesa
+LIMIAR_REGRESSAO = 0.15 # Piora relativa (15%) a partir da qual uma métrica é regressão
+PISO_REGRESSAO_MS = 0.05    # Diferenças absolutas menores que isso são tratadas como ruído
+# Configurações de vazão da mesa: (capacidade, produtores, consumidores, itens por lote)
+CONFIGURACOES_VAZAO = ((VAGAS_NA_MESA, 1, 1, 1), (1000, 4, 4, 1), (1000, 4, 4, 64), (20000, 8, 8, 256))
+ITENS_VAZAO_PADRAO = 200000 # Itens que atravessam a mesa em cada configuração
+ESTEIRAS_AGENDADOR = (3, 100, 1000) # Quantidades de esteiras na medição de atraso de disparo
+INTERVALO_AGENDADOR_S = 0.2 # Intervalo de produção usado na medição de atraso
+DURACAO_AGENDADOR_S = 1.0   # Duração de cada medição de atraso
+QUANTIDADES_FISICA = (1000, 10000, 50000) # Presentes em queda na medição da física
+FISICAS = ('python', 'numpy') if NUMPY_DISPONIVEL else ('python',)  # Físicas medidas por padrão
+PERCENTIS = (50, 95, 99)
+ETAPAS = ('fisica', 'update', 'desenho', 'hud', 'frame')
+VERSAO_FORMATO = 1  # Versão do formato do JSON de resultados
+
+
+def percentil(amostras_ordenadas, p):
+    """Percentil 'p' (0-100) pelo método do posto mais próximo."""
+    if not amostras_ordenadas:
+        return 0.0
+    indice = max(0, min(len(amostras_ordenadas) - 1, int(round(p / 100.0 * len(amostras_ordenadas))) - 1))
+    return amostras_ordenadas[indice]
+
+
+def resumir(amostras_s):
+    """Converte tempos em segundos em um resumo em ms (média, máximo e percentis)."""
+    ordenadas = sorted(t * 1000.0 for t in amostras_s)
+    resumo = {f"p{p}": round(percentil(ordenadas, p), 4) for p in PERCENTIS}
+    resumo['media'] = round(sum(ordenadas) / max(1, len(ordenadas)), 4)
+    resumo['max'] = round(ordenadas[-1], 4) if ordenadas else 0.0
+    return resumo
+
+
+class CenaBenchmark:
+    """
+    Cena de jogo montada como no 'game_loop', com uma quantidade fixa de
+    presentes. Os presentes que chegam ao chão voltam para o topo da esteira,
+    então a carga se mantém constante durante toda a medição.
+    """
+    def __init__(self, screen, num_presentes, semente=0):
+        self.screen = screen
+        self.rng = random.Random(semente)
+        self.layout = LayoutOficina()
+        self.dt_ms = 1000.0 / FPS   # Um passo de simulação por frame
+        self.renderizador = RenderizadorCena(screen, GameBackground().image)
+        self.cenario_sprites = pygame.sprite.Group()
+        self.presentes_sprites = pygame.sprite.Group()
+
+        self.esteiras = [Esteira(position=p, size=(200, 60)) for p in self.layout.posicoes_esteiras]
+        self.mesa = MesaLogica()
+        self.mesa_sprite = MesaDePresentes(position=self.layout.posicao_mesa, estado=self.mesa)
+        self.elfo = ElfoLogico(len(self.layout.posicoes_elfo))
+        self.player = Elfo(positions=self.layout.posicoes_elfo, estado=self.elfo)
+        self.cenario_sprites.add(self.esteiras, self.mesa_sprite, self.player)
+        self.renderizador.adicionar(self.esteiras + [self.mesa_sprite], CAMADA_CENARIO)
+        self.renderizador.adicionar(self.player, CAMADA_ELFO)
+
+        # --- Presentes distribuídos entre o topo das esteiras e o chão ---
+        self.topo = self.layout.topo_esteiras + 30
+        self.limite = self.layout.altura + TAMANHO_PRESENTE / 2
+        self.presentes = []
+        for i in range(num_presentes):
+            esteira = self.rng.randrange(self.layout.num_esteiras)
+            presente = PresenteLogico(i, esteira, self.rng.choice(TIPOS_PRESENTE), self.layout.centros_esteiras[esteira],
+                                      self.rng.uniform(self.topo, self.limite), self.rng.uniform(120.0, 240.0))
+            self.presentes.append(presente)
+            sprite = Presente(self.esteiras[esteira], presente)
+            self.presentes_sprites.add(sprite)
+            self.renderizador.adicionar(sprite, CAMADA_PRESENTES)
+
+        # --- HUD ---
+        font = recursos.fonte(FONTE_PATH, 24)
+        font_small = recursos.fonte(FONTE_PATH, 18)
+        self.painel_stats = criar_painel_estatisticas(font, font_small)
+        self.painel_instrucoes = criar_painel_instrucoes(font_small, ["SETAS/WASD: Mover", "ESC: Sair"])
+        self.texto_carga = SpriteTexto(recursos.fonte(FONTE_BOLD_PATH, 20))
+        self.renderizador.adicionar([self.painel_stats, self.painel_instrucoes, self.texto_carga], CAMADA_HUD)
+        self.frame = 0
+
+    def mover(self):
+        """Avança a queda de todos os presentes em um passo."""
+        dt_s = self.dt_ms / 1000.0
+        for presente in self.presentes:
+            presente.y_anterior = presente.y
+            presente.y += presente.velocidade * dt_s
+            if presente.y > self.limite:    # Volta para o topo para manter a carga constante
+                presente.y = presente.y_anterior = self.topo
+
+    def atualizar_sprites(self):
+        """Update dos sprites, como no 'game_loop' (o elfo muda de posição de tempos em tempos)."""
+        if self.frame % 30 == 0:
+            self.elfo.move("right" if (self.frame // 30) % 4 < 2 else "left")
+        self.cenario_sprites.update()
+        self.presentes_sprites.update(1.0)
+
+    def atualizar_hud(self):
+        """HUD com valores que mudam em ritmos diferentes, como numa partida."""
+        self.frame += 1
+        self.elfo.presentes_carregados = (self.frame // 20) % 4
+        if self.elfo.presentes_carregados > 0:
+            self.texto_carga.set_texto(f"{self.elfo.presentes_carregados}", (255, 255, 255),
+                                       midbottom=(self.player.rect.centerx, self.player.rect.top - 5))
+        else:
+            self.texto_carga.esconder()
+        self.painel_stats.atualizar({
+            'pontuacao': (self.frame // 60) * 10,
+            'nivel': 1 + self.frame // 600,
+            'mesa': (len(self.mesa.itens), self.mesa.capacidade),
+            'proc_auto': self.mesa.processamento_ativo,
+            'processados': self.frame // 60,
+            'vel_proc': self.mesa.tempo_processamento,
+            'perdidos': self.frame // 90,
+            'penalidade': (self.frame // 90) * 10,
+            'caindo': len(self.presentes_sprites)
+        })
+
+    def desenhar(self):
+        self.renderizador.desenhar()
+
+
+def medir_cena(screen, num_presentes, frames=FRAMES_PADRAO, semente=0):
+    """
+    Mede os tempos de cada etapa do frame para uma cena com 'num_presentes'.
+    Returns:
+        dict: etapa -> resumo em ms (ver 'resumir').
+    """
+    cena = CenaBenchmark(screen, num_presentes, semente)
+    relogio = time.perf_counter
+    amostras = {etapa: [] for etapa in ETAPAS}
+    for i in range(FRAMES_AQUECIMENTO + frames):
+        t0 = relogio()
+        cena.mover()
+        t1 = relogio()
+        cena.atualizar_sprites()
+        t2 = relogio()
+        cena.atualizar_hud()
+        t3 = relogio()
+        cena.desenhar()
+        t4 = relogio()
+        pygame.event.pump() # Mantém o driver de vídeo responsivo
+        if i < FRAMES_AQUECIMENTO:
+            continue
+        amostras['fisica'].append(t1 - t0)
+        amostras['update'].append(t2 - t1)
+        amostras['hud'].append(t3 - t2)
+        amostras['desenho'].append(t4 - t3)
+        amostras['frame'].append(t4 - t0)
+    return {etapa: resumir(valores) for etapa, valores in amostras.items()}
+
+
+def medir_fisica(fisica, num_presentes, frames=FRAMES_PADRAO, semente=0):
+    """
+    Mede um passo da física dos presentes (queda, retirada dos que passaram
+    do chão e posições de desenho em lote) com 'num_presentes' em queda. Os
+    que caem renascem no topo, mantendo a carga constante.
+    """
+    rng = random.Random(semente)
+    layout = LayoutOficina()
+    topo = layout.topo_esteiras + 30
+    limite = layout.altura + TAMANHO_PRESENTE / 2
+    indice = criar_indice_presentes(layout.num_esteiras, fisica)
+    for i in range(num_presentes):
+        esteira = rng.randrange(layout.num_esteiras)
+        indice.criar(i, esteira, rng.choice(TIPOS_PRESENTE), layout.centros_esteiras[esteira],
+                     rng.uniform(topo, limite), rng.uniform(120.0, 240.0))
+    dt_s = 1.0 / FPS
+    relogio = time.perf_counter
+    amostras = []
+    for i in range(FRAMES_AQUECIMENTO + frames):
+        t0 = relogio()
+        for presente in indice.mover(dt_s, limite):
+            indice.criar(presente.id, presente.esteira, presente.tipo, presente.x, topo, presente.velocidade)
+        for _ in indice.posicoes_interpoladas(0.5):
+            pass
+        t1 = relogio()
+        if i >= FRAMES_AQUECIMENTO:
+            amostras.append(t1 - t0)
+    return resumir(amostras)
+
+
+def medir_mesa(operacoes=OPERACOES_MESA_PADRAO):
+    """
+    Mede o custo de cada operação do 'GerenciadorMesa': o elfo entrega até
+    a mesa encher e o processamento retira até ela esvaziar, alternadamente.
+    """
+    mesa = GerenciadorMesa(VAGAS_NA_MESA)
+    relogio = time.perf_counter
+    amostras = {'adicionar': [], 'remover': [], 'status': []}
+    enchendo = True
+    for i in range(operacoes):
+        t0 = relogio()
+        if enchendo:
+            mesa.adicionar_presente({'id': i})
+        else:
+            mesa.remover_presente()
+        t1 = relogio()
+        mesa.get_status()
+        t2 = relogio()
+        amostras['adicionar' if enchendo else 'remover'].append(t1 - t0)
+        amostras['status'].append(t2 - t1)
+        if mesa.esta_cheia():
+            enchendo = False
+        elif mesa.esta_vazia():
+            enchendo = True
+    return {operacao: resumir(valores) for operacao, valores in amostras.items()}
+
+
+def medir_vazao_mesa(capacidade, produtores, consumidores, lote=1, itens=ITENS_VAZAO_PADRAO):
+    """
+    Quantos itens por segundo atravessam a mesa com várias threads produtoras
+    e consumidoras usando as operações bloqueantes (lote=1: um item por
+    chamada; lote>1: 'adicionar_lote'/'remover_lote').
+    """
+    mesa = GerenciadorMesa(capacidade)
+    por_produtor = itens // produtores
+    total = por_produtor * produtores
+    consumidos = [0]
+    lock_contagem = threading.Lock()
+    fim = threading.Event()
+
+    def produzir():
+        pendentes = list(range(por_produtor))
+        if lote == 1:
+            for item in pendentes:
+                mesa.adicionar_presente(item, bloquear=True)
+            return
+        inicio = 0
+        while inicio < len(pendentes):
+            inicio += mesa.adicionar_lote(pendentes[inicio:inicio + lote], bloquear=True, timeout=0.1)
+
+    def consumir():
+        while not fim.is_set():
+            if lote == 1:
+                quantidade = 1 if mesa.remover_presente(bloquear=True, timeout=0.05) is not None else 0
+            else:
+                quantidade = len(mesa.remover_lote(lote, bloquear=True, timeout=0.05))
+            if quantidade:
+                with lock_contagem:
+                    consumidos[0] += quantidade
+                    if consumidos[0] >= total:
+                        fim.set()
+
+    threads = [threading.Thread(target=produzir) for _ in range(produtores)]
+    threads += [threading.Thread(target=consumir) for _ in range(consumidores)]
+    inicio = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    duracao = time.perf_counter() - inicio
+    return {'itens': total, 'segundos': round(duracao, 4), 'itens_por_s': round(total / duracao, 1)}
+
+
+def _ocupar_thread_principal(duracao):
+    """Trabalho de CPU em Python na thread principal, simulando o loop de frames."""
+    fim = time.monotonic() + duracao
+    soma = 0
+    while time.monotonic() < fim:
+        for i in range(1000):
+            soma += i * i
+    return soma
+
+
+def medir_atraso_agendador(num_esteiras, intervalo=INTERVALO_AGENDADOR_S, duracao=DURACAO_AGENDADOR_S):
+    """
+    Atraso de disparo (ms) de 'num_esteiras' tarefas periódicas no agendador
+    de thread única. Os primeiros disparos são espalhados ao longo de um intervalo.
+    """
+    agendador = AgendadorPeriodico()
+    agendador.start()
+    for i in range(num_esteiras):
+        agendador.agendar(lambda: None, intervalo, primeiro_disparo=intervalo * i / num_esteiras)
+    _ocupar_thread_principal(duracao)
+    estatisticas = agendador.get_estatisticas()
+    agendador.parar()
+    return {'threads': 1, 'disparos': estatisticas['disparos'],
+            'atraso_medio_ms': round(estatisticas['atraso_medio_ms'], 4),
+            'atraso_maximo_ms': round(estatisticas['atraso_maximo_ms'], 4)}
+
+
+def medir_atraso_threads(num_esteiras, intervalo=INTERVALO_AGENDADOR_S, duracao=DURACAO_AGENDADOR_S):
+    """Referência: o mesmo atraso no modelo de uma thread por esteira com 'time.sleep'."""
+    atrasos = []
+    lock = threading.Lock()
+    fim = time.monotonic() + duracao
+
+    def produtor(deslocamento):
+        time.sleep(deslocamento)
+        while True:
+            esperado = time.monotonic() + intervalo
+            time.sleep(intervalo)
+            agora = time.monotonic()
+            if agora > fim:
+                return
+            with lock:
+                atrasos.append(agora - esperado)
+
+    threads = [threading.Thread(target=produtor, args=(intervalo * i / num_esteiras,), daemon=True)
+               for i in range(num_esteiras)]
+    for t in threads:
+        t.start()
+    _ocupar_thread_principal(duracao)
+    for t in threads:
+        t.join()
+    return {'threads': num_esteiras, 'disparos': len(atrasos),
+            'atraso_medio_ms': round(sum(atrasos) / max(1, len(atrasos)) * 1000.0, 4),
+            'atraso_maximo_ms': round(max(atrasos, default=0.0) * 1000.0, 4)}
+
+
+def executar(quantidades=QUANTIDADES_PRESENTES, frames=FRAMES_PADRAO, operacoes_mesa=OPERACOES_MESA_PADRAO, semente=0,
+             itens_vazao=ITENS_VAZAO_PADRAO, fisicas=FISICAS, quantidades_fisica=QUANTIDADES_FISICA):
+    """
+    Executa o benchmark completo e retorna o resultado no formato do JSON salvo.
+    """
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((LARGURA_TELA, ALTURA_TELA))
+    resultado = {
+        'versao': VERSAO_FORMATO,
+        'data': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'ambiente': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'sdl': ".".join(str(v) for v in pygame.get_sdl_version()),
+            'plataforma': platform.platform(),
+            'driver_video': os.environ.get("SDL_VIDEODRIVER")
+        },
+        'frames': frames,
+        'cenas': {},
+        'fisica': {},
+        'mesa': None,
+        'mesa_vazao': {},
+        'agendador': {}
+    }
+    for quantidade in quantidades:
+        print(f"[BENCH] Cena com {quantidade} presentes ({frames} frames)...")
+        resultado['cenas'][str(quantidade)] = medir_cena(screen, quantidade, frames, semente)
+    for fisica in fisicas:
+        resultado['fisica'][fisica] = {}
+        for quantidade in quantidades_fisica:
+            print(f"[BENCH] Física '{fisica}' com {quantidade} presentes...")
+            resultado['fisica'][fisica][str(quantidade)] = medir_fisica(fisica, quantidade, frames, semente)
+    print(f"[BENCH] GerenciadorMesa ({operacoes_mesa} operações)...")
+    resultado['mesa'] = medir_mesa(operacoes_mesa)
+    for capacidade, produtores, consumidores, lote in CONFIGURACOES_VAZAO:
+        nome = f"cap{capacidade}_p{produtores}_c{consumidores}_lote{lote}"
+        print(f"[BENCH] Vazão da mesa {nome}...")
+        resultado['mesa_vazao'][nome] = medir_vazao_mesa(capacidade, produtores, consumidores, lote, itens_vazao)
+    for esteiras in ESTEIRAS_AGENDADOR:
+        print(f"[BENCH] Atraso de disparo com {esteiras} esteiras...")
+        resultado['agendador'][str(esteiras)] = {
+            'agendador': medir_atraso_agendador(esteiras),
+            'thread_por_esteira': medir_atraso_threads(esteiras)
+        }
+    return resultado
+
+
+def comparar(base, atual, limiar=LIMIAR_REGRESSAO, piso_ms=PISO_REGRESSAO_MS):
+    """
+    Compara dois resultados e lista as métricas que pioraram além do limiar.
+    Só são comparados os percentis p50 e p95 (o p99 de poucas amostras é muito ruidoso).
+    Returns:
+        list: Tuplas (grupo, nome, percentil, valor_base, valor_atual) das regressões.
+    """
+    def metricas(resultado):
+        for quantidade, etapas in resultado.get('cenas', {}).items():
+            for etapa, resumo in etapas.items():
+                yield f"cena {quantidade}", etapa, resumo
+        for fisica, por_quantidade in resultado.get('fisica', {}).items():
+            for quantidade, resumo in por_quantidade.items():
+                yield f"fisica {fisica}", quantidade, resumo
+        for operacao, resumo in (resultado.get('mesa') or {}).items():
+            yield "mesa", operacao, resumo
+
+    referencia = {(grupo, nome): resumo for grupo, nome, resumo in metricas(base)}
+    regressoes = []
+    for grupo, nome, resumo in metricas(atual):
+        anterior = referencia.get((grupo, nome))
+        if anterior is None:
+            continue
+        for p in ('p50', 'p95'):
+            valor_base, valor_atual = anterior[p], resumo[p]
+            if valor_atual - valor_base > piso_ms and valor_atual > valor_base * (1.0 + limiar):
+                regressoes.append((grupo, nome, p, valor_base, valor_atual))
+    # Vazão: aqui, pior é menor
+    for nome, medida in (atual.get('mesa_vazao') or {}).items():
+        anterior = (base.get('mesa_vazao') or {}).get(nome)
+        if anterior and medida['itens_por_s'] < anterior['itens_por_s'] * (1.0 - limiar):
+            regressoes.append(("vazao", nome, 'itens_por_s', anterior['itens_por_s'], medida['itens_por_s']))
+    return regressoes
+
+
+def imprimir_tabela(resultado):
+    """Mostra os percentis de cada cena e da mesa no terminal."""
+    print("=" * 72)
+    print(f"{'cena':>14} {'etapa':>8} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10}  (ms)")
+    for quantidade, etapas in resultado['cenas'].items():
+        for etapa in ETAPAS:
+            r = etapas[etapa]
+            print(f"{quantidade + ' pres.':>14} {etapa:>8} {r['p50']:>10.3f} {r['p95']:>10.3f} {r['p99']:>10.3f} {r['max']:>10.3f}")
+    for fisica, por_quantidade in resultado.get('fisica', {}).items():
+        for quantidade, r in por_quantidade.items():
+            print(f"{'física ' + fisica:>14} {quantidade:>8} {r['p50']:>10.3f} {r['p95']:>10.3f} {r['p99']:>10.3f} {r['max']:>10.3f}")
+    for operacao, r in resultado['mesa'].items():
+        print(f"{'mesa':>14} {operacao:>8} {r['p50']:>10.4f} {r['p95']:>10.4f} {r['p99']:>10.4f} {r['max']:>10.4f}")
+    for nome, r in resultado.get('mesa_vazao', {}).items():
+        print(f"{'vazão':>14} {nome:>30} {r['itens_por_s']:>14,.0f} itens/s")
+    for esteiras, modelos in resultado.get('agendador', {}).items():
+        for modelo, r in modelos.items():
+            print(f"{esteiras + ' esteiras':>14} {modelo:>20} threads={r['threads']:<6} "
+                  f"atraso médio {r['atraso_medio_ms']:.3f} ms, máximo {r['atraso_maximo_ms']:.3f} ms")
+    print("=" * 72)
+
+
+# Execução standalone: mede, salva e compara
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark de tempo de frame da Oficina do Noel (sem janela).")
+    parser.add_argument("--presentes", type=int, nargs="+", default=list(QUANTIDADES_PRESENTES),
+                        help="Quantidades de presentes na cena")
+    parser.add_argument("--frames", type=int, default=FRAMES_PADRAO, help="Frames medidos por cena")
+    parser.add_argument("--fisica", nargs="+", default=list(FISICAS), choices=('python', 'numpy'),
+                        help="Físicas dos presentes a medir")
+    parser.add_argument("--presentes-fisica", type=int, nargs="+", default=list(QUANTIDADES_FISICA),
+                        help="Quantidades de presentes na medição da física")
+    parser.add_argument("--operacoes-mesa", type=int, default=OPERACOES_MESA_PADRAO,
+                        help="Operações medidas no GerenciadorMesa")
+    parser.add_argument("--itens-vazao", type=int, default=ITENS_VAZAO_PADRAO,
+                        help="Itens que atravessam a mesa em cada medição de vazão")
+    parser.add_argument("--semente", type=int, default=0, help="Semente para posicionar os presentes")
+    parser.add_argument("--saida", help="Arquivo JSON onde salvar o resultado")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument("--limiar", type=float, default=LIMIAR_REGRESSAO,
+                        help="Piora relativa tolerada antes de acusar regressão (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    resultado = executar(args.presentes, args.frames, args.operacoes_mesa, args.semente, args.itens_vazao,
+                         args.fisica, args.presentes_fisica)
+    imprimir_tabela(resultado)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=2)
+        print(f"Resultado salvo em {args.saida}")
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            base = json.load(f)
+        regressoes = comparar(base, resultado, args.limiar)
+        if regressoes:
+            print(f"REGRESSÕES (piora > {args.limiar:.0%}):")
+            for grupo, nome, p, valor_base, valor_atual in regressoes:
+                unidade = "itens/s" if grupo == "vazao" else "ms"
+                print(f"  {grupo} / {nome} / {p}: {valor_base:.3f} {unidade} -> {valor_atual:.3f} {unidade}")
+            pygame.quit()
+            sys.exit(1)
+        print(f"Sem regressões em relação a {args.comparar} (limiar {args.limiar:.0%}).")
+    pygame.quit()
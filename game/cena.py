@@ -0,0 +1,147 @@
+#   game/cena.py
+"""
+Cena da partida (fundo, esteiras, mesa, elfo, HUD e sobreposição de
+depuração) montada antes de a partida começar.
+'CenaPartida' reúne tudo o que o 'game_loop' desenha. 'PreparacaoCena'
+decodifica os recursos da partida e monta a cena na thread de carregamento
+('recursos.pre_carregar') enquanto as telas de carregamento e de explicação
+estão sendo exibidas. Quando a partida começa, 'obter' só espera o que ainda
+faltar (nada, normalmente), e o primeiro frame não lê nenhum arquivo do disco.
+O estado lógico (posição do elfo, itens da mesa) é o da 'SimulacaoPartida',
+criada só no início da partida: 'vincular' liga os sprites a ele.
+ANALOGIA: É a pré-paginação (prepaging): as páginas que o processo vai usar
+logo de início são trazidas antes, e ele não começa com uma rajada de faltas de página.
+"""
+from ..settings import (LARGURA_TELA, ALTURA_TELA, FONTE_PATH, FONTE_BOLD_PATH)
+from ..recursos import recursos # Cache compartilhado e thread de carregamento em segundo plano
+from ..ui.screens import GameBackground
+from .entities import Esteira, Elfo, MesaDePresentes, PoolPresentes
+from .hud import criar_painel_estatisticas, criar_painel_instrucoes
+from .renderizador import (RenderizadorCena, SpriteTexto, CAMADA_CENARIO, CAMADA_ELFO,
+                           CAMADA_HUD, CAMADA_POPUP, CAMADA_DEPURACAO)
+from .depuracao import MedidorFrame, PainelDepuracao
+from .simulacao import LayoutOficina, TIPOS_PRESENTE
+import pygame   # Importa o Pygame para os grupos de sprites
+
+INSTRUCOES = [
+    "=== MOVIMENTO ===", "SETAS/WASD: Mover",
+    "=== AÇÕES ===", "ESPAÇO: Coletar/Entregar", "P: Forçar Processamento",
+    # "=== CONTROLES MESA ===", "+/-: Vel. Processamento",
+    "F1: Desempenho",
+    "ESC: Sair"
+]
+
+
+def etapas_recursos_partida():
+    """
+    Recursos usados pela partida, como (descrição, função, argumentos).
+    Inclui os presentes em queda (80x80), que sem isso seriam lidos do disco
+    no primeiro spawn de cada tipo, já com a partida em andamento.
+    """
+    etapas = [("fundo", recursos.imagem, ("gamebackground.png", (LARGURA_TELA, ALTURA_TELA), False)),
+              ("elfo", recursos.imagem, ("elfo.png", (100, 100))),
+              ("mesa", recursos.imagem, ("mesadeembrulhos.png", (150, 80)))]
+    for tipo in TIPOS_PRESENTE:
+        etapas.append((tipo, recursos.imagem, (tipo + ".png", (80, 80))))    # Presente caindo
+        etapas.append((tipo, recursos.imagem, (tipo + ".png", (100, 100))))  # Presente sobre a mesa
+    for caminho, tamanho in ((FONTE_PATH, 24), (FONTE_PATH, 18), (FONTE_BOLD_PATH, 20), (None, 16)):
+        etapas.append(("fontes", recursos.fonte, (caminho, tamanho)))
+    return etapas
+
+
+class CenaPartida:
+    """Sprites, painéis e renderizador de uma partida, prontos para o primeiro frame."""
+
+    def __init__(self, screen, layout=None):
+        """
+        Args:
+            screen (pygame.Surface): Superfície da janela.
+            layout (LayoutOficina, optional): Posições da oficina. Usa o layout padrão de 3 esteiras se omitido.
+        """
+        self.layout = layout if layout is not None else LayoutOficina()
+        self.background = GameBackground()
+        self.renderizador = RenderizadorCena(screen, self.background.image)   # Desenha só as áreas que mudaram
+        self.cenario_sprites = pygame.sprite.Group() # Esteiras, mesa e elfo (atualizados sem interpolação)
+        self.presentes_sprites = pygame.sprite.Group()   # Agrupa os presentes que estão caindo
+        self.pool_presentes = PoolPresentes()    # Sprites de presentes reaproveitados entre spawns
+
+        #   Cria as esteiras onde os presentes vão cair
+        self.esteiras = [Esteira(position=posicao, size=(self.layout.largura_esteira, 60))
+                         for posicao in self.layout.posicoes_esteiras]
+        self.renderizador.adicionar(self.esteiras, CAMADA_CENARIO)
+        self.cenario_sprites.add(self.esteiras)
+        # Mesa e elfo começam com um estado próprio, trocado pelo da simulação em 'vincular'
+        self.mesa_sprite = MesaDePresentes(position=self.layout.posicao_mesa)
+        self.renderizador.adicionar(self.mesa_sprite, CAMADA_CENARIO)
+        self.cenario_sprites.add(self.mesa_sprite)
+        self.player = Elfo(positions=self.layout.posicoes_elfo)
+        self.renderizador.adicionar(self.player, CAMADA_ELFO)
+        self.cenario_sprites.add(self.player)
+
+        # --- Fontes, HUD e textos da cena (redesenhados apenas quando mudam) ---
+        self.font = recursos.fonte(FONTE_PATH, 24) # Fonte principal do jogo
+        self.font_small = recursos.fonte(FONTE_PATH, 18)   # Fonte menor para o HUD
+        self.painel_stats = criar_painel_estatisticas(self.font, self.font_small)
+        self.painel_instrucoes = criar_painel_instrucoes(self.font_small, INSTRUCOES)
+        self.texto_processando = SpriteTexto(self.font_small) # "Processando... X.Xs" acima da mesa
+        self.texto_carga = SpriteTexto(recursos.fonte(FONTE_BOLD_PATH, 20))  # Carga sobre a cabeça do elfo
+        self.popup = SpriteTexto(self.font_small) # Mensagem temporária (ex.: mesa cheia)
+        self.renderizador.adicionar([self.painel_stats, self.painel_instrucoes, self.texto_processando,
+                                     self.texto_carga], CAMADA_HUD)
+        self.renderizador.adicionar(self.popup, CAMADA_POPUP)
+        # Sobreposição de desempenho (F1): escondida e sem medir nada até ser ligada
+        self.medidor = MedidorFrame()
+        self.painel_depuracao = PainelDepuracao(self.font_small)
+        self.renderizador.adicionar(self.painel_depuracao.sprites(), CAMADA_DEPURACAO)
+
+    def vincular(self, simulacao):
+        """Passa a desenhar o estado lógico (elfo e mesa) da simulação da partida."""
+        if simulacao.layout.num_esteiras != self.layout.num_esteiras:
+            raise ValueError("A cena foi montada para outro número de esteiras")
+        self.player.estado = simulacao.elfo
+        self.mesa_sprite.estado = simulacao.mesa
+        self.mesa_sprite.capacidade = simulacao.mesa.capacidade
+
+
+class PreparacaoCena:
+    """
+    Monta uma 'CenaPartida' em segundo plano: cada recurso é um pedido à
+    thread de carregamento, e a montagem da cena é o último pedido.
+    """
+
+    def __init__(self, screen, layout=None):
+        self.screen = screen
+        self.layout = layout
+        self._pedidos = []  # Um pedido por recurso, mais o da montagem (o último)
+
+    def iniciar(self):
+        """Coloca os carregamentos na fila e retorna sem esperar."""
+        self._pedidos = [recursos.pre_carregar(funcao, *args) for _, funcao, args in etapas_recursos_partida()]
+        self._pedidos.append(recursos.pre_carregar(CenaPartida, self.screen, self.layout))
+        return self
+
+    @property
+    def pronta(self):
+        return bool(self._pedidos) and self._pedidos[-1].pronto
+
+    def progresso(self):
+        """Fração (0 a 1) das etapas já concluídas."""
+        if not self._pedidos:
+            return 0.0
+        return sum(1 for pedido in self._pedidos if pedido.pronto) / len(self._pedidos)
+
+    def obter(self):
+        """
+        Retorna a cena, esperando só pelas etapas que ainda faltam.
+        Se a montagem em segundo plano falhou (ou nem foi iniciada), monta a cena aqui.
+        """
+        if self._pedidos:
+            cena = self._pedidos[-1].esperar()
+            if cena is not None:
+                return cena
+        return CenaPartida(self.screen, self.layout)
+
+    def cancelar(self):
+        """Desiste das etapas que ainda não começaram (ex.: o jogador voltou ao menu)."""
+        for pedido in self._pedidos:
+            pedido.cancelar()
@@ -0,0 +1,158 @@
+#   game/ciclo_vida.py
+"""
+Gerenciador do ciclo de vida das threads de segundo plano de uma partida.
+Toda thread criada pelas mecânicas (hoje, o agendador dos produtores) é
+registrada aqui junto com o seu "dono" (a instância de 'GameMechanics') e
+uma função que sinaliza a parada. Ao encerrar uma partida:
+    1. todas as threads do dono recebem o sinal de parada (que interrompe
+       esperas em Event/Condition na hora, sem esperar um 'sleep' acabar);
+    2. cada uma recebe um 'join' com prazo total limitado;
+    3. as que não terminaram a tempo ficam marcadas como "vazada".
+Uma linha de base com as threads vivas é registrada no início do programa;
+depois de cada partida, 'verificar_linha_de_base' confirma que nenhuma thread
+nova sobrou. Threads de serviço do processo inteiro (a escritora do
+registro, a fila de carregamento, a exportação das métricas) se registram
+com 'registrar_servico' e são ignoradas.
+"""
+import threading    # Importa threading para enumerar e aguardar as threads
+import time # Importa time para o prazo dos joins
+import weakref  # WeakSet: registrar um serviço não impede a thread de ser coletada
+from ..registro import obter_registro, SISTEMA  # Registro não bloqueante
+
+log_sistema = obter_registro(SISTEMA)
+
+PRAZO_PARADA_PADRAO_S = 1.0 # Tempo máximo, somado, dos joins ao parar as threads de um dono
+
+# --- Estados de uma thread registrada ---
+CRIADA = "criada"
+RODANDO = "rodando"
+PARANDO = "parando"
+PARADA = "parada"
+VAZADA = "vazada"   # Recebeu o sinal de parada, mas não terminou dentro do prazo
+
+
+class RegistroTrabalhador:
+    """Uma thread de segundo plano registrada e o seu estado."""
+    __slots__ = ('thread', 'sinalizar_parada', 'dono', 'estado', 'iniciada_em')
+
+    def __init__(self, thread, sinalizar_parada, dono):
+        self.thread = thread
+        self.sinalizar_parada = sinalizar_parada    # Função que pede à thread para terminar (não bloqueia)
+        self.dono = dono
+        self.estado = CRIADA
+        self.iniciada_em = None
+
+
+class GerenciadorCicloVida:
+    """Registro vivo das threads de segundo plano, com parada rápida e verificação de vazamentos."""
+
+    def __init__(self):
+        self._registros = []    # RegistroTrabalhador de todas as threads ainda acompanhadas
+        self._lock = threading.Lock()   # Protege a lista de registros
+        self._linha_de_base = None  # Idents das threads vivas quando a linha de base foi marcada
+        self._servicos = weakref.WeakSet() # Threads de serviço do processo inteiro (ver 'registrar_servico')
+
+    # --- Registro ---
+    def iniciar(self, thread, sinalizar_parada, dono=None):
+        """
+        Registra e inicia uma thread.
+        Args:
+            thread (threading.Thread): Thread ainda não iniciada.
+            sinalizar_parada (callable): Pede à thread para terminar, sem bloquear.
+            dono (object, optional): Quem é responsável pela thread (ex.: a GameMechanics da partida).
+        """
+        registro = RegistroTrabalhador(thread, sinalizar_parada, dono)
+        with self._lock:
+            self._registros.append(registro)
+        thread.start()
+        registro.estado = RODANDO
+        registro.iniciada_em = time.monotonic()
+        return thread
+
+    def registrar_servico(self, thread):
+        """
+        Marca uma thread que vive o processo inteiro: ela não pertence a
+        nenhuma partida e não conta como vazamento em 'verificar_linha_de_base'.
+        Deve ser chamada antes de 'thread.start()'.
+        """
+        with self._lock:
+            self._servicos.add(thread)
+        return thread
+
+    def parar(self, dono=None, timeout=PRAZO_PARADA_PADRAO_S):
+        """
+        Para todas as threads de 'dono' (ou todas, se None): sinaliza todas
+        primeiro e depois faz 'join' com um prazo total de 'timeout' segundos.
+        Returns:
+            list: Nomes das threads que não terminaram no prazo.
+        """
+        with self._lock:
+            alvos = [r for r in self._registros if dono is None or r.dono is dono]
+        for registro in alvos:  # Sinaliza todas antes de esperar por qualquer uma
+            if registro.estado == RODANDO:
+                registro.estado = PARANDO
+                try:
+                    registro.sinalizar_parada()
+                except Exception as e:
+                    log_sistema.erro("Falha ao sinalizar a parada de %s: %s", registro.thread.name, e)
+        prazo = time.monotonic() + timeout
+        vazadas = []
+        for registro in alvos:
+            if registro.thread is not threading.current_thread():
+                registro.thread.join(max(0.0, prazo - time.monotonic()))
+            if registro.thread.is_alive():
+                registro.estado = VAZADA
+                vazadas.append(registro.thread.name)
+            else:
+                registro.estado = PARADA
+        with self._lock:    # Threads paradas deixam de ser acompanhadas; as vazadas continuam visíveis
+            self._registros = [r for r in self._registros if r.estado != PARADA]
+        if vazadas:
+            log_sistema.erro("Threads não terminaram em %.1fs: %s", timeout, ", ".join(vazadas))
+        return vazadas
+
+    # --- Consulta ---
+    def estado(self):
+        """Lista (nome, dono, estado, viva) de cada thread acompanhada."""
+        with self._lock:
+            return [{
+                'nome': r.thread.name,
+                'dono': type(r.dono).__name__ if r.dono is not None else None,
+                'estado': r.estado,
+                'viva': r.thread.is_alive(),
+                'segundos_desde_inicio': (time.monotonic() - r.iniciada_em) if r.iniciada_em else 0.0
+            } for r in self._registros]
+
+    # --- Linha de base ---
+    def marcar_linha_de_base(self):
+        """Guarda as threads vivas agora; chamado uma vez, antes da primeira partida."""
+        self._linha_de_base = {t.ident for t in threading.enumerate()}
+
+    def threads_excedentes(self):
+        """Threads vivas que não existiam na linha de base (exceto serviços do processo)."""
+        if self._linha_de_base is None:
+            return []
+        with self._lock:
+            servicos = set(self._servicos)
+        return [t for t in threading.enumerate() if t.ident not in self._linha_de_base and t not in servicos]
+
+    def verificar_linha_de_base(self, levantar=True):
+        """
+        Confirma que a contagem de threads voltou à linha de base.
+        Args:
+            levantar (bool): Se False, um vazamento só vai para o registro e o jogo continua.
+        Returns:
+            list: Nomes das threads excedentes (vazia se nada vazou).
+        Raises:
+            AssertionError: Se alguma thread de uma partida encerrada continua viva (com 'levantar').
+        """
+        vazadas = [t.name for t in self.threads_excedentes()]
+        if vazadas and not levantar:
+            log_sistema.erro("Threads vazadas após a partida: %s", ", ".join(vazadas))
+            return vazadas
+        assert not vazadas, f"Threads vazadas após a partida: {vazadas}"
+        return vazadas
+
+
+# Instância única, compartilhada por todo o processo
+ciclo_vida = GerenciadorCicloVida()
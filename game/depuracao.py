@@ -0,0 +1,239 @@
+#   game/depuracao.py
+"""
+Sobreposição de desempenho do modo de depuração (F1).
+'MedidorFrame' divide o tempo de trabalho de cada frame em fases (eventos,
+mecânicas, sprites, HUD, desenho e envio à tela) e guarda os últimos
+HISTORICO_FRAMES frames em um buffer circular.
+'PainelDepuracao' mostra esses tempos, o FPS, o pior frame, as contagens de
+sprites e o estado das mecânicas (fila de presentes visuais, vagas e ocupação
+da mesa, thread do agendador e intervalos dos produtores), com um gráfico
+rolante de barras empilhadas, uma coluna por frame. Abaixo, a latência
+(p50/p95) de cada etapa do caminho dos presentes ('LatenciasPresentes').
+Custo: desligado, cada marcação de fase é só um teste de flag. Ligado, o
+gráfico ganha uma coluna por frame (a superfície é rolada, não redesenhada)
+e os textos são atualizados a cada ATUALIZACAO_TEXTO_MS, com os campos do
+HUD renderizando apenas o que mudou.
+"""
+import time # Importa time para o relógio de alta resolução
+from collections import deque   # Importa deque para o buffer circular de frames
+import pygame   # Importa o Pygame para superfícies e sprites
+from ..settings import LARGURA_TELA, FPS, BRANCO, VERMELHO, AMARELO, PRETO_TRANSPARENTE
+from .hud import PainelHUD
+from .latencia import ETAPAS
+
+# --- Fases de um frame, na ordem em que acontecem no 'game_loop' ---
+FASE_EVENTOS = 0    # Fila de eventos do Pygame (teclado, janela)
+FASE_MECANICAS = 1  # Passos da simulação, fila dos produtores, coleta, mesa e fim de jogo
+FASE_SPRITES = 2    # Atualização dos sprites (cenário e presentes interpolados)
+FASE_HUD = 3    # Textos da cena e painel de estatísticas
+FASE_DESENHO = 4    # Composição das áreas sujas na superfície da tela
+FASE_TELA = 5   # Envio à janela (display.update / display.flip)
+NOMES_FASES = ("eventos", "mecânicas", "sprites", "HUD", "desenho", "tela")
+CORES_FASES = ((80, 160, 255), (255, 140, 0), (60, 200, 90), (200, 90, 220), (240, 220, 60), (230, 60, 60))
+
+HISTORICO_FRAMES = 150  # Frames guardados para o gráfico e as médias (2,5 s a 60 FPS)
+ATUALIZACAO_TEXTO_MS = 250  # Intervalo entre atualizações dos textos da sobreposição
+ESCALA_GRAFICO_MS = 2000.0 / FPS    # Altura do gráfico: dois orçamentos de frame
+MAX_PRODUTORES_LISTADOS = 6 # No modo de estresse (centenas de esteiras), lista só os primeiros
+
+
+class MedidorFrame:
+    """
+    Cronômetro das fases de cada frame.
+    Uso no loop: 'iniciar_frame()' no começo, 'marcar(FASE_...)' ao fim de cada
+    fase (na ordem) e 'terminar_frame()' depois da última. Se 'ativo' for
+    falso quando o frame começa, nenhuma das chamadas mede nada.
+    """
+    def __init__(self, historico=HISTORICO_FRAMES):
+        self.ativo = False  # Liga/desliga a medição (vale a partir do próximo frame)
+        self.frames = deque(maxlen=historico)   # Duração (s) de cada fase, por frame
+        self.pior_frame_s = 0.0 # Pior frame desde que a medição foi ligada
+        self._medindo = False   # Se o frame atual está sendo medido
+        self._duracoes = [0.0] * len(NOMES_FASES)
+        self._marca = 0.0
+
+    def ligar(self, ativo):
+        """Liga ou desliga a medição; ao ligar, o histórico recomeça."""
+        if ativo and not self.ativo:
+            self.frames.clear()
+            self.pior_frame_s = 0.0
+        self.ativo = ativo
+
+    def iniciar_frame(self):
+        self._medindo = self.ativo
+        if self._medindo:
+            self._duracoes = [0.0] * len(NOMES_FASES)
+            self._marca = time.perf_counter()
+
+    def marcar(self, fase):
+        """Encerra a fase 'fase': o tempo desde a última marcação é somado a ela."""
+        if self._medindo:
+            agora = time.perf_counter()
+            self._duracoes[fase] += agora - self._marca
+            self._marca = agora
+
+    def terminar_frame(self):
+        """
+        Guarda as durações do frame no histórico.
+        Returns:
+            list or None: Durações (s) de cada fase, ou None se o frame não foi medido.
+        """
+        if not self._medindo:
+            return None
+        self._medindo = False
+        self.frames.append(self._duracoes)
+        self.pior_frame_s = max(self.pior_frame_s, sum(self._duracoes))
+        return self._duracoes
+
+    def medias_ms(self):
+        """Tempo médio (ms) de cada fase no histórico."""
+        if not self.frames:
+            return [0.0] * len(NOMES_FASES)
+        return [sum(fases) * 1000.0 / len(self.frames) for fases in zip(*self.frames)]
+
+    def pior_recente_ms(self):
+        """Pior frame (ms) do histórico."""
+        return max((sum(fases) for fases in self.frames), default=0.0) * 1000.0
+
+
+class GraficoFrames(pygame.sprite.DirtySprite):
+    """
+    Gráfico rolante do tempo de cada frame, com as fases empilhadas.
+    A cada frame a imagem é rolada para a esquerda e só a nova coluna é
+    desenhada. A linha horizontal marca o orçamento de um frame (1000/FPS ms).
+    """
+    def __init__(self, rect, largura_coluna=2, escala_ms=ESCALA_GRAFICO_MS):
+        super().__init__()
+        self.rect = pygame.Rect(rect)
+        self.image = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.image.fill(PRETO_TRANSPARENTE)
+        self.largura_coluna = largura_coluna
+        self.px_por_ms = self.rect.height / escala_ms
+        self.y_orcamento = self.rect.height - round(1000.0 / FPS * self.px_por_ms)
+
+    def adicionar(self, duracoes):
+        """Acrescenta a coluna de um frame (durações em segundos, uma por fase)."""
+        largura, altura = self.rect.size
+        x = largura - self.largura_coluna
+        self.image.scroll(-self.largura_coluna, 0)
+        self.image.fill(PRETO_TRANSPARENTE, (x, 0, self.largura_coluna, altura))
+        base = altura
+        for duracao, cor in zip(duracoes, CORES_FASES):
+            h = round(duracao * 1000.0 * self.px_por_ms)
+            if h > 0 and base > 0:
+                self.image.fill(cor, (x, max(0, base - h), self.largura_coluna, min(h, base)))
+                base -= h
+        self.image.fill(BRANCO, (x, self.y_orcamento, self.largura_coluna, 1))
+        self.dirty = 1
+
+
+class PainelDepuracao:
+    """
+    Sobreposição de desempenho: painel de textos ('PainelHUD') e gráfico
+    rolante ('GraficoFrames'), mostrados ou escondidos juntos.
+    """
+    def __init__(self, fonte, posicao=(LARGURA_TELA - 365, 160), tamanho=(360, 320)):
+        x, y = posicao
+        largura, altura = tamanho
+        self.painel = PainelHUD((x, y, largura, altura))
+        altura_linha = fonte.get_linesize()
+        # Legenda das fases (fixa) com o tempo médio de cada uma ao lado
+        for fase, (nome, cor) in enumerate(zip(NOMES_FASES, CORES_FASES)):
+            linha, coluna = divmod(fase, 2)
+            px, py = 5 + coluna * (largura // 2), 5 + altura_linha * (2 + linha)
+            self.painel.adicionar_texto_fixo(f"{nome}:", (px, py), fonte, cor)
+            self.painel.adicionar_campo(fase, (px + 95, py), fonte, lambda v: (f"{v:.2f} ms", BRANCO))
+        campos = (
+            ('fps', lambda v: (f"FPS: {v[0]:.1f}   pior frame: {v[1]:.1f} ms ({v[2]:.1f})",
+                               VERMELHO if v[1] > 1000.0 / FPS else BRANCO)),
+            ('trabalho', lambda v: (f"Trabalho médio: {v:.2f} ms de {1000.0 / FPS:.1f}",
+                                    VERMELHO if v > 1000.0 / FPS else BRANCO)),
+            (None, None),   # Linhas da legenda das fases
+            (None, None),
+            (None, None),
+            ('sprites', lambda v: (f"Sprites: {v[0]}  presentes: {v[1]}  pool: {v[2]}/{v[3]}", BRANCO)),
+            ('fila', lambda v: (f"Fila de presentes: {v[0]}/{v[1]}  descartados: {v[2]}",
+                                AMARELO if v[0] >= v[1] else BRANCO)),
+            ('mesa', lambda v: (f"Mesa: {v[0]}/{v[1]}  vagas (semáforo): {v[1] - v[0]}",
+                                VERMELHO if v[0] >= v[1] else BRANCO)),
+            ('agendador', lambda v: (f"Agendador: {v}", BRANCO if v.startswith("vivo") else VERMELHO)),
+            ('produtores', lambda v: (f"Produtores: {v}", BRANCO)),
+            ('latencia_0', self._formatar_latencias),   # Latência p50/p95 (s), duas etapas por linha
+            ('latencia_1', self._formatar_latencias),
+            ('latencia_2', self._formatar_latencias),
+        )
+        for linha, (nome, formatar) in enumerate(campos):
+            if nome is not None:
+                self.painel.adicionar_campo(nome, (5, 5 + altura_linha * linha), fonte, formatar)
+        topo_grafico = 10 + altura_linha * len(campos)
+        self.grafico = GraficoFrames((x + 5, y + topo_grafico, largura - 10, altura - topo_grafico - 5))
+        self.proxima_atualizacao = 0    # Instante (ms) da próxima atualização dos textos
+        self.esconder()
+
+    def sprites(self):
+        """Sprites a adicionar ao renderizador (o gráfico fica por cima do painel)."""
+        return [self.painel, self.grafico]
+
+    def mostrar(self):
+        self.painel.visible = 1
+        self.grafico.visible = 1
+        self.proxima_atualizacao = 0    # Textos atualizados já no próximo frame
+
+    def esconder(self):
+        """Esconde a sobreposição (a área volta a mostrar a cena)."""
+        self.painel.visible = 0
+        self.grafico.visible = 0
+
+    def atualizar(self, agora_ms, medidor, duracoes, fps, contagens, mecanicas, simulacao):
+        """
+        Acrescenta o frame ao gráfico e, a cada ATUALIZACAO_TEXTO_MS, atualiza os textos.
+        Args:
+            agora_ms (int): Tempo atual (pygame.time.get_ticks).
+            medidor (MedidorFrame): Histórico dos tempos de frame.
+            duracoes (list): Durações (s) das fases do último frame medido.
+            fps (float): FPS medido pelo relógio do Pygame.
+            contagens (tuple): (sprites na cena, presentes caindo, sprites do pool em uso, criados pelo pool).
+            mecanicas (GameMechanics): Fila de presentes, agendador e produtores.
+            simulacao (SimulacaoPartida): Ocupação da mesa e latências dos presentes.
+        """
+        if duracoes is not None:
+            self.grafico.adicionar(duracoes)
+        if agora_ms < self.proxima_atualizacao:
+            return
+        self.proxima_atualizacao = agora_ms + ATUALIZACAO_TEXTO_MS
+        medias = medidor.medias_ms()
+        valores = dict(enumerate(round(m, 2) for m in medias))
+        valores['fps'] = (round(fps, 1), round(medidor.pior_recente_ms(), 1), round(medidor.pior_frame_s * 1000.0, 1))
+        valores['trabalho'] = round(sum(medias), 2)
+        valores['sprites'] = contagens
+        fila = mecanicas.fila_presentes_visuais
+        valores['fila'] = (len(fila), fila.capacidade, fila.descartados + fila.perdidos)
+        valores['mesa'] = (len(simulacao.mesa.itens), simulacao.mesa.capacidade)
+        valores['agendador'] = self._descrever_agendador(mecanicas.agendador)
+        valores['produtores'] = self._descrever_produtores(mecanicas.produtores)
+        histogramas = simulacao.latencias.histogramas
+        for linha in range(3):
+            valores[f'latencia_{linha}'] = tuple(
+                (etapa, round(histogramas[etapa].percentil(50) / 1000.0, 2),
+                 round(histogramas[etapa].percentil(95) / 1000.0, 2)) for etapa in ETAPAS[2 * linha:2 * linha + 2])
+        self.painel.atualizar(valores)
+
+    @staticmethod
+    def _formatar_latencias(etapas):
+        return "   ".join(f"{etapa} {p50:.2f}/{p95:.2f}s" for etapa, p50, p95 in etapas), (150, 220, 255)
+
+    @staticmethod
+    def _descrever_agendador(agendador):
+        if agendador is None:
+            return "parado"
+        viva = agendador.is_alive() if hasattr(agendador, 'is_alive') else True  # O simulado não tem thread
+        atraso = agendador.get_estatisticas().get('atraso_maximo_ms')
+        texto = "vivo" if viva else "MORTO"
+        return texto if atraso is None else f"{texto}  atraso máx: {atraso:.1f} ms"
+
+    @staticmethod
+    def _descrever_produtores(produtores):
+        ativos = sum(1 for p in produtores if p.is_alive())
+        intervalos = " ".join(f"{p.intervalo_producao:.1f}" for p in produtores[:MAX_PRODUTORES_LISTADOS])
+        extra = " ..." if len(produtores) > MAX_PRODUTORES_LISTADOS else ""
+        return f"{ativos}/{len(produtores)} ativos  {intervalos}{extra} s"
@@ -2,14 +2,15 @@
 # Define as classes que representam os "atores" visuais e interativos do jogo.
 # como elfo, esteiras, mesa e os presentes que caem.
 
-from ..settings import PASTA_IMAGENS, FONTE_PATH, VERDE_ESCURO, VERDE_CLARO, FONTE_BOLD_PATH, VERMELHO
-import os       # Importa o módulo os para manipulação de caminhos de arquivos
+from ..settings import FONTE_BOLD_PATH, VERMELHO
+from ..recursos import recursos # Cache compartilhado de imagens, fontes e sons
+from .simulacao import ElfoLogico, MesaLogica, TIPOS_PRESENTE, LIMITE_PRESENTES_CAINDO  # Estado lógico desenhado pelos sprites
+from .animacao import Animacao, ciclo_quadros, ciclo_pulsar  # Ciclos de animação pré-calculados e compartilhados
 import pygame   #   Importa o Pygame para manipulação de gráficos e eventos
 import threading    # Importa threading para criar threads de geração de presentes
-import random   # Importa random para gerar presentes aleatórios
 import math # Importa math para cálculos matemáticos, como seno para animação
 
-class Esteira(pygame.sprite.Sprite):
+class Esteira(pygame.sprite.DirtySprite):
     """
     Representa uma esteira que produz presentes.
     ANALOGIA: Atua como o processo PRODUTOR, que gera itens (presentes)
@@ -23,32 +24,26 @@ class Esteira(pygame.sprite.Sprite):
         """
         super().__init__()
 
-        # --- Carregamento das Imagens ---
-        original_frame_1 = pygame.image.load(os.path.join(PASTA_IMAGENS, "esteira_frame_1.png")).convert_alpha()
-        original_frame_2 = pygame.image.load(os.path.join(PASTA_IMAGENS, "esteira_frame_2.png")).convert_alpha()
-        # Reescala as imagens para o novo tamanho fornecido
-        frame_1 = pygame.transform.scale(original_frame_1, size=(200, 200))
-        frame_2 = pygame.transform.scale(original_frame_2, size=(200, 200))
-        # Armazena os frames já reescalados na lista
-        self.frames = [frame_1, frame_2]    #   Lista de frames da animação da esteira
-        self.frame_index = 0    #   Índice do frame atual da animação
-        self.image = self.frames[self.frame_index]  #   Define a imagem inicial como o primeiro frame
+        # --- Animação ---
+        # O ciclo (com os frames já reescalados) é compartilhado entre todas as esteiras
+        self.animacao = Animacao(ciclo_quadros(("esteira_frame_1.png", "esteira_frame_2.png"), (200, 200),
+                                               intervalo_ms=200))
+        self.frames = self.animacao.ciclo.quadros   #   Frames da animação da esteira (compartilhados)
+        self.image = self.animacao.quadro   #   Define a imagem inicial como o primeiro frame
         self.rect = self.image.get_rect(topleft=position)   #   Retângulo do sprite, usado para posicionamento e colisão
-        # --- Controle da Animação ---
-        self.animation_speed_ms = 200   # Tempo em milissegundos entre cada frame da animação
-        self.last_update = pygame.time.get_ticks()  # Marca o tempo do último update da animação
         # --- Estado da Esteira ---
         self.ligada = True  #   Indica se a esteira está ligada ou não. Se desligada, não anima.
 
+    @property
+    def frame_index(self):
+        """Índice do frame atual da animação."""
+        return self.animacao.indice
+
     def animate(self):
-        """Controla a lógica de troca de frames da animação."""
-        if not self.ligada:
-            return
-        now = pygame.time.get_ticks()   #   Obtém o tempo atual em milissegundos
-        if now - self.last_update > self.animation_speed_ms:    #   Verifica se é hora de trocar o frame
-            self.last_update = now  #   Atualiza o tempo do último frame
-            self.frame_index = (self.frame_index + 1) % len(self.frames)    #   Incrementa o índice do frame, voltando ao início se necessário
-            self.image = self.frames[self.frame_index]  #   Atualiza a imagem do sprite com o novo frame
+        """Troca para o frame correspondente ao tempo atual, se ele mudou."""
+        if self.animacao.atualizar():
+            self.image = self.animacao.quadro   #   Atualiza a imagem do sprite com o novo frame
+            self.dirty = 1  #   Marca a área da esteira para ser redesenhada
 
     def update(self):
         """Método de atualização do sprite, chamado uma vez por frame."""
@@ -57,47 +52,61 @@ class Esteira(pygame.sprite.Sprite):
     def ligar(self):
         """Liga a animação da esteira."""
         self.ligada = True  #   Permite que a animação seja executada
+        self.animacao.retomar()
 
     def desligar(self):
         """Desliga a animação da esteira."""
         self.ligada = False #   Impede que a animação seja executada, mantendo o frame atual
+        self.animacao.pausar()
 
 
-class Elfo(pygame.sprite.Sprite):
+class Elfo(pygame.sprite.DirtySprite):
     """
     Representa o jogador.
     ANALOGIA: Atua como o processo CONSUMIDOR, que retira itens das esteiras
     e os coloca no buffer (Mesa). Também inicia o consumo do buffer (processamento).
     O Elfo pode se mover entre posições fixas (representando as esteiras e a mesa).
     Possui uma capacidade de carga limitada para carregar presentes.
-    Pode carregar e descarregar presentes, além de aumentar sua capacidade de carga.
+    O estado (posição e carga) fica em um 'ElfoLogico'; este sprite apenas o desenha.
     """
-    def __init__(self, positions, start_index=0):
+    def __init__(self, positions, start_index=0, estado=None):
         """
         Inicializa o Elfo com uma imagem, posições possíveis e um índice inicial.
         Args:
             positions (list): Lista de tuplas representando as posições possíveis do Elfo.
             start_index (int): Índice inicial na lista de posições.
+            estado (ElfoLogico, optional): Estado lógico compartilhado com a simulação.
         """
         super().__init__()
 
         # --- Carregamento da Imagem ---
-        self.image = pygame.image.load(os.path.join(PASTA_IMAGENS, "elfo.png")).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (100, 100))
+        self.image = recursos.imagem("elfo.png", (100, 100))
 
         # --- Lógica de Posição ---
         self.positions = positions  # Armazena a lista de posições possíveis
-        self.position_index = start_index  # Guarda o índice da posição atual
+        self.estado = estado if estado is not None else ElfoLogico(len(positions), start_index)
 
         # Define o retângulo do sprite e o posiciona no ponto inicial
         # A posição inicial é baseada no índice fornecido
         self.rect = self.image.get_rect(center=self.positions[self.position_index])
 
-        self.capacidade_carga = 10  #   Capacidade máxima de carga do Elfo
-        self.presentes_carregados = 0   #   Contador de presentes atualmente carregados pelo Elfo
-        self.font_carga = pygame.font.Font(FONTE_BOLD_PATH, 20) # Fonte para o texto de carga
+        self.font_carga = recursos.fonte(FONTE_BOLD_PATH, 20) # Fonte para o texto de carga
         self.texto_carga = None # Superfície para o texto de carga
         self.posicao_texto_carga = None # Posição do texto de carga em relação ao retângulo do sprite
+        self._carga_renderizada = None  # (carga, capacidade) do texto renderizado por último
+
+    # --- Atalhos para o estado lógico ---
+    @property
+    def position_index(self):
+        return self.estado.position_index
+
+    @property
+    def capacidade_carga(self):
+        return self.estado.capacidade_carga
+
+    @property
+    def presentes_carregados(self):
+        return self.estado.presentes_carregados
 
     def move(self, direction):  
         """
@@ -106,43 +115,44 @@ class Elfo(pygame.sprite.Sprite):
         Args:
             direction (str): A direção do movimento ("left" ou "right").
         """
-        if direction == "right":
-            # Verifica se o elfo NÃO está na última posição (limite direito)
-            if self.position_index < len(self.positions) - 1:
-                self.position_index += 1
-                print(f"Moveu para a direita. Novo índice: {self.position_index}")
-
-        elif direction == "left":
-            # Verifica se o elfo NÃO está na primeira posição (limite esquerdo)
-            if self.position_index > 0:
-                self.position_index -= 1
-                print(f"Moveu para a esquerda. Novo índice: {self.position_index}")
-        
+        self.estado.move(direction)
         # Atualiza a posição do retângulo do sprite para a nova posição central
-        self.rect.center = self.positions[self.position_index]
+        self._posicionar()
+
+    def _posicionar(self):
+        """Move o retângulo para a posição atual, marcando o sprite como sujo se ele mudou de lugar."""
+        centro = self.positions[self.position_index]
+        if self.rect.center != centro:
+            self.rect.center = centro
+            self.dirty = 1
+            if self.texto_carga is not None:    # O texto acompanha o elfo sem precisar ser renderizado de novo
+                self.posicao_texto_carga = (self.rect.centerx - self.texto_carga.get_width() // 2,
+                                            self.rect.top - self.texto_carga.get_height() - 5)
 
     def carregar_presente(self):
         """Incrementa a contagem de presentes carregados se não atingir a capacidade."""
-        if self.presentes_carregados < self.capacidade_carga:
-            self.presentes_carregados += 1
+        if self.estado.carregar_presente():
             self._atualizar_texto_carga()
 
     def descarregar_presente(self):
         """Decrementa a contagem de presentes carregados."""
-        if self.presentes_carregados > 0:
-            self.presentes_carregados -= 1
+        if self.estado.descarregar_presente():
             self._atualizar_texto_carga()
 
-    def _atualizar_texto_carga(self):
-        """Atualiza a superfície do texto que indica a quantidade de carga."""
-        cor_texto = (0, 200, 0) # Verde para vazio/pouco carregado
+    def cor_carga(self):
+        """Cor do indicador de carga: verde, amarelo (quase cheio) ou vermelho (cheio)."""
         if self.presentes_carregados == self.capacidade_carga:
-            cor_texto = (255, 0, 0)   # Vermelho para cheio
+            return (255, 0, 0)   # Vermelho para cheio
         elif self.presentes_carregados >= self.capacidade_carga * 0.75:
-            cor_texto = (255, 255, 0) # Amarelo para quase cheio
+            return (255, 255, 0) # Amarelo para quase cheio
+        return (0, 200, 0) # Verde para vazio/pouco carregado
 
+    def _atualizar_texto_carga(self):
+        """Atualiza a superfície do texto que indica a quantidade de carga."""
+        cor_texto = self.cor_carga()
         texto = f"{self.presentes_carregados}"  # Quantidade de presentes carregados
         self.texto_carga = self.font_carga.render(texto, True, cor_texto)
+        self._carga_renderizada = (self.presentes_carregados, self.capacidade_carga)
         self.posicao_texto_carga = (self.rect.centerx - self.texto_carga.get_width() // 2,
                                     self.rect.top - self.texto_carga.get_height() - 5)
     def desenhar_carga(self, surface):  
@@ -155,59 +165,122 @@ class Elfo(pygame.sprite.Sprite):
 
     def aumentar_capacidade(self, aumento):
         """Aumenta a capacidade de carga do elfo."""
-        self.capacidade_carga += aumento
-        print(f"[LEVEL UP] Capacidade do elfo aumentada para: {self.capacidade_carga}")
+        self.estado.aumentar_capacidade(aumento)
         
     def update(self):   #   Método de atualização do sprite, chamado uma vez por frame.
-        """Atualiza o Elfo, incluindo a animação do texto de carga."""
-        self._atualizar_texto_carga() # Garante que o texto seja atualizado a cada frame
+        """Sincroniza a posição com o estado lógico e atualiza o texto de carga se ela mudou."""
+        self._posicionar()
+        if (self.presentes_carregados, self.capacidade_carga) != self._carga_renderizada:
+            self._atualizar_texto_carga()
 
     def draw(self, surface):    #   Método de desenho, chamado uma vez por frame.
         super().draw(surface)   # Desenha o sprite do Elfo na superfície fornecida
         if self.texto_carga is not None and self.posicao_texto_carga is not None:
             surface.blit(self.texto_carga, self.posicao_texto_carga)
 
-class Presente(pygame.sprite.Sprite):   
+class Presente(pygame.sprite.DirtySprite):   
     """
     Representa o item de "trabalho" do jogo. Produzido e consumido.
+    A posição e a queda são calculadas pela simulação ('PresenteLogico');
+    o sprite apenas acompanha esse estado.
     """
 
-    def __init__(self, esteira, game_mechanics, fall_speed=1, ):
+    def __init__(self, esteira=None, estado=None):
         """
         Args:
-            esteira (Esteira): A esteira de onde o presente será gerado.
-            fall_speed (int): A velocidade inicial de queda do presente.
+            esteira (Esteira, optional): A esteira de onde o presente foi gerado.
+            estado (PresenteLogico, optional): Estado lógico do presente na simulação.
+                Sem estado, o sprite fica vazio até 'reiniciar' (usado pelo 'PoolPresentes').
         """
         super().__init__()  
+        self.esteira = None
+        self.estado = None
+        self.image = None
+        self.rect = None
+        if estado is not None:
+            self.reiniciar(esteira, estado)
+
+    def reiniciar(self, esteira, estado):
+        """Passa a desenhar outro presente: esteira, tipo (imagem) e posição vêm do novo estado."""
         self.esteira = esteira  # Referência à esteira de onde o presente foi gerado
-        self.game_mechanics = game_mechanics  # Referência ao gerenciador de mecânicas do jogo
-        self.fall_speed = fall_speed    # Velocidade de queda do presente
-        # --- Carregamento da Imagem do Presente ---
-        tipos_presente = ["presente_visual_1.png", "presente_visual_2.png", "presente_visual_3.png", "presente_visual_4.png"]
-        tipo_escolhido = random.choice(tipos_presente)  # Escolhe aleatoriamente um tipo de presente
-        # Tenta carregar a imagem do presente escolhido
-        try:
-            self.image = pygame.image.load(os.path.join(PASTA_IMAGENS, tipo_escolhido)).convert_alpha()
-        except:
-            # Fallback se a imagem não existir
-            self.image = pygame.Surface((80, 80))
-            self.image.fill((255, 0, 0))  # Vermelho como fallback
-            
-        self.image = pygame.transform.scale(self.image, (80, 80))  # Tamanho maior para melhor visibilidade
-
-        # Define o retângulo do sprite e posiciona acima da esteira
-        self.rect = self.image.get_rect(center=(self.esteira.rect.centerx, self.esteira.rect.top+30))
-
-    def update(self):   
-        """Atualiza a posição do presente, fazendo-o cair."""
-        self.rect.y += self.fall_speed  # Move o presente para baixo pela velocidade de queda
-
-        if self.rect.top > pygame.display.get_surface().get_height():
-            # Avisa o game_mechanics sobre a perda
-            self.game_mechanics.presentes_perdidos += 1
-            print(f"[QUEDA] Um presente caiu no chão! Total de perdidos: {self.game_mechanics.presentes_perdidos}")
-            # E então se autodestrói
-            self.kill()
+        self.estado = estado    # Posição, velocidade e tipo vêm da simulação
+        # Busca a imagem já reescalada no cache (o disco só é lido no primeiro spawn de cada tipo)
+        self.image = recursos.imagem(estado.tipo + ".png", (80, 80))  # Tamanho maior para melhor visibilidade
+        if self.rect is None:
+            self.rect = self.image.get_rect(center=(estado.x, estado.y))
+        else:   # Reaproveita o Rect do uso anterior
+            self.rect.size = self.image.get_size()
+            self.rect.center = (estado.x, estado.y)
+        self.dirty = 1
+
+    def update(self, alpha=1.0):   
+        """
+        Acompanha a posição calculada pela simulação.
+        Args:
+            alpha (float): Fração entre o passo anterior (0) e o atual (1), para interpolar o desenho.
+        """
+        self.posicionar(self.estado.x, round(self.estado.y_interpolado(alpha)))
+
+    def posicionar(self, x, y):
+        """Move o centro do sprite para (x, y), já em pixels (usado na atualização em lote)."""
+        if self.rect.centerx != x or self.rect.centery != y:
+            self.rect.center = (x, y)
+            self.dirty = 1  # Só a área antiga e a nova do presente serão redesenhadas
+
+
+class PoolPresentes:
+    """
+    Reaproveita os sprites 'Presente' em vez de criar um novo a cada spawn e
+    descartá-lo na coleta ou na queda. 'adquirir' devolve um sprite livre
+    (ou cria um, se não houver) já reiniciado com o novo estado; 'liberar' o
+    tira da cena e o guarda para o próximo spawn.
+    ANALOGIA: É o pool de buffers (ou a "slab" de objetos) do kernel: objetos
+    do mesmo tamanho são reciclados em vez de voltar ao alocador a cada uso.
+    As estatísticas (acertos, falhas e o maior número de sprites em uso ao
+    mesmo tempo) servem para dimensionar o 'tamanho_inicial'.
+    """
+    def __init__(self, tamanho_inicial=LIMITE_PRESENTES_CAINDO):
+        self.livres = [Presente() for _ in range(tamanho_inicial)]  # Sprites pré-alocados, prontos para uso
+        self.criados = tamanho_inicial  # Total de sprites já criados pelo pool
+        self.em_uso = 0 # Sprites entregues e ainda não devolvidos
+        # --- Estatísticas ---
+        self.acertos = 0    # Aquisições atendidas por um sprite livre
+        self.falhas = 0 # Aquisições que precisaram criar um sprite novo
+        self.maior_em_uso = 0   # Pico de sprites em uso ao mesmo tempo
+
+    def adquirir(self, esteira, estado):
+        """Retorna um sprite 'Presente' desenhando 'estado' (ainda fora de qualquer grupo)."""
+        if self.livres:
+            presente = self.livres.pop()
+            self.acertos += 1
+        else:
+            presente = Presente()
+            self.criados += 1
+            self.falhas += 1
+        presente.reiniciar(esteira, estado)
+        self.em_uso += 1
+        self.maior_em_uso = max(self.maior_em_uso, self.em_uso)
+        return presente
+
+    def liberar(self, presente):
+        """Tira o sprite de todos os grupos (a área dele é limpa no próximo desenho) e o guarda."""
+        presente.kill()
+        presente.estado = None  # Não segura o estado lógico de um presente que já saiu da partida
+        self.livres.append(presente)
+        self.em_uso -= 1
+
+    def get_estatisticas(self):
+        """Retorna as estatísticas de uso do pool."""
+        aquisicoes = self.acertos + self.falhas
+        return {
+            'criados': self.criados,
+            'livres': len(self.livres),
+            'em_uso': self.em_uso,
+            'maior_em_uso': self.maior_em_uso,
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'taxa_acerto': (self.acertos / aquisicoes) if aquisicoes else 0.0
+        }
 
 
 class GeradorPresentes(threading.Thread):
@@ -236,198 +309,83 @@ class GeradorPresentes(threading.Thread):
         self.join() # Aguarda a thread terminar antes de continuar
 
 
-class MesaDePresentes(pygame.sprite.Sprite):
+class MesaDePresentes(pygame.sprite.DirtySprite):
     """
     Representa a interface VISUAL do recurso compartilhado.
-    Seu estado (número de presentes visuais) reflete o estado do
-    'GerenciadorMesa' lógico.
+    Seu estado (presentes na mesa e processamento) vem de uma 'MesaLogica',
+    que por sua vez reflete o estado do 'GerenciadorMesa' lógico.
     """
-    def __init__(self, position, capacidade=3):
+    def __init__(self, position, capacidade=3, estado=None):
         super().__init__()
         TAMANHO_VISUAL_PRESENTE = (100, 100)
-        self.original_image = pygame.image.load(os.path.join(PASTA_IMAGENS, "mesadeembrulhos.png")).convert_alpha()
-        self.image_base = pygame.transform.scale(self.original_image, size=(150, 80))
-        self.visuais_presentes = []
-        # Usa presente_visual_1.png até presente_visual_4.png na mesa
-        tipos_presente = ["presente_visual_1.png", "presente_visual_2.png", "presente_visual_3.png", "presente_visual_4.png"]
-        for tipo in tipos_presente:
-            try:
-                # Carrega a imagem original do presente
-                original_img = pygame.image.load(os.path.join(PASTA_IMAGENS, tipo)).convert_alpha()
-                # Reescala a imagem para o novo tamanho
-                scaled_img = pygame.transform.scale(original_img, TAMANHO_VISUAL_PRESENTE)
-                # Adiciona a imagem já reescalada à lista
-                self.visuais_presentes.append(scaled_img)
-            except:
-                # Fallback se a imagem não existir
-                fallback_img = pygame.Surface(TAMANHO_VISUAL_PRESENTE)
-                fallback_img.fill((255, 0, 0))  # Vermelho como fallback
-                self.visuais_presentes.append(fallback_img)
-        self.capacidade = capacidade
-        self.itens_visuais = []
-        
-        # --- Variáveis para Processamento Automático ---
-        self.processamento_ativo = True  # Se a mesa deve processar automaticamente
-        self.tempo_processamento = 2000  # Tempo em ms para processar um presente (2 segundos para teste)
-        self.ultimo_processamento = 0  # Inicializa com 0 para começar imediatamente
-        self.presentes_processados_total = 0
-        
-        # --- Estado visual do processamento ---
-        self.processando = False
-        self.tempo_inicio_processamento = 0
+        self.estado = estado if estado is not None else MesaLogica(capacidade)
+        self.capacidade = self.estado.capacidade
+        self.image_base = recursos.imagem("mesadeembrulhos.png", (150, 80))
+        # Usa presente_visual_1.png até presente_visual_4.png na mesa, já reescaladas
+        self.visuais_presentes = {tipo: recursos.imagem(tipo + ".png", TAMANHO_VISUAL_PRESENTE) for tipo in TIPOS_PRESENTE}
+        self.font_proc = recursos.fonte(None, 16)   # Fonte do indicador "PROC"
         self.posicoes_slots = [(-5, -40), (35, -40), (75, -40)] # Ajuste essas posições se necessário
+        self._desenhado = None  # Estado (itens, processando) desenhado por último
         self.image = self.image_base.copy()
         self.rect = self.image.get_rect(center = position)
 
     def _redesenhar_superficie(self):
         """
         Método privado para atualizar a imagem da mesa com os presentes atuais.
-        É chamado sempre que um item é adicionado ou removido.
+        É chamado sempre que um item é adicionado, removido ou entra em processamento.
         """
         self.image = self.image_base.copy()
         # Desenha os presentes na mesa
-        for i, presente_img in enumerate(self.itens_visuais):
+        for i, tipo in enumerate(self.estado.itens):
             # Garante que não tentemos acessar um slot que não existe
             if i < len(self.posicoes_slots):
                 posicao_no_slot = self.posicoes_slots[i]
+                presente_img = self.visuais_presentes[tipo]
                 # Se está processando e é o primeiro presente, adiciona efeito visual
-                if self.processando and i == 0:
+                if self.estado.processando and i == 0:
                     # Cria uma cópia da imagem do presente com transparência
                     presente_processando = presente_img.copy()
                     presente_processando.set_alpha(150)  # Torna semi-transparente
                     self.image.blit(presente_processando, posicao_no_slot)
                     # Adiciona um pequeno texto indicando processamento
-                    try:
-                        font_pequena = pygame.font.Font(None, 16)
-                        texto_proc = font_pequena.render("PROC", True, (255, 255, 0))  # Amarelo
-                        self.image.blit(texto_proc, (posicao_no_slot[0] + 10, posicao_no_slot[1] - 15))
-                    except:
-                        pass  # Se não conseguir carregar fonte, ignora o texto
+                    texto_proc = self.font_proc.render("PROC", True, (255, 255, 0))  # Amarelo
+                    self.image.blit(texto_proc, (posicao_no_slot[0] + 10, posicao_no_slot[1] - 15))
                 else:
                     self.image.blit(presente_img, posicao_no_slot)
-
-    def adicionar_presente_visual(self):
-        """
-        Adiciona a aparência de um novo presente à mesa - se houver espaço
-        retorna True se sucesso
-        """
-        if len(self.itens_visuais) < self.capacidade:   # Verifica se há espaço na mesa
-            novo_presente_img = random.choice(self.visuais_presentes) # Escolhe aleatoriamente uma imagem de presente
-            self.itens_visuais.append(novo_presente_img)    
-            self._redesenhar_superficie()
-            print(f"Visual de presente adicionado. Itens na mesa: {len(self.itens_visuais)}")
-            return True
-        else:
-            print("Visual da mesa já está cheio.")
-            return False
-
-    def remover_presente_visual(self):
-        """
-        Remove a aparência de um presente da mesa.
-        Retorna True se bem-sucedido, False caso contrário.
-        """
-        if self.itens_visuais:  # Verifica se há presentes na mesa
-            self.itens_visuais.pop(0)   # Remove o primeiro presente (FIFO)
-            
-            self._redesenhar_superficie()   
-            print(f"Visual de presente removido. Itens na mesa: {len(self.itens_visuais)}")
-            return True
-        else:
-            print("Visual da mesa já está vazio.")
-            return False
-
-    def processar_presente(self):   
-        """
-        Processa (remove) um presente da mesa, simulando o trabalho de embrulho.
-        Retorna True se processou um presente, False se mesa vazia.
-        """
-        if self.itens_visuais and not self.processando:
-            self.processando = True
-            self.tempo_inicio_processamento = pygame.time.get_ticks()
-            print(f"[MESA] Iniciando processamento de presente...")
-            return True
-        return False
-    
-    def finalizar_processamento_visual(self):
-        """
-        Finaliza o processamento VISUAL de um presente.
-        A lógica de liberação do semáforo é externa.
-        """
-        if self.processando and self.itens_visuais:
-            self.itens_visuais.pop(0)  # Remove o primeiro presente (FIFO)
-            self.presentes_processados_total += 1   # Contador de presentes processados
-            self.processando = False    # Reseta o estado de processamento
-            self._redesenhar_superficie()
-            print(f"[MESA VISUAL] Presente processado! Restam: {len(self.itens_visuais)}, Total processados: {self.presentes_processados_total}")
-            # Não chama mais a lógica de remoção aqui
-            return True 
-        elif self.processando:      # Se estava processando mas não há itens visuais
-            self.processando = False    # Reseta o estado de processamento
-            self._redesenhar_superficie()   # Atualiza a imagem da mesa
-        return False
-
-    def verificar_processamento_concluido(self):
-        """
-        Verifica se o tempo de processamento de um item terminou.
-        Retorna True se um item acabou de ser processado, False caso contrário.
-        Este método é chamado pelo loop principal do jogo.
-        """
-        if self.processando:
-            current_time = pygame.time.get_ticks()
-            tempo_decorrido = current_time - self.tempo_inicio_processamento
-            if tempo_decorrido >= self.tempo_processamento:
-                # O processamento terminou, mas não faz a remoção aqui.
-                # Apenas sinaliza que deve ser feito.
-                return True
-        return False
+        self.dirty = 1  # A mesa mudou: sua área será redesenhada
 
     def update(self):
-        """
-        Atualiza a mesa, focando no início do processamento automático.
-        A finalização será tratada pelo loop principal do jogo.
-        """
-        current_time = pygame.time.get_ticks()
-        # Se o processamento automático está ativo, verifica se deve processar
-        if (self.processamento_ativo and    #   Se o processamento automático está ativo
-              len(self.itens_visuais) > 0 and #  # Se há itens visuais na mesa
-              not self.processando):    # Se não está processando atualmente
-            
-            tempo_desde_ultimo = current_time - self.ultimo_processamento
-            if tempo_desde_ultimo >= self.tempo_processamento:
-                if self.processar_presente():
-                    # No processamento automático, o último processamento só é atualizado
-                    # quando o item é efetivamente removido no game_loop.
-                    pass
-        
-        # Se não há presentes, reseta o timer para evitar processamento imediato
-        # ao adicionar o próximo item.
-        elif len(self.itens_visuais) == 0 and not self.processando:
-            self.ultimo_processamento = current_time
+        """Redesenha a mesa apenas quando o estado lógico mudou."""
+        atual = (tuple(self.estado.itens), self.estado.processando)
+        if atual != self._desenhado:
+            self._desenhado = atual
+            self._redesenhar_superficie()
 
 
-class ContadorDePresentes(pygame.sprite.Sprite):
+class ContadorDePresentes(pygame.sprite.DirtySprite):
     """
     Classe que representa um contador visual de presentes com um ícone animado.
     O ícone do presente pulsa (aumenta e diminui de tamanho) suavemente.
+    Os tamanhos do pulso são pré-calculados uma vez ('ciclo_pulsar'); a cada
+    frame só a área do ícone é trocada pelo quadro correspondente ao tempo.
     """
     def __init__(self, position, font_size=30):
         super().__init__()
         self.position = position # Posição do canto superior esquerdo do contador
-        self.font = pygame.font.Font(FONTE_BOLD_PATH, font_size)
+        self.font = recursos.fonte(FONTE_BOLD_PATH, font_size)
         self.count = 0
 
-        # --- Carregamento e Configuração da Imagem do Ícone ---
-        # Carrega a imagem original do ícone UMA VEZ e já redimensiona para 100x100
-        self.presente_original_img = pygame.image.load(os.path.join(PASTA_IMAGENS, "presente_visual_4.png")).convert_alpha()
-        self.presente_original_img = pygame.transform.scale(self.presente_original_img, (100, 100))
-        self.presente_original_size = self.presente_original_img.get_size()
-        # Esta superfície guardará o ícone redimensionado a cada frame
-        self.presente_animado_img = self.presente_original_img
-
         # --- Parâmetros da Animação de Pulsar ---
-        self.pulse_speed = 3.0  # Quão rápido o ícone pulsa
+        self.pulse_speed = 3.0  # Quão rápido o ícone pulsa (radianos por segundo)
         self.pulse_amplitude = 0.1  # Quão "forte" é o pulso (0.1 = 10% de variação de tamanho)
 
+        # --- Ciclo do Ícone ---
+        # Ícone 100x100 pulsando; o ciclo é compartilhado por todos os contadores
+        periodo_ms = 2 * math.pi / self.pulse_speed * 1000.0
+        self.animacao = Animacao(ciclo_pulsar("presente_visual_4.png", (100, 100),
+                                              self.pulse_amplitude, periodo_ms))
+        self.icone_rect = pygame.Rect((0, 0), self.animacao.ciclo.tamanho)  # Área do ícone dentro de self.image
+
         # Chama o método para criar a imagem inicial do sprite
         self._redesenhar_superficie()
 
@@ -440,45 +398,38 @@ class ContadorDePresentes(pygame.sprite.Sprite):
     def _redesenhar_superficie(self):
         """
         Método privado que combina o texto e o ícone do presente em uma única
-        superfície (self.image).
+        superfície (self.image). Só é chamado quando o texto muda.
         """
         # Renderiza o texto
         texto_surface = self.font.render(f"Presentes: {self.count}", True, VERMELHO)
         texto_rect = texto_surface.get_rect()
 
-        # Pega a imagem do presente já animada (pelo método update)
-        presente_rect = self.presente_animado_img.get_rect()
-
         # Calcula o tamanho da nova superfície combinada
         padding = 10 # Espaço entre o texto e o ícone
-        total_width = texto_rect.width + padding + presente_rect.width
-        total_height = max(texto_rect.height, presente_rect.height)
+        total_width = texto_rect.width + padding + self.icone_rect.width
+        total_height = max(texto_rect.height, self.icone_rect.height)
 
         # Cria a superfície final com fundo transparente
         self.image = pygame.Surface((total_width, total_height), pygame.SRCALPHA)
 
-        # Desenha o texto e o ícone na nova superfície
+        # Desenha o texto; o ícone ocupa uma área fixa à direita
         self.image.blit(texto_surface, (0, (total_height - texto_rect.height) // 2))
-        self.image.blit(self.presente_animado_img, (texto_rect.width + padding, (total_height - presente_rect.height) // 2))
+        self.icone_rect.topleft = (texto_rect.width + padding, (total_height - self.icone_rect.height) // 2)
+        self._desenhar_icone()
 
         # Atualiza o retângulo principal do sprite
         self.rect = self.image.get_rect(topleft=self.position)
 
+    def _desenhar_icone(self):
+        """Troca apenas a área do ícone pelo quadro atual do ciclo."""
+        self.image.fill((0, 0, 0, 0), self.icone_rect)
+        self.image.blit(self.animacao.quadro, self.icone_rect)
+        self.dirty = 1
+
     def update(self):
         """
-        Atualiza a animação do ícone do presente a cada frame.
+        Atualiza a animação do ícone do presente: o quadro é escolhido pelo
+        tempo e só é desenhado quando muda.
         """
-        # Calcula o fator de escala usando uma função seno para criar a pulsação
-        # pygame.time.get_ticks() retorna o tempo em milissegundos
-        tempo = pygame.time.get_ticks() / 1000.0  # Converte para segundos
-        scale_factor = 1.0 + math.sin(tempo * self.pulse_speed) * self.pulse_amplitude
-
-        # Calcula as novas dimensões do ícone
-        novo_width = int(self.presente_original_size[0] * scale_factor)
-        novo_height = int(self.presente_original_size[1] * scale_factor)
-
-        # Redimensiona a imagem original
-        self.presente_animado_img = pygame.transform.scale(self.presente_original_img, (novo_width, novo_height))
-
-        # Chama o método para redesenhar a superfície combinada com o ícone no novo tamanho
-        self._redesenhar_superficie()
\ No newline at end of file
+        if self.animacao.atualizar():
+            self._desenhar_icone()
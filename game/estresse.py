@@ -0,0 +1,157 @@
+#   game/estresse.py
+"""
+Modo de estresse: roda o jogo completo (produtores no agendador, fila de
+presentes, simulação, sprites, HUD e renderizador) com N esteiras geradas
+a partir de parâmetros, sem o limite de presentes caindo e sem vitória ou
+derrota. Um jogador automático ('PoliticaGulosa') coleta o que consegue.
+Para cada quantidade de esteiras, a partida roda por alguns segundos e são
+reportados o tempo de trabalho por frame (p50/p95/p99), o FPS efetivo e as
+taxas de perda: presentes descartados na fila (o jogo não deu conta de
+retirá-los) e presentes que caíram no chão (o elfo não deu conta de pegar).
+Aumentando N, a tabela mostra onde o sistema quebra: primeiro o frame passa
+do orçamento (1000/FPS ms), depois a fila começa a transbordar.
+A mesa continua uma só, de propósito: ela é o buffer do consumidor (um
+monitor com um único mutex) servido por um único elfo, e o que o estresse
+escala são os produtores, a fila e o custo do frame.
+Uso:
+    python -m so_projeto_final.game.estresse --esteiras 3 30 100 300 --segundos 10
+    python -m so_projeto_final.game.estresse --esteiras 1000 --fisica numpy --janela
+    python -m so_projeto_final.game.estresse --esteiras 30 300 --por-frame 3 --capacidade-fila 100
+"""
+import os   # Importa os para configurar o driver de vídeo antes do Pygame
+import sys  # Importa sys para decidir se a janela é visível
+if "--janela" not in sys.argv:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")   # Sem janela visível, como no benchmark
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import json # Importa json para salvar o resultado
+import time # Importa time para a data da medição
+import pygame   # Importa o Pygame para a tela e o relógio
+from ..settings import LARGURA_TELA, ALTURA_TELA, FPS
+from .main_game import game_loop
+from .mechanics import GameMechanics
+from .simulacao import SimulacaoPartida, LayoutOficina, PoliticaGulosa
+from .ciclo_vida import ciclo_vida  # Confirma que nenhuma thread sobrou entre as rodadas
+from .benchmark import resumir
+
+ESTEIRAS_PADRAO = (3, 10, 30, 100, 300) # Quantidades de esteiras testadas por padrão
+INTERVALO_PADRAO_S = 1.0    # Intervalo de produção de cada esteira
+SEGUNDOS_PADRAO = 10.0  # Duração de cada rodada (tempo real)
+CAPACIDADE_FILA_ESTRESSE = 1000 # Presentes produzidos que podem esperar para aparecer na tela
+PRESENTES_POR_FRAME_ESTRESSE = 500  # Presentes retirados da fila por frame, no máximo
+
+
+def rodar_estresse(screen, clock, num_esteiras, intervalo=INTERVALO_PADRAO_S, segundos=SEGUNDOS_PADRAO,
+                   fisica="python", capacidade_fila=CAPACIDADE_FILA_ESTRESSE,
+                   presentes_por_frame=PRESENTES_POR_FRAME_ESTRESSE):
+    """
+    Roda uma partida de estresse com 'num_esteiras' esteiras e retorna as medidas.
+    Returns:
+        dict: Tempos de frame (ms), FPS efetivo e contadores/taxas de perda.
+    """
+    mecanicas = GameMechanics((intervalo,) * num_esteiras, capacidade_fila=capacidade_fila)
+    # Produtores na thread do agendador, como no jogo. Precisa vir antes da simulação:
+    # com as mecânicas paradas, ela os levaria para o relógio simulado, que atrasa junto com os frames
+    mecanicas.iniciar_sistema()
+    simulacao = SimulacaoPartida(mecanicas, layout=LayoutOficina(num_esteiras), fisica=fisica,
+                                 max_presentes_por_frame=presentes_por_frame, limite_presentes=None,
+                                 verificar_fim=False)
+    tempos_frame = []
+    maior_em_queda = [0]
+
+    politica_elfo = PoliticaGulosa()
+    def politica(sim):
+        maior_em_queda[0] = max(maior_em_queda[0], len(sim.presentes))
+        return politica_elfo(sim)
+
+    inicio = time.perf_counter()
+    try:
+        game_loop(screen, clock, mecanicas, simulacao=simulacao, politica=politica,
+                  duracao_max_ms=segundos * 1000.0, tempos_frame=tempos_frame)
+    finally:
+        mecanicas.parar_sistema()
+    duracao = time.perf_counter() - inicio
+    ciclo_vida.verificar_linha_de_base()
+
+    fila = mecanicas.fila_presentes_visuais.get_estatisticas()
+    produzidos = sum(p.presentes_criados for p in mecanicas.produtores)
+    descartados_fila = fila['descartados'] + fila['perdidos']
+    caidos = mecanicas.presentes_perdidos
+    return {
+        'esteiras': num_esteiras,
+        'fisica': fisica,
+        'segundos': round(duracao, 2),
+        'frames': len(tempos_frame),
+        'fps_efetivo': round(len(tempos_frame) / duracao, 1) if duracao else 0.0,
+        'frame_ms': resumir([t / 1000.0 for t in tempos_frame]),
+        'produzidos': produzidos,
+        'produzidos_por_s': round(produzidos / duracao, 1) if duracao else 0.0,
+        'descartados_fila': descartados_fila,
+        'maior_ocupacao_fila': fila['maior_ocupacao'],
+        'caidos': caidos,
+        'coletados': simulacao.presentes_coletados,
+        'maior_em_queda': maior_em_queda[0],
+        'taxa_descarte_fila': round(descartados_fila / produzidos, 4) if produzidos else 0.0,
+        'taxa_queda': round(caidos / produzidos, 4) if produzidos else 0.0,
+        'latencias': simulacao.latencias.resumo()
+    }
+
+
+def diagnosticar(medida, fps=FPS):
+    """Descreve em poucas palavras se (e onde) a rodada passou do limite."""
+    problemas = []
+    if medida['frame_ms']['p95'] > 1000.0 / fps:
+        problemas.append(f"frame p95 acima de {1000.0 / fps:.1f} ms")
+    if medida['descartados_fila']:
+        problemas.append("fila transbordou")
+    return ", ".join(problemas) if problemas else "ok"
+
+
+def imprimir_tabela(medidas):
+    """Mostra uma linha por quantidade de esteiras."""
+    print("=" * 118)
+    print(f"{'esteiras':>8} {'fps':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'prod/s':>8} {'em queda':>9} "
+          f"{'desc. fila':>10} {'caídos':>8} {'perda fila':>10} {'perda chão':>10}  diagnóstico")
+    for m in medidas:
+        f = m['frame_ms']
+        print(f"{m['esteiras']:>8} {m['fps_efetivo']:>6.1f} {f['p50']:>8.2f} {f['p95']:>8.2f} {f['p99']:>8.2f} "
+              f"{m['produzidos_por_s']:>8.1f} {m['maior_em_queda']:>9} {m['descartados_fila']:>10} {m['caidos']:>8} "
+              f"{m['taxa_descarte_fila']:>10.1%} {m['taxa_queda']:>10.1%}  {diagnosticar(m)}")
+    print("=" * 118)
+
+
+# Execução standalone: uma rodada por quantidade de esteiras
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Modo de estresse da Oficina do Noel com N esteiras.")
+    parser.add_argument("--esteiras", type=int, nargs="+", default=list(ESTEIRAS_PADRAO),
+                        help="Quantidades de esteiras (uma rodada para cada)")
+    parser.add_argument("--intervalo", type=float, default=INTERVALO_PADRAO_S,
+                        help="Intervalo de produção de cada esteira (s)")
+    parser.add_argument("--segundos", type=float, default=SEGUNDOS_PADRAO, help="Duração de cada rodada (s)")
+    parser.add_argument("--fisica", choices=("python", "numpy"), default="python", help="Física dos presentes")
+    parser.add_argument("--capacidade-fila", type=int, default=CAPACIDADE_FILA_ESTRESSE,
+                        help="Capacidade da fila entre os produtores e o jogo")
+    parser.add_argument("--por-frame", type=int, default=PRESENTES_POR_FRAME_ESTRESSE,
+                        help="Presentes retirados da fila por frame, no máximo")
+    parser.add_argument("--janela", action="store_true", help="Mostra a janela (por padrão roda sem janela)")
+    parser.add_argument("--saida", help="Arquivo JSON onde salvar as medidas")
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((LARGURA_TELA, ALTURA_TELA))
+    pygame.display.set_caption("Oficina do Noel - estresse")
+    clock = pygame.time.Clock()
+    ciclo_vida.marcar_linha_de_base()
+    medidas = []
+    for num_esteiras in args.esteiras:
+        print(f"[ESTRESSE] {num_esteiras} esteiras por {args.segundos:.0f}s...")
+        medidas.append(rodar_estresse(screen, clock, num_esteiras, args.intervalo, args.segundos, args.fisica,
+                                      args.capacidade_fila, args.por_frame))
+    imprimir_tabela(medidas)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump({'data': time.strftime("%Y-%m-%dT%H:%M:%S"), 'fps_alvo': FPS, 'medidas': medidas}, f, indent=2)
+        print(f"Resultado salvo em {args.saida}")
+    pygame.quit()
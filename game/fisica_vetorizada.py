@@ -0,0 +1,214 @@
+#   game/fisica_vetorizada.py
+"""
+Física vetorizada (opcional, requer NumPy) dos presentes em queda.
+Em vez de um objeto por presente, todos os presentes da partida ficam em
+arrays paralelos ("struct of arrays"): x, y, y anterior, velocidade, esteira,
+tipo e vivo. Um passo da simulação é uma única operação sobre os arrays, e os
+presentes que passaram do chão são encontrados com uma única máscara.
+'PresentesVetorizados' tem a mesma interface de 'IndicePorEsteira' (o índice
+por faixas da simulação em Python puro), então a 'SimulacaoPartida' usa um
+ou outro sem mudar as regras. O que sai do índice (eventos de spawn, coleta
+e queda) são 'PresenteVetorizado': objetos leves que leem a posição direto
+dos arrays, com os mesmos atributos de 'PresenteLogico'.
+Compensa a partir de milhares de presentes na tela (modo de estresse); com
+os poucos presentes de uma partida normal, a versão em Python é mais rápida.
+"""
+try:
+    import numpy as np  # Dependência opcional: sem ela, só a física em Python puro está disponível
+except ImportError:
+    np = None
+
+NUMPY_DISPONIVEL = np is not None
+CAPACIDADE_INICIAL = 1024   # Posições reservadas nos arrays; dobram quando acabam
+
+
+class PresenteVetorizado:
+    """
+    Um presente guardado em 'PresentesVetorizados' (mesmos atributos de
+    'PresenteLogico'). Enquanto está em queda, 'y' e 'y_anterior' são lidos
+    dos arrays; ao sair do índice, os últimos valores ficam guardados aqui.
+    """
+    __slots__ = ('id', 'esteira', 'tipo', 'x', 'velocidade', '_fisica', '_posicao', '_y', '_y_anterior')
+
+    def __init__(self, fisica, posicao, id, esteira, tipo, x, velocidade):
+        self.id = id
+        self.esteira = esteira
+        self.tipo = tipo
+        self.x = x
+        self.velocidade = velocidade
+        self._fisica = fisica
+        self._posicao = posicao # Índice nos arrays (-1 depois de sair do índice)
+        self._y = 0.0
+        self._y_anterior = 0.0
+
+    @property
+    def y(self):
+        return float(self._fisica.y[self._posicao]) if self._posicao >= 0 else self._y
+
+    @property
+    def y_anterior(self):
+        return float(self._fisica.y_anterior[self._posicao]) if self._posicao >= 0 else self._y_anterior
+
+    def y_interpolado(self, alpha):
+        """Posição vertical entre o passo anterior (alpha=0) e o atual (alpha=1)."""
+        return self.y_anterior + (self.y - self.y_anterior) * alpha
+
+    def _soltar(self):
+        """Guarda a última posição e desliga o objeto dos arrays (a posição será reaproveitada)."""
+        self._y = float(self._fisica.y[self._posicao])
+        self._y_anterior = float(self._fisica.y_anterior[self._posicao])
+        self._posicao = -1
+
+
+class PresentesVetorizados:
+    """
+    Presentes em queda guardados em arrays NumPy, com a interface de 'IndicePorEsteira'.
+    As posições livres (de presentes coletados ou caídos) são reaproveitadas;
+    quando acabam, os arrays dobram de tamanho.
+    O presente mais baixo de cada faixa fica em cache ('_mais_baixo'): ele é
+    recalculado para todas as faixas de uma vez, só na primeira consulta
+    depois de um 'mover'. Assim, consultar as N faixas em um frame custa uma
+    ordenação dos arrays, e não N varreduras.
+    """
+    def __init__(self, num_esteiras, capacidade=CAPACIDADE_INICIAL):
+        if np is None:
+            raise ImportError("A física vetorizada requer NumPy (pip install numpy)")
+        self.num_esteiras = num_esteiras
+        self.capacidade = 0
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.y_anterior = np.zeros(0)
+        self.velocidade = np.zeros(0)
+        self.esteira = np.zeros(0, dtype=np.int32)
+        self.tipo = np.zeros(0, dtype=np.int16) # Código do tipo (índice em 'self._tipos')
+        self.vivo = np.zeros(0, dtype=bool)
+        self._objetos = []  # posição -> PresenteVetorizado (None se livre)
+        self._livres = []   # Posições livres (pilha)
+        self._tipos = []    # código -> nome do tipo
+        self._codigos_tipo = {} # nome do tipo -> código
+        self.total = 0
+        self._mais_baixo = np.full(num_esteiras, -1, dtype=np.int64)  # esteira -> posição do mais baixo (-1: vazia)
+        self._mais_baixo_valido = True  # False depois de 'mover', até a próxima consulta
+        self._crescer(capacidade)
+
+    def _crescer(self, capacidade):
+        """Aumenta os arrays para 'capacidade' posições, preservando o conteúdo."""
+        extra = capacidade - self.capacidade
+        for nome in ('x', 'y', 'y_anterior', 'velocidade', 'esteira', 'tipo', 'vivo'):
+            antigo = getattr(self, nome)
+            novo = np.zeros(capacidade, dtype=antigo.dtype)
+            novo[:self.capacidade] = antigo
+            setattr(self, nome, novo)
+        self._objetos.extend([None] * extra)
+        self._livres.extend(range(capacidade - 1, self.capacidade - 1, -1))  # Menores posições saem primeiro
+        self.capacidade = capacidade
+
+    # --- Inserção e remoção ---
+    def criar(self, id, esteira, tipo, x, y, velocidade):
+        """Cria um presente em queda e retorna o 'PresenteVetorizado' que o representa."""
+        if not self._livres:
+            self._crescer(self.capacidade * 2)
+        posicao = self._livres.pop()
+        codigo = self._codigos_tipo.get(tipo)
+        if codigo is None:
+            codigo = self._codigos_tipo[tipo] = len(self._tipos)
+            self._tipos.append(tipo)
+        self.x[posicao] = x
+        self.y[posicao] = self.y_anterior[posicao] = y
+        self.velocidade[posicao] = velocidade
+        self.esteira[posicao] = esteira
+        self.tipo[posicao] = codigo
+        self.vivo[posicao] = True
+        if self._mais_baixo_valido: # O novo presente só muda a sua faixa, e só se ficar abaixo do atual
+            atual = self._mais_baixo[esteira]
+            if atual < 0 or y > self.y[atual]:
+                self._mais_baixo[esteira] = posicao
+        presente = PresenteVetorizado(self, posicao, id, esteira, tipo, x, velocidade)
+        self._objetos[posicao] = presente
+        self.total += 1
+        return presente
+
+    def adicionar(self, presente):
+        """Copia um 'PresenteLogico' para os arrays e retorna o 'PresenteVetorizado' equivalente."""
+        return self.criar(presente.id, presente.esteira, presente.tipo, presente.x, presente.y, presente.velocidade)
+
+    def _remover(self, posicoes):
+        """Libera as posições e devolve os presentes que estavam nelas."""
+        removidos = []
+        for posicao in posicoes:
+            presente = self._objetos[posicao]
+            presente._soltar()
+            self._objetos[posicao] = None
+            self._livres.append(posicao)
+            removidos.append(presente)
+        self.vivo[posicoes] = False
+        self.velocidade[posicoes] = 0.0 # Posições livres não se movem
+        self.total -= len(removidos)
+        return removidos
+
+    # --- Consultas por faixa ---
+    def _atualizar_mais_baixos(self):
+        """Recalcula o mais baixo de todas as faixas com uma única ordenação."""
+        self._mais_baixo.fill(-1)
+        vivos = np.flatnonzero(self.vivo)
+        if len(vivos):
+            ordenados = vivos[np.lexsort((self.y[vivos], self.esteira[vivos]))]  # Por faixa e, nela, por y
+            faixas = self.esteira[ordenados]
+            ultimos = np.flatnonzero(np.append(faixas[1:] != faixas[:-1], True))   # Maior y de cada faixa
+            self._mais_baixo[faixas[ultimos]] = ordenados[ultimos]
+        self._mais_baixo_valido = True
+
+    def _buscar_mais_baixo(self, esteira):
+        """Posição do mais baixo de uma só faixa (-1 se vazia), varrendo os arrays."""
+        alturas = np.where(self.vivo & (self.esteira == esteira), self.y, -np.inf)
+        posicao = int(alturas.argmax())
+        return posicao if alturas[posicao] > -np.inf else -1
+
+    def _posicao_mais_baixo(self, esteira):
+        if not self._mais_baixo_valido:
+            self._atualizar_mais_baixos()
+        posicao = int(self._mais_baixo[esteira])
+        return posicao if posicao >= 0 else None
+
+    def mais_baixo(self, esteira):
+        """Retorna o presente mais perto do chão na faixa 'esteira', ou None."""
+        posicao = self._posicao_mais_baixo(esteira)
+        return None if posicao is None else self._objetos[posicao]
+
+    def remover_mais_baixo(self, esteira):
+        """Retira e retorna o presente mais perto do chão na faixa 'esteira'."""
+        presente = self._remover([self._posicao_mais_baixo(esteira)])[0]
+        self._mais_baixo[esteira] = self._buscar_mais_baixo(esteira)   # Só a faixa do presente retirado muda
+        return presente
+
+    # --- Passo da física ---
+    def mover(self, dt_s, limite):
+        """
+        Faz todos os presentes caírem 'dt_s' segundos (uma operação por array)
+        e retira, com uma única máscara, os que passaram de 'limite'.
+        Returns:
+            list: Presentes que passaram do chão.
+        """
+        np.copyto(self.y_anterior, self.y)
+        self.y += self.velocidade * dt_s    # Posições livres têm velocidade 0
+        self._mais_baixo_valido = False # Um presente mais rápido pode ter passado outro da mesma faixa
+        caidos = np.flatnonzero(self.vivo & (self.y > limite))
+        return self._remover(caidos.tolist()) if len(caidos) else []
+
+    def posicoes_interpoladas(self, alpha):
+        """
+        Posições de desenho de todos os presentes em queda, calculadas em lote.
+        Returns:
+            zip: Tuplas (id, x, y) com x e y já arredondados para pixels.
+        """
+        posicoes = np.flatnonzero(self.vivo)
+        ys = self.y_anterior[posicoes] + (self.y[posicoes] - self.y_anterior[posicoes]) * alpha
+        ids = [self._objetos[p].id for p in posicoes.tolist()]
+        return zip(ids, self.x[posicoes].round().astype(np.int64).tolist(), ys.round().astype(np.int64).tolist())
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        objetos = self._objetos
+        return (objetos[p] for p in np.flatnonzero(self.vivo).tolist())
@@ -0,0 +1,116 @@
+#   game/hud.py
+"""
+HUD em modo retido: cada informação exibida é um campo ('CampoHUD') que
+guarda o último valor e a superfície já renderizada. A fonte só é
+rasterizada de novo quando o valor muda, e apenas a área daquele campo é
+recomposta no painel.
+O fundo semitransparente e os textos fixos (como a lista de instruções) são
+compostos uma única vez, na criação do painel.
+"""
+import pygame   # Importa o Pygame para superfícies e sprites
+from ..settings import LARGURA_TELA, BRANCO, VERMELHO, VERDE_ESCURO, PRETO_TRANSPARENTE
+
+
+class CampoHUD:
+    """
+    Um valor exibido no HUD.
+    A função 'formatar' recebe o valor e devolve (texto, cor); ela só é
+    chamada quando o valor muda.
+    """
+    def __init__(self, posicao, fonte, formatar):
+        """
+        Args:
+            posicao (tuple): Posição (x, y) do texto, relativa ao painel.
+            fonte (pygame.font.Font): Fonte do texto.
+            formatar (callable): formatar(valor) -> (texto, cor).
+        """
+        self.posicao = posicao
+        self.fonte = fonte
+        self.formatar = formatar
+        self._valor = object()  # Valor renderizado por último (sentinela: nada renderizado ainda)
+        self.surface = None # Texto já renderizado
+        self.rect = pygame.Rect(posicao, (0, 0))    # Área ocupada no painel
+        self.renderizacoes = 0  # Quantas vezes a fonte foi rasterizada (para diagnóstico)
+
+    def atualizar(self, valor):
+        """
+        Renderiza o texto de novo apenas se o valor mudou.
+        Returns:
+            pygame.Rect or None: Área do painel que precisa ser recomposta, ou None se nada mudou.
+        """
+        if valor == self._valor:
+            return None
+        self._valor = valor
+        texto, cor = self.formatar(valor)
+        area_antiga = self.rect
+        self.surface = self.fonte.render(texto, True, cor)
+        self.rect = self.surface.get_rect(topleft=self.posicao)
+        self.renderizacoes += 1
+        return area_antiga.union(self.rect)
+
+
+class PainelHUD(pygame.sprite.DirtySprite):
+    """
+    Painel semitransparente com textos fixos pré-compostos e campos dinâmicos.
+    Só a área de um campo que mudou é limpa e redesenhada.
+    """
+    def __init__(self, rect, cor_fundo=PRETO_TRANSPARENTE):
+        super().__init__()
+        self.rect = pygame.Rect(rect)
+        self.cor_fundo = cor_fundo  # Cor (com alpha) do fundo do painel
+        self.fundo = pygame.Surface(self.rect.size, pygame.SRCALPHA)    # Fundo + textos fixos
+        self.fundo.fill(self.cor_fundo)
+        self.image = self.fundo.copy()
+        self.campos = {}    # nome -> CampoHUD
+
+    def adicionar_texto_fixo(self, texto, posicao, fonte, cor):
+        """Compõe um texto que nunca muda diretamente no fundo do painel."""
+        self.fundo.blit(fonte.render(texto, True, cor), posicao)
+        self.image = self.fundo.copy()
+        self.dirty = 1
+
+    def adicionar_campo(self, nome, posicao, fonte, formatar):
+        """Cria um campo dinâmico. 'posicao' é relativa ao canto do painel."""
+        self.campos[nome] = CampoHUD(posicao, fonte, formatar)
+
+    def atualizar(self, valores):
+        """
+        Atualiza os campos com os valores do frame.
+        Args:
+            valores (dict): nome do campo -> valor atual.
+        """
+        for nome, valor in valores.items():
+            campo = self.campos[nome]
+            area = campo.atualizar(valor)
+            if area is None:
+                continue
+            # Restaura o fundo só na área do campo e desenha o texto novo
+            self.image.fill((0, 0, 0, 0), area)
+            self.image.blit(self.fundo, area, area, special_flags=pygame.BLEND_RGBA_ADD)  # Cópia exata do fundo
+            self.image.blit(campo.surface, campo.rect)
+            self.dirty = 1
+
+
+def criar_painel_estatisticas(font, font_small):
+    """Painel de estatísticas da partida (canto superior esquerdo)."""
+    painel = PainelHUD((5, 5, 200, 205))
+    # Posições relativas ao painel (o texto fica em x=10 da tela)
+    painel.adicionar_campo('pontuacao', (5, 5), font, lambda v: (f"Pontuação: {v}", BRANCO))
+    painel.adicionar_campo('nivel', (5, 35), font, lambda v: (f"Nível: {v}", BRANCO))
+    painel.adicionar_campo('mesa', (5, 65), font_small, lambda v: (f"Mesa: {v[0]}/{v[1]}", BRANCO))
+    painel.adicionar_campo('proc_auto', (5, 85), font_small,
+                           lambda ativo: (f"Proc. Auto: {'ATIVO' if ativo else 'PAUSADO'}", VERDE_ESCURO if ativo else VERMELHO))
+    painel.adicionar_campo('processados', (5, 105), font_small, lambda v: (f"Processados: {v}", BRANCO))
+    painel.adicionar_campo('vel_proc', (5, 125), font_small, lambda v: (f"Vel. Proc: {v / 1000.0:.1f}s", BRANCO))
+    painel.adicionar_campo('perdidos', (5, 145), font_small, lambda v: (f"Perdidos: {v}", VERMELHO))
+    painel.adicionar_campo('penalidade', (5, 165), font_small, lambda v: (f"Penalidade: {v}", VERMELHO))
+    painel.adicionar_campo('caindo', (5, 185), font_small, lambda v: (f"Presentes Caindo: {v}", (255, 255, 0)))
+    return painel
+
+
+def criar_painel_instrucoes(font_small, instrucoes):
+    """Painel de instruções (canto superior direito), todo composto uma única vez."""
+    painel = PainelHUD((LARGURA_TELA - 230, 5, 225, 150))
+    for i, instrucao in enumerate(instrucoes):
+        painel.adicionar_texto_fixo(instrucao, (10, 5 + i * 18), font_small, BRANCO)
+    return painel
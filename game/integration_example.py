@@ -89,7 +89,8 @@ game_mechanics.parar_sistema()
 === OBSERVAÇÕES TÉCNICAS ===
 
 1. Threads são marcadas como daemon para terminarem com o programa
-2. Queue thread-safe é usada para comunicação entre threads
+2. Uma fila limitada (mutex + variável de condição) leva os presentes das threads ao jogo,
+   com uma política configurável para quando ela enche
 3. Semáforos controlam acesso ao recurso compartilhado (mesa)
 4. Mutex protege seções críticas das operações
 5. Escalonador simula preempção ajustando velocidades
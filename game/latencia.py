@@ -0,0 +1,144 @@
+#   game/latencia.py
+"""
+Latência de ponta a ponta de cada presente, etapa por etapa:
+    fila          produzido (thread do agendador) -> apareceu na esteira
+    queda         apareceu na esteira -> coletado pelo elfo
+    carga         coletado -> entregue à mesa ('GerenciadorMesa')
+    espera_mesa   entregue -> início do processamento
+    processamento início -> fim do processamento
+    total         soma das etapas (só para presentes processados)
+Cada presente leva uma 'ViagemPresente' com os instantes de cada etapa.
+Quando uma etapa termina, sua duração vai para um 'HistogramaLog': buckets
+em escala logarítmica (quatro por oitava, de 14% a 25% de largura), então observar
+custa um 'frexp' e uma soma, e a memória não cresce com o número de presentes.
+Os percentis saem dos buckets, com erro de no máximo meio bucket (até ~12%).
+ANALOGIA: É o "tempo de retorno" (turnaround) de um processo decomposto em
+tempo na fila de prontos, em espera por E/S e em execução.
+"""
+import math # Importa math para o frexp (expoente e mantissa de um float)
+from ..metricas import metricas # As mesmas latências, exportadas como histograma Prometheus
+
+ETAPAS = ("fila", "queda", "carga", "espera_mesa", "processamento", "total")
+SUBDIVISOES_OITAVA = 4  # Buckets por potência de 2
+MENOR_LATENCIA_MS = 2.0 ** -4   # Abaixo disso (62,5 µs), tudo cai no primeiro bucket
+
+metrica_latencia = metricas.histograma(
+    "oficina_latencia_etapa_segundos", "Latência de cada etapa do caminho de um presente",
+    tuple(2.0 ** k for k in range(-6, 6)), ("etapa",))  # 15,6 ms a 32 s, em potências de 2
+
+
+class HistogramaLog:
+    """Histograma de durações (ms) com buckets logarítmicos e contagem por bucket em um dict."""
+    __slots__ = ('buckets', 'contagem', 'soma', 'minimo', 'maximo')
+
+    def __init__(self):
+        self.buckets = {}   # índice do bucket -> contagem (só os buckets usados)
+        self.contagem = 0
+        self.soma = 0.0
+        self.minimo = math.inf
+        self.maximo = 0.0
+
+    @staticmethod
+    def _indice(ms):
+        if ms <= MENOR_LATENCIA_MS:
+            return None
+        mantissa, expoente = math.frexp(ms)  # ms = mantissa * 2**expoente, 0.5 <= mantissa < 1
+        return expoente * SUBDIVISOES_OITAVA + int((mantissa - 0.5) * 2 * SUBDIVISOES_OITAVA)
+
+    @staticmethod
+    def _limites(indice):
+        """Limites inferior e superior (ms) do bucket 'indice'."""
+        if indice is None:
+            return 0.0, MENOR_LATENCIA_MS
+        expoente, sub = divmod(indice, SUBDIVISOES_OITAVA)
+        passo = 1.0 / (2 * SUBDIVISOES_OITAVA)
+        return math.ldexp(0.5 + sub * passo, expoente), math.ldexp(0.5 + (sub + 1) * passo, expoente)
+
+    def observar(self, ms):
+        indice = self._indice(ms)
+        self.buckets[indice] = self.buckets.get(indice, 0) + 1
+        self.contagem += 1
+        self.soma += ms
+        if ms > self.maximo:
+            self.maximo = ms
+        if ms < self.minimo:
+            self.minimo = ms
+
+    def percentil(self, p):
+        """Estimativa do percentil 'p' (0-100) em ms: centro do bucket onde ele cai (dentro de [mínimo, máximo])."""
+        if not self.contagem:
+            return 0.0
+        alvo = p / 100.0 * self.contagem
+        acumulado = 0
+        for indice in sorted(self.buckets, key=lambda i: -1 if i is None else i):
+            acumulado += self.buckets[indice]
+            if acumulado >= alvo:
+                inferior, superior = self._limites(indice)
+                return min(self.maximo, max(self.minimo, (inferior + superior) / 2))
+        return self.maximo
+
+    def resumo(self):
+        """Contagem, média, p50, p95, p99 e máximo (ms)."""
+        return {
+            'contagem': self.contagem,
+            'media_ms': round(self.soma / self.contagem, 2) if self.contagem else 0.0,
+            'p50_ms': round(self.percentil(50), 2),
+            'p95_ms': round(self.percentil(95), 2),
+            'p99_ms': round(self.percentil(99), 2),
+            'max_ms': round(self.maximo, 2)
+        }
+
+
+class ViagemPresente:
+    """Tempo na fila e instantes (ms, relógio da simulação) das etapas já cumpridas por um presente."""
+    __slots__ = ('fila_ms', 'spawn_ms', 'coleta_ms', 'entrega_ms')
+
+    def __init__(self, fila_ms, spawn_ms):
+        self.fila_ms = fila_ms  # Tempo entre a produção e o spawn (medido no relógio do agendador)
+        self.spawn_ms = spawn_ms
+        self.coleta_ms = None
+        self.entrega_ms = None
+
+
+class LatenciasPresentes:
+    """Um 'HistogramaLog' por etapa, alimentado conforme os presentes avançam."""
+
+    def __init__(self):
+        self.histogramas = {etapa: HistogramaLog() for etapa in ETAPAS}
+
+    def observar(self, etapa, ms):
+        self.histogramas[etapa].observar(ms)
+        metrica_latencia.observar(ms / 1000.0, etapa=etapa)
+
+    def spawn(self, produzido_em_s, agora_agendador_s, agora_ms):
+        """Presente saiu da fila e apareceu na esteira. Retorna a 'ViagemPresente' dele."""
+        fila_ms = max(0.0, (agora_agendador_s - produzido_em_s) * 1000.0)
+        self.observar("fila", fila_ms)
+        return ViagemPresente(fila_ms, agora_ms)
+
+    def coleta(self, viagem, agora_ms):
+        viagem.coleta_ms = agora_ms
+        self.observar("queda", agora_ms - viagem.spawn_ms)
+
+    def entrega(self, viagem, agora_ms):
+        viagem.entrega_ms = agora_ms
+        self.observar("carga", agora_ms - viagem.coleta_ms)
+
+    def processado(self, viagem, inicio_ms, fim_ms):
+        """Fim do processamento: fecha as etapas da mesa e o total do presente."""
+        espera = max(0.0, inicio_ms - viagem.entrega_ms)
+        self.observar("espera_mesa", espera)
+        self.observar("processamento", fim_ms - inicio_ms)
+        self.observar("total", viagem.fila_ms + (viagem.entrega_ms - viagem.spawn_ms) + espera + (fim_ms - inicio_ms))
+
+    def resumo(self):
+        """Resumo (contagem, média e percentis em ms) de cada etapa."""
+        return {etapa: histograma.resumo() for etapa, histograma in self.histogramas.items()}
+
+    def linhas_relatorio(self):
+        """Uma linha de texto por etapa, para o terminal no fim da partida."""
+        linhas = []
+        for etapa, r in self.resumo().items():
+            linhas.append(f"{etapa:<14} n={r['contagem']:<5} p50={r['p50_ms'] / 1000.0:6.2f}s "
+                          f"p95={r['p95_ms'] / 1000.0:6.2f}s máx={r['max_ms'] / 1000.0:6.2f}s")
+        return linhas
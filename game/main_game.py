@@ -4,235 +4,248 @@
 
 import pygame   # Importa o Pygame para manipulação de gráficos e eventos
 import sys      # Importa o sys para manipulação de sistema e saída do programa
-import random       # Importa o random para gerar números aleatórios, como a escolha de esteiras para spawn de presentes
+import time     # Importa o time para medir o tempo de trabalho de cada frame
 
 # Importa as classes e configurações necessárias
-from ..settings import LARGURA_TELA, ALTURA_TELA, FPS, BRANCO, PRETO, VERDE_ESCURO, VERMELHO, PRETO_TRANSPARENTE
-from ..ui.screens import GameBackground
-from .entities import Esteira, Elfo, MesaDePresentes, Presente
+from ..settings import FPS, VERMELHO, PONTUACAO_VITORIA, AUDIO_MIDGAME
 from .mechanics import GameMechanics
+from ..registro import obter_registro, JOGO # Registro não bloqueante
+from ..metricas import metricas # Métricas exportadas (Prometheus/JSONL)
+from ..audio import audio, VOZ   # Canais por categoria e streaming das faixas longas
+from .cena import CenaPartida   # Sprites, HUD e renderizador da partida (normalmente já montados)
+from .renderizador import CAMADA_PRESENTES
+from .depuracao import (FASE_EVENTOS, FASE_MECANICAS, FASE_SPRITES,
+                        FASE_HUD, FASE_DESENHO, FASE_TELA)
+from .simulacao import (SimulacaoPartida, AcumuladorPassoFixo, ACAO_ESQUERDA, ACAO_DIREITA,
+                        ACAO_ESPACO, ACAO_PROCESSAR)
 
-def game_loop(screen, clock, game_mechanics):
+log_jogo = obter_registro(JOGO)
+metrica_frame = metricas.histograma("oficina_frame_segundos", "Tempo de trabalho de um frame (sem a espera do FPS)",
+                                    (0.001, 0.002, 0.004, 0.008, 0.0167, 0.0333, 0.05, 0.1, 0.25))
+
+def game_loop(screen, clock, game_mechanics, simulacao=None, politica=None, duracao_max_ms=None, tempos_frame=None,
+              cena=None, modo_deterministico=None):
     """
     Função que contém o loop principal do jogo completo com mecânicas de SO.
+    As regras da partida ficam em 'SimulacaoPartida'; aqui apenas traduzimos
+    o teclado em ações, avançamos a simulação e desenhamos o resultado.
 
     Args:
         screen (pygame.Surface): A superfície principal da tela do jogo.
         clock (pygame.time.Clock): O objeto de relógio do Pygame para controlar o FPS.
         game_mechanics (GameMechanics): A instância das mecânicas do jogo para a partida atual.
+        simulacao (SimulacaoPartida, optional): Simulação já configurada (ex.: o layout de N esteiras
+            do modo de estresse). Se omitida, é criada a partida padrão.
+        politica (callable, optional): Joga sozinha: politica(simulacao) devolve as ações de cada frame.
+        duracao_max_ms (float, optional): Encerra a partida com 'TEMPO' depois desse tempo real.
+        tempos_frame (list, optional): Recebe o tempo de trabalho (ms) de cada frame, sem a espera do FPS.
+        cena (CenaPartida, optional): Cena já montada (ver 'PreparacaoCena'). Se omitida, é montada aqui.
+        modo_deterministico (ModoDeterministico, optional): Relógio por passos (PASSOS_POR_FRAME passos por
+            frame, qualquer que seja o tempo real) e gravação ou reprodução das ações (ver game/reproducao.py).
+            Quem chama cria a simulação com 'modo_deterministico.criar_simulacao' e chama 'finalizar' no fim.
     """
     
     # --- Configuração dos Elementos do Jogo ---
-    background = GameBackground()   #   Cria o fundo do jogo
-    all_sprites = pygame.sprite.Group() #   Agrupa todos os sprites do jogo para atualização e renderização
-    presentes_sprites = pygame.sprite.Group()   # Agrupa os presentes que estão caindo
-    
-    esteiras = [    #   Cria as esteiras onde os presentes vão cair
-        Esteira(position=(-60 + (LARGURA_TELA - 560) / 2, ALTURA_TELA/4), size=(200, 60)),
-        Esteira(position=(-60 + (LARGURA_TELA - 560) / 2 + 180, ALTURA_TELA/4), size=(200, 60)),
-        Esteira(position=(-60 + (LARGURA_TELA - 560) / 2 + 360, ALTURA_TELA/4), size=(200, 60))
-    ]
-    all_sprites.add(esteiras)   # Adiciona as esteiras ao grupo de sprites
-    # Cria a mesa de presentes onde o elfo vai entregar os presentes
-    mesa_sprite = MesaDePresentes(position=(-60 + (LARGURA_TELA - 560) / 2 + 570, ALTURA_TELA * 0.8))
-    all_sprites.add(mesa_sprite)    #   Adiciona a mesa ao grupo de sprites
-    y_pos_elfo = ALTURA_TELA * 0.85 # Posição vertical do elfo, um pouco acima da mesa
-    POSICOES_ELFO = [
-        (esteiras[0].rect.centerx, y_pos_elfo),
-        (esteiras[1].rect.centerx, y_pos_elfo),
-        (esteiras[2].rect.centerx, y_pos_elfo),
-        (mesa_sprite.rect.centerx, y_pos_elfo)
-    ]
-    player = Elfo(positions=POSICOES_ELFO, start_index=0)   # Cria o elfo jogador com as posições definidas
-    all_sprites.add(player) #   Adiciona o elfo ao grupo de sprites
+    # A cena normalmente chega pronta (montada durante as telas de carregamento)
+    if cena is None:
+        cena = CenaPartida(screen, simulacao.layout if simulacao is not None else None)
+    if simulacao is None:
+        simulacao = SimulacaoPartida(game_mechanics, layout=cena.layout)    # Estado e regras da partida
+    cena.vincular(simulacao)    # Elfo e mesa passam a desenhar o estado da simulação
+    renderizador = cena.renderizador   # Desenha só as áreas que mudaram
+    cenario_sprites = cena.cenario_sprites  # Esteiras, mesa e elfo (atualizados sem interpolação)
+    presentes_sprites = cena.presentes_sprites  # Agrupa os presentes que estão caindo
+    sprites_por_presente = {}   # id do PresenteLogico -> sprite Presente que o desenha
+    pool_presentes = cena.pool_presentes    # Sprites de presentes reaproveitados entre spawns
+    esteiras = cena.esteiras
+    mesa_sprite = cena.mesa_sprite
+    player = cena.player
     debug_mode = False  # Modo de depuração, pode ser ativado/desativado com F1
-    # --- Configuração da Fonte ---
-    try:
-        from ..settings import FONTE_PATH   #   Importa o caminho da fonte definida nas configurações
-        font = pygame.font.Font(FONTE_PATH, 24) # Cria a fonte principal do jogo
-        font_small = pygame.font.Font(FONTE_PATH, 18)   # Cria uma fonte menor para o HUD
-    except:
-        font = pygame.font.Font(None, 24)   # Fonte padrão do Pygame se não for possível carregar a fonte personalizada
-        font_small = pygame.font.Font(None, 18) # Fonte menor padrão do Pygame
-
-
-    # --- Lógica áudio Evento 100 pontos ---
-    sound_100_pontos  = None    # Variável para armazenar o som de 100 pontos, inicialmente None
-    try:
-        from ..settings import AUDIO_MIDGAME, PASTA_AUDIO   # Importa o caminho do áudio de 100 pontos e a pasta de áudio
-        import os
-        path_100_pontos = os.path.join(PASTA_AUDIO, AUDIO_MIDGAME) # Caminho para o áudio de 100 pontos
-        if os.path.exists(path_100_pontos): # Verifica se o arquivo de áudio existe
-            sound_100_pontos = pygame.mixer.Sound(path_100_pontos)  # Carrega o áudio de 100 pontos
-    except (ImportError, pygame.error) as e:
-        print(f"AVISO: Não foi possível carregar o áudio de 100 pontos: {e}")
-
-    audio_100_pontos_tocado = False  # Flag para indicar se o áudio de 100 pontos foi tocado
+    painel_stats = cena.painel_stats  # Cada estatística só é renderizada quando muda
+    texto_processando = cena.texto_processando  # "Processando... X.Xs" acima da mesa
+    texto_carga = cena.texto_carga  # Carga sobre a cabeça do elfo
+    popup = cena.popup  # Mensagem temporária (ex.: mesa cheia)
+    medidor = cena.medidor
+    painel_depuracao = cena.painel_depuracao
+
     # --- Variáveis de Controle do Jogo ---
     popup_ativo = False # Flag para controlar se o popup de mensagem está ativo
-    popup_surface = None    # Superfície do popup que será desenhada na tela
-    popup_rect = None   # Retângulo que define a posição do popup
     popup_duracao = 1500    # Duração do popup em milissegundos (1.5 segundos)
     popup_tempo_final = 0   # Tempo final para o popup desaparecer
     
     running = True  # Variável de controle do loop principal do jogo
-    ultimo_spawn_presente = pygame.time.get_ticks() # Tempo do último spawn de presente
+    ultimo_tempo = pygame.time.get_ticks()  # Tempo do frame anterior, para avançar a simulação
+    acumulador = AcumuladorPassoFixo()  # Converte o tempo real do frame em passos fixos da simulação
+    acoes = []  # Ações do jogador ainda não entregues à simulação
+    inicio_partida = ultimo_tempo
     
     while running:
+        inicio_frame = time.perf_counter()
+        medidor.iniciar_frame()
         current_time = pygame.time.get_ticks()  # Obtém o tempo atual em milissegundos
+        if duracao_max_ms is not None and current_time - inicio_partida >= duracao_max_ms:
+            log_jogo.info("Pool de sprites de presentes", **pool_presentes.get_estatisticas())
+            return 'TEMPO'
         
         if popup_ativo and current_time > popup_tempo_final:    # Verifica se o popup está ativo e se o tempo final foi alcançado
             popup_ativo = False # Desativa o popup
-            popup_surface = None    # Limpa a superfície do popup
+            popup.esconder()    # A área do popup volta a mostrar o fundo
+        audio.atualizar()   # Devolve o stream à música quando uma voz longa termina
 
         for event in pygame.event.get():    # Processa todos os eventos do Pygame
             if event.type == pygame.QUIT:   # Se o evento for de saída (fechar a janela)
+                if modo_deterministico is not None:
+                    modo_deterministico.finalizar(simulacao)    # Salva a gravação antes de sair
                 pygame.quit()   # Encerra o Pygame
                 sys.exit()  # Sai do programa
             
             # Verifica se uma tecla foi pressionada
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
+                    log_jogo.info("Pool de sprites de presentes", **pool_presentes.get_estatisticas())
                     return 'MENU'
                 elif event.key == pygame.K_LEFT or event.key == pygame.K_a:
-                    player.move("left")
+                    acoes.append(ACAO_ESQUERDA)
                 elif event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-                    player.move("right")
+                    acoes.append(ACAO_DIREITA)
                 elif event.key == pygame.K_SPACE:
                     # ANALOGIA: Ação do jogador (consumidor) para interagir com o sistema
-                    if player.position_index == 3:
-                        # Tenta colocar um item no buffer (recurso compartilhado).
-                        # A chamada 'adicionar_presente_mesa' é controlada pelo semáforo.
-                        if player.presentes_carregados > 0:
-                            if game_mechanics.adicionar_presente_mesa(None):
-                                mesa_sprite.adicionar_presente_visual()
-                                player.descarregar_presente()
-                            else:
-                                popup_ativo = True
-                                popup_tempo_final = current_time + popup_duracao
-                                texto_popup = "MESA CHEIA: -1 presente"
-                                popup_surface = font_small.render(texto_popup, True, VERMELHO) 
-                                popup_rect = popup_surface.get_rect(center=(mesa_sprite.rect.centerx, mesa_sprite.rect.top - 25))
-                    elif player.position_index < 3:
-                        if player.presentes_carregados < player.capacidade_carga:
-                            for presente in presentes_sprites:
-                                if (abs(presente.rect.centerx - player.rect.centerx) < 50 and presente.rect.bottom >= player.rect.top - 20):
-                                    presente.kill()
-                                    player.carregar_presente()
-                                    break
+                    acoes.append(ACAO_ESPACO)
                 elif event.key == pygame.K_p:
-                    if player.position_index == 3:
-                        mesa_sprite.processar_presente()
-                # elif event.key == pygame.K_PLUS or event.key == pygame.K_EQUALS:
-                #     mesa_sprite.ajustar_velocidade_processamento(max(500, mesa_sprite.tempo_processamento - 500))
-                # elif event.key == pygame.K_MINUS:
-                #     mesa_sprite.ajustar_velocidade_processamento(mesa_sprite.tempo_processamento + 500)
+                    acoes.append(ACAO_PROCESSAR)
                 elif event.key == pygame.K_F1:
                     debug_mode = not debug_mode
+                    medidor.ligar(debug_mode)
+                    if debug_mode:
+                        painel_depuracao.mostrar()
+                    else:
+                        painel_depuracao.esconder()
+        medidor.marcar(FASE_EVENTOS)
 
-        # --- Atualização dos Sprites ---
-        # Atualiza a posição do elfo com base na posição atual
-        intervalo_atual = game_mechanics.escalonador.taxa_spawn_atual
-        if current_time - ultimo_spawn_presente > intervalo_atual and len(presentes_sprites) < 6:
-            esteira_escolhida = random.choice(esteiras) # Escolhe aleatoriamente uma esteira para spawnar o presente
-            velocidade_atual = game_mechanics.escalonador.velocidade_queda_atual    # Define a velocidade de queda do presente
-            novo_presente = Presente(esteira_escolhida, game_mechanics, fall_speed=velocidade_atual)    # Cria um novo presente com a esteira escolhida e a velocidade de queda atual
-            presentes_sprites.add(novo_presente)    # Adiciona o novo presente ao grupo de presentes
-            all_sprites.add(novo_presente)  # Adiciona o novo presente ao grupo de sprites
-            ultimo_spawn_presente = current_time
-
-        all_sprites.update()    # Atualiza todos os sprites do jogo
-        # ANALOGIA: Verifica se o processamento no buffer (Mesa) terminou.
-        if mesa_sprite.verificar_processamento_concluido(): # Verifica se o processamento de um presente foi concluído
-            # Simula o consumo final do item, liberando uma vaga no semáforo e pontuando.
-            if game_mechanics.elfo_tentar_coletar(player):  # Tenta coletar o presente processado pelo elfo
-                mesa_sprite.finalizar_processamento_visual()    # Finaliza o processamento visual do presente
-                mesa_sprite.ultimo_processamento = current_time   # Atualiza o tempo do último processamento
-            else:
-                mesa_sprite.finalizar_processamento_visual() # Finaliza o processamento visual do presente mesmo se o elfo não coletou         
-        
-        # --- Evento áudio 100 pontos ---
-        if (not audio_100_pontos_tocado and 
-            game_mechanics.pontuacao >= 100 and 
-            sound_100_pontos is not None):
-            
-            print("[EVENTO] 100 pontos alcançados! Tocando áudio intermediário.")
-            sound_100_pontos.play()
-            audio_100_pontos_tocado = True # Impede que o som toque novamente nesta partida
+        if politica is not None:    # Jogador automático (ex.: modo de estresse)
+            acao = politica(simulacao)
+            if acao is not None:
+                acoes.append(acao)
+
+        # --- Atualização da Simulação (passo fixo) ---
+        # Executa quantos passos couberem no tempo real decorrido. As ações do
+        # jogador entram no primeiro passo; se nenhum passo couber neste frame,
+        # elas ficam guardadas para o próximo.
+        if modo_deterministico is not None:
+            # Relógio por passos: o tempo real do frame não muda a partida (gravável e reproduzível)
+            resultado, eventos = modo_deterministico.avancar_frame(simulacao, acoes)
+            acoes = []
+            if resultado is None and modo_deterministico.terminou(simulacao):
+                log_jogo.info("Fim da reprodução", passos=simulacao.passos)
+                return 'FIM_REPRODUCAO'
+        else:
+            acumulador.adicionar(current_time - ultimo_tempo)
+            ultimo_tempo = current_time
+            resultado = None
+            eventos = []
+            simulacao.iniciar_frame()   # No máximo MAX_PRESENTES_POR_FRAME presentes saem da fila dos produtores
+            while resultado is None and acumulador.consumir_passo():
+                resultado = simulacao.passo(acoes)
+                acoes = []
+                eventos.extend(simulacao.eventos)
+
+        for nome, dado in eventos:    # Reflete nos sprites o que aconteceu nos passos
+            if nome == 'spawn':
+                novo_presente = pool_presentes.adquirir(esteiras[dado.esteira], dado)  # Sprite que acompanha o novo presente
+                presentes_sprites.add(novo_presente)    # Adiciona o novo presente ao grupo de presentes
+                renderizador.adicionar(novo_presente, CAMADA_PRESENTES)  # Adiciona o novo presente à cena
+                sprites_por_presente[dado.id] = novo_presente
+            elif nome in ('coleta', 'queda'):
+                pool_presentes.liberar(sprites_por_presente.pop(dado.id))   # Volta para o pool em vez de ser descartado
+            elif nome == 'mesa_cheia':
+                popup_ativo = True
+                popup_tempo_final = current_time + popup_duracao
+                texto_popup = "MESA CHEIA: -1 presente"
+                popup.set_texto(texto_popup, VERMELHO, center=(mesa_sprite.rect.centerx, mesa_sprite.rect.top - 25))
+            elif nome == 'marco_intermediario':
+                # --- Evento áudio 100 pontos ---
+                if audio.tocar(AUDIO_MIDGAME, VOZ):    # False se o arquivo não existir
+                    log_jogo.info("100 pontos alcançados! Tocando áudio intermediário.")
+        medidor.marcar(FASE_MECANICAS)
+
+        cenario_sprites.update()    # Sincroniza esteiras, mesa e elfo com a simulação
+        # Presentes interpolados entre os dois últimos passos; as posições vêm da simulação
+        # em lote (com a física vetorizada, calculadas de uma vez para todos os presentes).
+        # No relógio por passos não há tempo sobrando entre passos: desenha o passo atual.
+        alpha = 1.0 if modo_deterministico is not None else acumulador.alpha
+        for id_presente, x, y in simulacao.presentes.posicoes_interpoladas(alpha):
+            sprites_por_presente[id_presente].posicionar(x, y)
+        medidor.marcar(FASE_SPRITES)
 
         # --- Condições de Fim de Jogo---
-        if game_mechanics.pontuacao >= 300:
+        if resultado == 'VITORIA':
             print("="*30)
-            print("VITÓRIA! Você atingiu 300 pontos!")
+            print(f"VITÓRIA! Você atingiu {PONTUACAO_VITORIA} pontos!")
             print(f"Pontuação Final: {game_mechanics.pontuacao}")
             print(f"Presentes Perdidos: {game_mechanics.presentes_perdidos}")
+            print("Latência por etapa (produção -> processamento):")
+            for linha in simulacao.latencias.linhas_relatorio():
+                print("  " + linha)
             print("="*30)
+            log_jogo.info("Pool de sprites de presentes", **pool_presentes.get_estatisticas())
             return 'VITORIA'
 
-        if game_mechanics.verificar_derrota():
+        if resultado == 'DERROTA':
             print("="*30)
             print("FIM DE JOGO! Muitos presentes foram perdidos.")
             print(f"Pontuação Final: {game_mechanics.pontuacao}")
             print(f"Presentes Perdidos: {game_mechanics.presentes_perdidos}")
+            print("Latência por etapa (produção -> processamento):")
+            for linha in simulacao.latencias.linhas_relatorio():
+                print("  " + linha)
             print("="*30)
+            log_jogo.info("Pool de sprites de presentes", **pool_presentes.get_estatisticas())
             return 'DERROTA'
 
         # --- Renderização ---
-        background.draw(screen)
-        all_sprites.draw(screen)
-        player.desenhar_carga(screen)
-        if popup_ativo:
-            screen.blit(popup_surface, popup_rect)
+        # Textos da cena: só são renderizados de novo quando o conteúdo muda
+        if player.presentes_carregados > 0:
+            texto_carga.set_texto(f"{player.presentes_carregados}", player.cor_carga(),
+                                  midbottom=(player.rect.centerx, player.rect.top - 5))
+        else:
+            texto_carga.esconder()
+
+        mesa = simulacao.mesa   # Estado lógico da mesa (processamento automático)
+        if mesa.processando:
+            tempo_restante = max(0, (mesa.tempo_processamento - (simulacao.tempo_ms - mesa.tempo_inicio_processamento)) / 1000.0)
+            texto_processando.set_texto(f"Processando... {tempo_restante:.1f}s", (255, 255, 0),
+                                        topleft=(mesa_sprite.rect.centerx - 60, mesa_sprite.rect.top - 50))
+        else:
+            texto_processando.esconder()
         
         # --- HUD ---
-        hud_stats_bg_rect = pygame.Rect(5, 5, 200, 205)
-        stats_surface = pygame.Surface(hud_stats_bg_rect.size, pygame.SRCALPHA)
-        stats_surface.fill(PRETO_TRANSPARENTE)
-        screen.blit(stats_surface, hud_stats_bg_rect.topleft)
+        # Os valores são lidos direto do estado; cada campo só é renderizado quando muda
+        painel_stats.atualizar({
+            'pontuacao': game_mechanics.pontuacao,
+            'nivel': game_mechanics.escalonador.nivel_dificuldade,
+            'mesa': (len(mesa.itens), mesa.capacidade),
+            'proc_auto': mesa.processamento_ativo,
+            'processados': mesa.presentes_processados_total,
+            'vel_proc': mesa.tempo_processamento,
+            'perdidos': game_mechanics.presentes_perdidos,
+            'penalidade': game_mechanics.presentes_perdidos * 10,
+            'caindo': len(presentes_sprites)
+        })
         
-        hud_instructions_bg_rect = pygame.Rect(LARGURA_TELA - 230, 5, 225, 150)
-        instructions_surface = pygame.Surface(hud_instructions_bg_rect.size, pygame.SRCALPHA)
-        instructions_surface.fill(PRETO_TRANSPARENTE)
-        screen.blit(instructions_surface, hud_instructions_bg_rect.topleft)
-        
-        stats = game_mechanics.get_estatisticas()
-        
-        textos_hud = [
-            (f"Pontuação: {stats['pontuacao']}", (10, 10), font, BRANCO),
-            (f"Nível: {stats['nivel_dificuldade']}", (10, 40), font, BRANCO),
-            (f"Mesa: {stats['mesa_status']['presentes_na_mesa']}/{stats['mesa_status']['capacidade']}", (10, 70), font_small, BRANCO),
-            (f"Proc. Auto: {'ATIVO' if mesa_sprite.processamento_ativo else 'PAUSADO'}", (10, 90), font_small, VERDE_ESCURO if mesa_sprite.processamento_ativo else VERMELHO),
-            (f"Processados: {mesa_sprite.presentes_processados_total}", (10, 110), font_small, BRANCO),
-            (f"Vel. Proc: {mesa_sprite.tempo_processamento / 1000.0:.1f}s", (10, 130), font_small, BRANCO),
-            (f"Perdidos: {stats['presentes_perdidos']}", (10, 150), font_small, VERMELHO),
-            (f"Penalidade: {stats['presentes_perdidos'] * 10}", (10, 170), font_small, VERMELHO),
-            (f"Presentes Caindo: {len(presentes_sprites)}", (10, 190), font_small, (255, 255, 0))
-        ]
-        
-        for texto, pos, fonte_obj, cor in textos_hud:
-            render = fonte_obj.render(texto, True, cor)
-            screen.blit(render, pos)
-
-        if mesa_sprite.processando:
-            tempo_restante = max(0, (mesa_sprite.tempo_processamento - (current_time - mesa_sprite.tempo_inicio_processamento)) / 1000.0)
-            texto_processando = font_small.render(f"Processando... {tempo_restante:.1f}s", True, (255, 255, 0))
-            screen.blit(texto_processando, (mesa_sprite.rect.centerx - 60, mesa_sprite.rect.top - 50))
-        
-        instrucoes = [
-            "=== MOVIMENTO ===", "SETAS/WASD: Mover",
-            "=== AÇÕES ===", "ESPAÇO: Coletar/Entregar", "P: Forçar Processamento",
-            # "=== CONTROLES MESA ===", "+/-: Vel. Processamento",
-            #"F1: Debug Mode", 
-            "ESC: Sair"
-        ]
-        
-        for i, instrucao in enumerate(instrucoes):
-            texto = font_small.render(instrucao, True, BRANCO)
-            screen.blit(texto, (LARGURA_TELA - 220, 10 + i * 18))
-        
-        if debug_mode:
-            # codigo debug, não implementado
-            pass
+        medidor.marcar(FASE_HUD)
 
-        pygame.display.flip()
-        clock.tick(FPS)
\ No newline at end of file
+        retangulos = renderizador.compor()  # Redesenha as áreas sujas na superfície da tela
+        medidor.marcar(FASE_DESENHO)
+        renderizador.apresentar(retangulos) # Atualiza a janela (update ou flip)
+        medidor.marcar(FASE_TELA)
+        if debug_mode:
+            # O frame medido aparece na sobreposição desenhada no próximo frame
+            pool = pool_presentes.get_estatisticas()
+            painel_depuracao.atualizar(current_time, medidor, medidor.terminar_frame(), clock.get_fps(),
+                                       (len(renderizador.grupo), len(presentes_sprites), pool['em_uso'], pool['criados']),
+                                       game_mechanics, simulacao)
+        duracao_frame = time.perf_counter() - inicio_frame
+        metrica_frame.observar(duracao_frame)
+        if tempos_frame is not None:
+            tempos_frame.append(duracao_frame * 1000.0)
+        clock.tick(FPS)
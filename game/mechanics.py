@@ -1,40 +1,73 @@
 #   game/mechanics.py
 """
 Arquivo que contém as mecânicas principais do jogo, integrando
-threads, semáforos e filas para simular o gerenciamento de presentes.
+threads, mutex, variáveis de condição e filas para simular o gerenciamento de presentes.
 Essa mecânica foi desenvolvida com o intuito de ilustrar de forma didática
 conceitos clássicos de sistemas operacionais, envolvendo threads
-e semáforos.
-Conceitos envolvidos: Threads (Produtor-Consumidor), Semáforos (Recurso Compartilhado),
+e sincronização.
+Conceitos envolvidos: Threads (Produtor-Consumidor), Variáveis de Condição (Recurso Compartilhado),
 Mutex (Seção Crítica) e Escalonador (Dificuldade Dinâmica).
 """
 import threading    # Importa o módulo threading para manipulação de threads
 import time # Importa o módulo time para manipulação de tempo
 import random   # Importa o módulo random para geração de números aleatórios
-import pygame   # Importa o módulo pygame para manipulação de gráficos e áudio
-from queue import Queue # Importa a classe Queue para filas thread-safe
-from ..settings import VAGAS_NA_MESA    # Importa a constante VAGAS_NA_MESA do arquivo de configurações
+from collections import deque   # Importa deque, fila com inserção e remoção O(1) nas pontas
+from ..settings import (VAGAS_NA_MESA, CAPACIDADE_FILA_PRESENTES, POLITICA_FILA_PRESENTES,
+                        ESPERA_MAXIMA_FILA_S)
+from ..registro import obter_registro, MESA, PRODUTOR, ESCALONADOR, SISTEMA   # Registro não bloqueante
+from ..metricas import metricas # Contadores e medidores exportados (Prometheus/JSONL)
+from .agendador import AgendadorPeriodico   # Uma única thread dispara todos os produtores
+from .ciclo_vida import ciclo_vida  # Registro das threads de segundo plano (parada e verificação de vazamentos)
+
+# Registros por subsistema: a escrita no terminal acontece em outra thread,
+# nunca dentro do mutex da mesa nem no loop de frames
+log_mesa = obter_registro(MESA)
+log_produtor = obter_registro(PRODUTOR)
+log_escalonador = obter_registro(ESCALONADOR)
+log_sistema = obter_registro(SISTEMA)
+
+# Métricas atualizadas aqui (os medidores da partida são lidos por 'GameMechanics._coletar_metricas')
+metrica_produzidos = metricas.contador("oficina_presentes_produzidos_total",
+                                       "Presentes produzidos por esteira", ("esteira",))
+metrica_perdidos = metricas.contador("oficina_presentes_perdidos_total",
+                                     "Presentes perdidos (queda, mesa cheia ou fila)", ("motivo",))
+metrica_descartados_fila = metricas.contador("oficina_fila_presentes_descartados_total",
+                                             "Presentes descartados pela política da fila cheia", ("politica",))
+metrica_pontuacao = metricas.medidor("oficina_pontuacao", "Pontuação da partida atual")
+metrica_nivel = metricas.medidor("oficina_nivel_dificuldade", "Nível de dificuldade da partida atual")
+metrica_perdidos_partida = metricas.medidor("oficina_presentes_perdidos_partida",
+                                            "Presentes perdidos na partida atual (entram na penalidade)")
+metrica_mesa = metricas.medidor("oficina_mesa_ocupacao", "Presentes sobre a mesa")
+metrica_mesa_capacidade = metricas.medidor("oficina_mesa_capacidade", "Vagas da mesa")
+metrica_fila = metricas.medidor("oficina_fila_presentes_profundidade",
+                                "Presentes produzidos esperando para aparecer na tela")
+metrica_fila_capacidade = metricas.medidor("oficina_fila_presentes_capacidade", "Capacidade da fila de presentes")
+metrica_intervalo = metricas.medidor("oficina_producao_intervalo_segundos",
+                                     "Intervalo de produção de cada esteira", ("esteira",))
+metrica_produtores_ativos = metricas.medidor("oficina_produtores_ativos", "Produtores registrados no agendador")
+# Medidores que só fazem sentido durante uma partida (esvaziados quando ela para)
+MEDIDORES_PARTIDA = (metrica_pontuacao, metrica_nivel, metrica_perdidos_partida, metrica_mesa,
+                     metrica_mesa_capacidade, metrica_fila, metrica_fila_capacidade, metrica_intervalo,
+                     metrica_produtores_ativos)
 
 
 class GerenciadorMesa:
     """
     Representa o recurso compartilhado (a mesa) e gerencia o acesso concorrente
-    a ela usando semáforos e mutex, simulando o buffer no problema
-    Produtor-Consumidor.
+    a ela com um monitor (mutex + variáveis de condição), simulando o buffer
+    limitado do problema Produtor-Consumidor.
+    A capacidade pode ir de VAGAS_NA_MESA (3) a dezenas de milhares de itens:
+    os presentes ficam em um 'deque', em que inserir no fim e retirar do
+    início custam O(1) (o 'list.pop(0)' custava O(n)).
     """
     
     def __init__(self, capacidade=VAGAS_NA_MESA):
+        if capacidade < 1:
+            raise ValueError("A capacidade da mesa deve ser pelo menos 1")
         self.capacidade = capacidade
-        # CONCEITO SO: Semáforo para controlar o número de vagas disponíveis na mesa.
-        # Impede que o Elfo adicione presentes se a mesa já estiver cheia.
-        # Isso ilustra o conceito de semáforos (um semáforo em sistemas
-        # operacionais é um contador que controla o acesso a um recurso compartilhado
-        # para evitar condições de corrida - isto é, quando múltiplas threads
-        # tentam acessar o mesmo recurso ao mesmo tempo).
-        self.semaforo = threading.Semaphore(capacidade)  # Controla acesso à mesa
         # CONCEITO SO: Mutex para proteger a seção crítica onde os presentes são
         # adicionados ou removidos da mesa. Garante que apenas uma thread
-        # possa modificar a lista de presentes ao mesmo tempo, evitando
+        # possa modificar a fila de presentes ao mesmo tempo, evitando
         # condições de corrida.
         # Mutex é um tipo de bloqueio que permite que apenas uma thread
         # acesse um recurso compartilhado por vez. É usado para proteger
@@ -42,56 +75,127 @@ class GerenciadorMesa:
         # modificar o mesmo recurso simultaneamente, o que poderia levar a
         # inconsistências ou erros.
         self.mutex = threading.Lock()  # Protege operações críticas
-        self.presentes = []  # Lista de presentes na mesa
+        # CONCEITO SO: Variáveis de condição. Uma thread que encontra a mesa
+        # cheia (ou vazia) dorme em 'nao_cheia' (ou 'nao_vazia') liberando o
+        # mutex, e é acordada quando outra thread retira (ou coloca) um presente.
+        # Elas cumprem o papel dos semáforos de "vagas" e "itens" da solução
+        # clássica, mas a contagem é o próprio tamanho da fila: não existe um
+        # contador separado que precise ser mantido coerente com a lista.
+        self.nao_cheia = threading.Condition(self.mutex)    # Sinalizada quando surge uma vaga
+        self.nao_vazia = threading.Condition(self.mutex)    # Sinalizada quando chega um presente
+        self.presentes = deque()  # Fila de presentes na mesa (FIFO)
         self.total_presentes_processados = 0    # Contador de presentes processados
-        
-    def adicionar_presente(self, presente):
+
+    # --- Operações de um item ---
+    def adicionar_presente(self, presente, bloquear=False, timeout=None):
         """
         Método para adicionar um presente à mesa (elfo entregando).
         Retorna True se conseguiu adicionar, False se mesa cheia.
         Se a mesa estiver cheia, o elfo não pode adicionar mais presentes
         até que um presente seja removido ("coletado por outro elfo"). Simulando
         o problema clássico do Produtor-Consumidor.
+        Args:
+            presente: Item a colocar na mesa.
+            bloquear (bool): Se True, espera por uma vaga em vez de desistir na hora.
+            timeout (float, optional): Espera máxima em segundos (None: sem limite).
         """
-        # Tenta adquirir o semáforo sem bloquear, isto é, se não houver vagas
-        # disponíveis, retorna False imediatamente.
-        if self.semaforo.acquire(blocking=False):   # Se houver vagas
-            try:    
-                with self.mutex:  # Seção crítica protegida pelo mutex
-                    if len(self.presentes) < self.capacidade: # Verifica se ainda há espaço 
-                        self.presentes.append(presente) # Adiciona o presente à mesa
-                        print(f"[MESA] Presente adicionado. Total: {len(self.presentes)}/{self.capacidade}")
-                        return True # Retorna True se conseguiu adicionar
-                    else:
-                        # Se a mesa já estiver cheia, libera o semáforo, isto é, 
-                        # devolve a vaga que foi adquirida.
-                        self.semaforo.release() 
-                        return False    # Mesa cheia, não conseguiu adicionar
-            except Exception as e:  # Em caso de erro ao adicionar o presente
-                # Libera o semáforo para evitar deadlock
-                self.semaforo.release()  # Libera em caso de erro
-                print(f"[ERRO] Ao adicionar presente: {e}")
-                return False    # Retorna False se houve erro
-        else:
-            print("[MESA] Mesa cheia! Não foi possível adicionar presente.")
+        with self.mutex:  # Seção crítica protegida pelo mutex
+            if not self._esperar_vagas(bloquear, timeout):
+                cheia = True
+            else:
+                cheia = False
+                self.presentes.append(presente) # Adiciona o presente à mesa
+                total = len(self.presentes) # Lido dentro da seção crítica
+                self.nao_vazia.notify() # Acorda um consumidor que esperava por itens
+        # O registro é emitido depois de liberar o mutex
+        if cheia:
+            log_mesa.debug("Mesa cheia! Não foi possível adicionar presente.")
             return False    # Mesa cheia, não conseguiu adicionar
+        log_mesa.debug("Presente adicionado. Total: %d/%d", total, self.capacidade)
+        return True # Retorna True se conseguiu adicionar
     
-    def remover_presente(self):
+    def remover_presente(self, bloquear=False, timeout=None):
         """
         Remove um presente da mesa (elfo coletando).
         Retorna o presente removido ou None se mesa vazia.
+        Args:
+            bloquear (bool): Se True, espera por um presente em vez de desistir na hora.
+            timeout (float, optional): Espera máxima em segundos (None: sem limite).
         """
         with self.mutex:  # Seção crítica
-            if self.presentes:  # Verifica se há presentes na mesa
-                presente = self.presentes.pop(0)  # Remove o primeiro presente da lista
+            if self._esperar_itens(bloquear, timeout):
+                presente = self.presentes.popleft()  # Remove o primeiro presente da fila (O(1))
                 self.total_presentes_processados += 1   # Incrementa o contador de presentes processados
-                self.semaforo.release()  # Libera uma vaga
-                print(f"[MESA] Presente coletado! Restam: {len(self.presentes)}/{self.capacidade}")
-                return presente # Retorna o presente coletado
+                restantes = len(self.presentes) # Lido dentro da seção crítica
+                self.nao_cheia.notify() # Libera uma vaga para um produtor que esperava
             else:
-                print("[MESA] Mesa vazia! Nada para coletar.")
-                return None # Retorna None se não havia presentes
-    
+                presente = None
+        # O registro é emitido depois de liberar o mutex
+        if presente is None:
+            log_mesa.debug("Mesa vazia! Nada para coletar.")
+            return None # Retorna None se não havia presentes
+        log_mesa.debug("Presente coletado! Restam: %d/%d", restantes, self.capacidade)
+        return presente # Retorna o presente coletado
+
+    # --- Operações em lote (k itens com uma única aquisição do mutex) ---
+    def adicionar_lote(self, presentes, bloquear=False, timeout=None):
+        """
+        Coloca na mesa quantos presentes couberem, em ordem, de uma só vez.
+        Com 'bloquear', espera (até 'timeout') por pelo menos uma vaga.
+        Returns:
+            int: Quantos presentes foram adicionados (os demais ficam com quem chamou).
+        """
+        presentes = list(presentes)
+        if not presentes:
+            return 0
+        with self.mutex:
+            if not self._esperar_vagas(bloquear, timeout):
+                adicionados = 0
+            else:
+                adicionados = min(len(presentes), self.capacidade - len(self.presentes))
+                self.presentes.extend(presentes[:adicionados])
+                total = len(self.presentes)
+                self.nao_vazia.notify(adicionados)  # Um consumidor por item novo
+        if adicionados:
+            log_mesa.debug("Lote de %d presentes adicionado. Total: %d/%d", adicionados, total, self.capacidade)
+        return adicionados
+
+    def remover_lote(self, max_itens, bloquear=False, timeout=None):
+        """
+        Retira até 'max_itens' presentes da mesa, em ordem de chegada, de uma só vez.
+        Com 'bloquear', espera (até 'timeout') por pelo menos um presente.
+        Returns:
+            list: Presentes retirados (vazia se a mesa estava vazia).
+        """
+        if max_itens <= 0:
+            return []
+        with self.mutex:
+            if not self._esperar_itens(bloquear, timeout):
+                return []
+            quantidade = min(max_itens, len(self.presentes))
+            popleft = self.presentes.popleft
+            lote = [popleft() for _ in range(quantidade)]
+            self.total_presentes_processados += quantidade
+            restantes = len(self.presentes)
+            self.nao_cheia.notify(quantidade)   # Um produtor por vaga liberada
+        log_mesa.debug("Lote de %d presentes coletado. Restam: %d/%d", quantidade, restantes, self.capacidade)
+        return lote
+
+    # --- Espera (chamadas com o mutex adquirido) ---
+    def _esperar_vagas(self, bloquear, timeout):
+        """True se há vaga na mesa, esperando por ela quando 'bloquear' é True."""
+        if not bloquear:
+            return len(self.presentes) < self.capacidade
+        # wait_for reavalia a condição a cada notificação (protege contra despertares espúrios)
+        return self.nao_cheia.wait_for(lambda: len(self.presentes) < self.capacidade, timeout)
+
+    def _esperar_itens(self, bloquear, timeout):
+        """True se há presente na mesa, esperando por um quando 'bloquear' é True."""
+        if not bloquear:
+            return len(self.presentes) > 0
+        return self.nao_vazia.wait_for(lambda: len(self.presentes) > 0, timeout)
+
+    # --- Consultas ---
     def esta_cheia(self):   
         """Verifica se a mesa está cheia."""
         with self.mutex:    # Protege a seção crítica
@@ -112,68 +216,202 @@ class GerenciadorMesa:
                 'ocupacao_percentual': (len(self.presentes) / self.capacidade) * 100
             }
 
-class ProdutorPresentes(threading.Thread):
+# --- Políticas da fila de presentes visuais quando ela está cheia ---
+DESCARTAR_ANTIGO = "descartar_antigo"   # Descarta o presente que espera há mais tempo e aceita o novo
+DESCARTAR_NOVO = "descartar_novo"   # Descarta o presente que acabou de ser produzido
+BLOQUEAR = "bloquear"   # O produtor espera (com prazo) por uma vaga; se o prazo acabar, descarta o novo
+CONTAR_PERDIDO = "contar_perdido"   # Descarta o novo e conta como presente perdido (com penalidade)
+POLITICAS_FILA = (DESCARTAR_ANTIGO, DESCARTAR_NOVO, BLOQUEAR, CONTAR_PERDIDO)
+
+
+class FilaPresentesVisuais:
+    """
+    Fila limitada entre os produtores (thread do agendador) e o loop do jogo,
+    que transforma cada presente produzido em um sprite caindo da esteira.
+    Usa o mesmo monitor (mutex + variável de condição) da mesa. Quando a fila
+    está cheia, a 'politica' decide o que acontece com o presente novo.
+    ANALOGIA: É o buffer de um pipe entre dois processos. Cheio, o escritor
+    pode esperar (bloquear), ou o sistema pode descartar dados, como faz a
+    fila de pacotes de uma placa de rede sobrecarregada.
+    """
+
+    def __init__(self, capacidade=CAPACIDADE_FILA_PRESENTES, politica=POLITICA_FILA_PRESENTES,
+                 espera_maxima=ESPERA_MAXIMA_FILA_S):
+        if capacidade < 1:
+            raise ValueError("A capacidade da fila de presentes deve ser pelo menos 1")
+        if politica not in POLITICAS_FILA:
+            raise ValueError(f"Política de fila desconhecida: {politica!r} (use uma de {POLITICAS_FILA})")
+        self.capacidade = capacidade
+        self.politica = politica
+        self.espera_maxima = espera_maxima  # Prazo da espera por vaga na política BLOQUEAR (s)
+        self.mutex = threading.Lock()
+        self.nao_cheia = threading.Condition(self.mutex)    # Sinalizada quando o jogo retira presentes
+        self.itens = deque()
+        self.fechada = False    # Fechada: produtores que esperavam desistem na hora
+        # --- Estatísticas ---
+        self.recebidos = 0  # Presentes aceitos na fila
+        self.entregues = 0  # Presentes retirados pelo jogo
+        self.descartados = 0    # Presentes descartados pela política (sem penalidade)
+        self.perdidos = 0   # Presentes contados como perdidos (CONTAR_PERDIDO)
+        self.esperas = 0    # Vezes em que um produtor esperou por vaga (BLOQUEAR)
+        self.maior_ocupacao = 0 # Maior número de presentes na fila ao mesmo tempo
+        self._perdidos_pendentes = 0    # Perdidos ainda não repassados para a pontuação
+
+    def colocar(self, presente, pode_esperar=True):
+        """
+        Coloca um presente na fila, aplicando a política se ela estiver cheia.
+        Args:
+            presente: Dados do presente produzido.
+            pode_esperar (bool): False impede a espera da política BLOQUEAR (ex.: agendador simulado).
+        Returns:
+            bool: True se o presente novo entrou na fila.
+        """
+        with self.mutex:
+            if len(self.itens) >= self.capacidade and not self.fechada:
+                if self.politica == DESCARTAR_ANTIGO:
+                    self.itens.popleft()
+                    self.descartados += 1
+                    metrica_descartados_fila.incrementar(politica=self.politica)
+                elif self.politica == BLOQUEAR and pode_esperar:
+                    self.esperas += 1
+                    self.nao_cheia.wait_for(lambda: self.fechada or len(self.itens) < self.capacidade,
+                                            self.espera_maxima)
+            if self.fechada or len(self.itens) >= self.capacidade:
+                if self.politica == CONTAR_PERDIDO and not self.fechada:
+                    self.perdidos += 1
+                    self._perdidos_pendentes += 1
+                else:
+                    self.descartados += 1
+                    metrica_descartados_fila.incrementar(politica=self.politica)
+                return False
+            self.itens.append(presente)
+            self.recebidos += 1
+            self.maior_ocupacao = max(self.maior_ocupacao, len(self.itens))
+            return True
+
+    def retirar_lote(self, max_itens=None):
+        """Retira até 'max_itens' presentes (todos, se None), em ordem de chegada, sem esperar."""
+        with self.mutex:
+            quantidade = len(self.itens) if max_itens is None else min(max_itens, len(self.itens))
+            if quantidade <= 0:
+                return []
+            popleft = self.itens.popleft
+            lote = [popleft() for _ in range(quantidade)]
+            self.entregues += quantidade
+            self.nao_cheia.notify(quantidade)   # Um produtor por vaga liberada
+            return lote
+
+    def tomar_perdidos(self):
+        """Retorna (e zera) os presentes perdidos desde a última chamada, para somar na partida."""
+        with self.mutex:
+            perdidos, self._perdidos_pendentes = self._perdidos_pendentes, 0
+            return perdidos
+
+    def abrir(self):
+        """Volta a aceitar presentes (a fila começa aberta)."""
+        with self.mutex:
+            self.fechada = False
+
+    def fechar(self):
+        """Recusa novos presentes e acorda os produtores que esperavam por vaga."""
+        with self.mutex:
+            self.fechada = True
+            self.nao_cheia.notify_all()
+
+    def __len__(self):
+        with self.mutex:
+            return len(self.itens)
+
+    def get_estatisticas(self):
+        """Retorna as estatísticas da fila."""
+        with self.mutex:
+            return {
+                'politica': self.politica,
+                'na_fila': len(self.itens),
+                'capacidade': self.capacidade,
+                'recebidos': self.recebidos,
+                'entregues': self.entregues,
+                'descartados': self.descartados,
+                'perdidos': self.perdidos,
+                'esperas': self.esperas,
+                'maior_ocupacao': self.maior_ocupacao
+            }
+
+INTERVALOS_PRODUCAO_INICIAIS = (6.0, 5.5, 5.0) # Intervalo inicial (s) de cada esteira; uma esteira por item
+# Juntas, as três esteiras produzem ~0,55 presente/s, perto do spawn de 1 a cada 2 s usado antes delas
+
+
+class ProdutorPresentes:
     """
-    ANALOGIA: Uma thread que simula um processo PRODUTOR independente.
-    Gera "trabalho" (presentes) em paralelo com o jogo principal e outras threads.
+    ANALOGIA: Simula um processo PRODUTOR independente.
+    Gera "trabalho" (presentes) em paralelo com o jogo principal e outros produtores.
+    Os produtores não têm mais uma thread cada: todos são disparados pelo
+    'AgendadorPeriodico' (uma única thread), assim como o sistema operacional
+    acorda os processos que dormem usando um único temporizador.
     """
     
     def __init__(self, esteira_id, gerenciador_mesa, fila_presentes_visuais, intervalo_inicial=3.0):
-        super().__init__()
         self.esteira_id = esteira_id    # Identificador da esteira
         self.gerenciador_mesa = gerenciador_mesa    # Referência ao gerenciador de mesa
         self.fila_presentes_visuais = fila_presentes_visuais  # Fila para comunicar com o jogo
         self.intervalo_producao = intervalo_inicial # Intervalo inicial de produção de presentes
-        self.running = True # Flag para controlar a execução da thread
-        self.daemon = True  # Permite que a thread seja finalizada quando o programa principal terminar
+        self.tarefa = None  # Tarefa no agendador (None enquanto o produtor está parado)
+        self.agendador = None   # Agendador que dispara o produtor (e cujo relógio carimba os presentes)
+        self.pode_esperar = True    # Se pode esperar por vaga na fila (falso com o agendador simulado)
+        self.rng = random   # Gerador aleatório do tipo do presente (a simulação troca pelo fluxo da esteira)
         # Contador de presentes criados por esta esteira
         # Isso é útil para identificar os presentes criados por cada esteira.
         self.presentes_criados = 0 # Contador de presentes criados
-        
-    def run(self):  
+
+    def iniciar(self, agendador):
         """
-        Loop principal da thread produtora. Continua produzindo
-        enquanto 'self.running' for True.
+        Registra o produtor no agendador: 'produzir_presente' passa a ser
+        chamado a cada 'intervalo_producao' segundos.
+        ANALOGIA: O intervalo simula o tempo que um processo leva para
+        realizar um trabalho ou esperar por um evento de E/S.
         """
-        while self.running:     
-            try:
-                # ANALOGIA: time.sleep() simula o tempo que um processo
-                # leva para realizar um trabalho ou esperar por um evento de E/S.
-                time.sleep(self.intervalo_producao)
-                
-                if self.running:  # Verifica novamente após sleep
-                    self.produzir_presente()    
-                    
-            except Exception as e:  # Captura qualquer exceção que ocorra durante a produção
-                print(f"[ERRO] Thread produtora {self.esteira_id}: {e}")
-                break
+        if self.tarefa is None:
+            self.agendador = agendador
+            self.pode_esperar = agendador.permite_bloqueio
+            self.tarefa = agendador.agendar(self.produzir_presente, self.intervalo_producao)
+
+    def is_alive(self):
+        """True enquanto o produtor está registrado no agendador (mesma interface de uma Thread)."""
+        return self.tarefa is not None and self.tarefa.ativa
     
     def produzir_presente(self):    
         """
-        Cria um novo presente e tenta adicioná-lo ao sistema.
+        Cria um novo presente e o coloca na fila que o jogo transforma em sprites.
+        Executado na thread do agendador: só espera (com prazo) na política BLOQUEAR.
         """
         presente_data = { # Dados do presente a ser criado
             'id': f"presente_{self.esteira_id}_{self.presentes_criados}",
             'esteira_origem': self.esteira_id,
             'timestamp': time.time(),
-            'tipo': random.choice(['presente_visual_1', 'presente_visual_2', 'presente_visual_3', 'presente_visual_4'])
+            'produzido_em': self.agendador.instante(),  # Relógio do agendador: mede o tempo na fila até o spawn
+            'tipo': self.rng.choice(['presente_visual_1', 'presente_visual_2', 'presente_visual_3', 'presente_visual_4'])
         }
         self.presentes_criados += 1 # Incrementa o contador de presentes criados
-        # Coloca o presente na fila para o jogo processar visualmente
-        try:    # Tenta adicionar o presente à fila de presentes visuais
-            self.fila_presentes_visuais.put(presente_data, block=False) 
-            print(f"[PRODUTOR {self.esteira_id}] Presente #{self.presentes_criados} criado")
-        except: # Se a fila de presentes visuais estiver cheia, não consegue adicionar
-            print(f"[PRODUTOR {self.esteira_id}] Fila de presentes cheia!")
+        metrica_produzidos.incrementar(esteira=self.esteira_id)
+        # A política da fila decide o que acontece se o jogo não estiver dando conta
+        if self.fila_presentes_visuais.colocar(presente_data, self.pode_esperar):
+            log_produtor.debug("Esteira %d: presente #%d criado", self.esteira_id, self.presentes_criados)
+        else:
+            log_produtor.debug("Esteira %d: fila de presentes cheia, presente #%d descartado",
+                               self.esteira_id, self.presentes_criados)
     
     def acelerar_producao(self, fator=0.9): 
-        """Acelera a produção (diminui intervalo)."""
+        """Acelera a produção (diminui intervalo). Vale a partir do próximo disparo."""
         self.intervalo_producao = max(0.5, self.intervalo_producao * fator)
-        print(f"[PRODUTOR {self.esteira_id}] Produção acelerada para {self.intervalo_producao:.2f}s")
+        if self.tarefa is not None:
+            self.tarefa.alterar_intervalo(self.intervalo_producao)
+        log_produtor.info("Esteira %d: produção acelerada para %.2fs", self.esteira_id, self.intervalo_producao)
     
     def parar(self):
-        """Para a thread produtora."""
-        self.running = False
+        """Para o produtor (remove sua tarefa do agendador)."""
+        if self.tarefa is not None:
+            self.tarefa.cancelar()
+            self.tarefa = None
 
 class EscalonadorJogo:
     """
@@ -182,7 +420,8 @@ class EscalonadorJogo:
     em um sistema operacional, onde o escalonador decide quando e como
     os processos devem ser executados. Aqui, o escalonador ajusta a
     dificuldade do jogo aumentando a velocidade de produção dos presentes
-    e a taxa de spawn, simulando o aumento de carga no sistema.
+    (que agora são a origem dos presentes na tela) e a de queda, simulando o
+    aumento de carga no sistema.
     Ajustável.
     """
     
@@ -190,28 +429,22 @@ class EscalonadorJogo:
         self.produtores = produtores    # Lista de threads produtoras
         self.running = True   # Flag para controlar a execução do escalonador
         self.nivel_dificuldade = 1  # Nível de dificuldade atual do jogo
-        self.velocidade_queda_atual = 2.0   # Velocidade de queda dos presentes
-        self.taxa_spawn_atual = 2000    # Intervalo de spawn dos presentes (em milissegundos)
-        self.incremento_velocidade_queda = 0.2  # Incremento na velocidade de queda a cada nível
-        self.fator_aumento_spawn = 0.95 # Fator de redução do intervalo de spawn a cada nível
+        self.velocidade_queda_atual = 120.0   # Velocidade de queda dos presentes (px/s; 2 px por frame a 60 FPS)
+        self.incremento_velocidade_queda = 12.0  # Incremento na velocidade de queda a cada nível (px/s)
         
     def aumentar_nivel(self):
         """Ajusta a dificuldade do jogo aumentando velocidade de produção."""
         self.nivel_dificuldade += 1 # Incrementa o nível de dificuldade
         
         for produtor in self.produtores:    # Para cada produtor (esteira)
-            if produtor.is_alive():     # Se a thread produtora ainda está ativa
+            if produtor.is_alive():     # Se o produtor ainda está ativo no agendador
                 produtor.acelerar_producao(0.9) # Fica 10% mais rápido
-        # Aumenta a velocidade de queda e reduz o intervalo de spawn
+        # Aumenta a velocidade de queda
         self.velocidade_queda_atual += self.incremento_velocidade_queda
-        self.taxa_spawn_atual *= self.fator_aumento_spawn
-        
-        # Garante que o tempo de spawn não fique rápido demais
-        self.taxa_spawn_atual = max(500, self.taxa_spawn_atual)
         
-        print(f"[ESCALONADOR] Nível {self.nivel_dificuldade} alcançado! Dificuldade aumentada!")
-        print(f"--> Nova velocidade de queda: {self.velocidade_queda_atual:.1f}")
-        print(f"--> Novo intervalo de spawn: {self.taxa_spawn_atual:.0f}ms")
+        log_escalonador.info("Nível %d alcançado! Dificuldade aumentada!", self.nivel_dificuldade,
+                             velocidade_queda=f"{self.velocidade_queda_atual:.1f}px/s",
+                             intervalos_producao="/".join(f"{p.intervalo_producao:.2f}s" for p in self.produtores))
 
     def parar(self):
         """Para o escalonador."""
@@ -220,52 +453,81 @@ class EscalonadorJogo:
 class GameMechanics:
     """
     Classe principal que integra todas as mecânicas de SO no jogo.
-    Nesta classe, gerenciamos as threads produtoras, o escalonador
-    de dificuldade e a comunicação entre as threads e o jogo principal.
+    Nesta classe, gerenciamos os produtores (disparados por um único
+    agendador), o escalonador de dificuldade e a comunicação entre os
+    produtores e o jogo principal.
     """
     
-    def __init__(self): # Inicializa o sistema de mecânicas do jogo
+    def __init__(self, intervalos_producao=INTERVALOS_PRODUCAO_INICIAIS, politica_fila=POLITICA_FILA_PRESENTES,
+                 capacidade_fila=CAPACIDADE_FILA_PRESENTES): # Inicializa o sistema de mecânicas do jogo
+        """
+        Args:
+            intervalos_producao (sequence): Intervalo inicial (s) de cada esteira; define quantas esteiras existem.
+            politica_fila (str): O que fazer com um presente novo quando a fila para a tela está cheia (POLITICAS_FILA).
+            capacidade_fila (int): Quantos presentes produzidos podem esperar para aparecer na tela.
+        """
         self.gerenciador_mesa = GerenciadorMesa()   # Gerenciador de mesa (recurso compartilhado)
-        self.fila_presentes_visuais = Queue(maxsize=50)  # Comunicação thread-safe com jogo
-        # Criação dos produtores (uma thread por esteira)
-        self.produtores = [ # Lista de threads produtoras (esteiras)
-            ProdutorPresentes(1, self.gerenciador_mesa, self.fila_presentes_visuais, 4.0),
-            ProdutorPresentes(2, self.gerenciador_mesa, self.fila_presentes_visuais, 3.5),
-            ProdutorPresentes(3, self.gerenciador_mesa, self.fila_presentes_visuais, 3.0)
-        ]   # Lista de threads produtoras (esteiras) 
+        # Comunicação thread-safe com o jogo: cada item vira um presente caindo da esteira de origem
+        self.fila_presentes_visuais = FilaPresentesVisuais(capacidade_fila, politica_fila)
+        # Criação dos produtores (um por esteira, todos no mesmo agendador)
+        self.produtores = [ # Lista de produtores (esteiras)
+            ProdutorPresentes(i + 1, self.gerenciador_mesa, self.fila_presentes_visuais, intervalo)
+            for i, intervalo in enumerate(intervalos_producao)
+        ]
         # O primeiro parâmetro é o ID da esteira, o segundo é o gerenciador de mesa,
         # o terceiro é a fila de comunicação com o jogo e o quarto é o intervalo
         # inicial de produção de presentes (em segundos).
+        self.agendador = None   # Thread única que dispara os produtores (criada em iniciar_sistema)
         
         # Escalonador para aumentar dificuldade
-        self.escalonador = EscalonadorJogo(self.produtores) # Lista de threads produtoras (esteiras)
+        self.escalonador = EscalonadorJogo(self.produtores) # Lista de produtores (esteiras)
         self.pontuacao = 0  # Pontuação do jogo, começa em 0
         self.presentes_perdidos = 0 # Contador de presentes perdidos (mesa cheia)
         self.iniciado = False   # Flag para indicar se o sistema foi iniciado
         self.nivel_objetivo = 100 # para o próximo nível de dificuldade
         
-    def iniciar_sistema(self):
-        """Inicia todas as threads e o sistema de mecânicas."""
+    def iniciar_sistema(self, agendador=None, fluxos=None):
+        """
+        Inicia o agendador e o sistema de mecânicas.
+        Args:
+            agendador (AgendadorBase, optional): Agendador já existente (ex.: o 'AgendadorSimulado' da
+                simulação sem janela). Se omitido, cria e inicia a thread 'AgendadorPeriodico'.
+            fluxos (FluxosAleatorios, optional): Geradores com semente; cada esteira usa o seu fluxo,
+                para partidas reproduzíveis.
+        """
         if not self.iniciado:
-            print("[SISTEMA] Iniciando mecânicas de SO...")
+            log_sistema.info("Iniciando mecânicas de SO...")
+            self.fila_presentes_visuais.abrir()
+            metricas.definir_coletor('partida', self._coletar_metricas)  # A exportação passa a ler esta partida
             
-            # Inicia threads produtoras
-            for produtor in self.produtores:    # Cada thread produtora representa uma esteira
-                produtor.start()    #   Inicia a thread produtora
+            if agendador is not None:
+                self.agendador = agendador
+            else:   # Uma thread só (o agendador) para todas as esteiras
+                self.agendador = AgendadorPeriodico()
+                ciclo_vida.iniciar(self.agendador, self.agendador.sinalizar_parada, dono=self)
+            for produtor in self.produtores:    # Cada produtor representa uma esteira
+                if fluxos is not None:
+                    produtor.rng = fluxos.fluxo(f"esteira_{produtor.esteira_id}")
+                produtor.iniciar(self.agendador)    #   Registra o produtor no agendador
             self.iniciado = True    #   Marca o sistema como iniciado
-            print("[SISTEMA] Todas as mecânicas iniciadas!")
+            log_sistema.info("Todas as mecânicas iniciadas!")
     
     def parar_sistema(self):    
-        """Para todas as threads do sistema."""
+        """Para os produtores e a thread do agendador."""
         if self.iniciado:
-            print("[SISTEMA] Parando mecânicas...")
+            log_sistema.info("Parando mecânicas...")
             
             # Para produtores
-            for produtor in self.produtores:    # Para cada thread produtora
-                produtor.parar()    #   Chama o método parar() da thread produtora
+            for produtor in self.produtores:    # Para cada produtor
+                produtor.parar()    #   Remove o produtor do agendador
+            self.fila_presentes_visuais.fechar()    #   Acorda um produtor que esperava por vaga
+            ciclo_vida.parar(dono=self) #   Sinaliza e aguarda (com prazo) a thread do agendador
 
             self.iniciado = False   # Marca o sistema como não iniciado
-            print("[SISTEMA] Sistema parado!")  
+            metricas.definir_coletor('partida', None)   # A exportação para de ler (e de manter viva) esta partida
+            for medidor in MEDIDORES_PARTIDA:   # Sem partida em andamento, nada de pontuação ou fila antigas
+                medidor.limpar()
+            log_sistema.info("Sistema parado!")
     # Método para verificar se o elfo pode subir de nível
     def verificar_levelup(self, elfo):  # Elfo é uma instância da classe Elfo
         if self.pontuacao >= self.nivel_objetivo:   # Verifica se a pontuação atingiu o objetivo do nível
@@ -290,22 +552,19 @@ class GameMechanics:
             return False    # Se a penalidade total for menor que o limite de derrota, não há derrota
         else:
             return False    # Se a pontuação for 0, não há derrota
-    def processar_novos_presentes(self):
+    def processar_novos_presentes(self, max_itens=None):
         """
-        Processa presentes criados pelas threads produtoras.
-        Deve ser chamado no loop principal do jogo.
+        Retira da fila os presentes criados pelos produtores (no máximo
+        'max_itens'; todos, se None). Deve ser chamado no loop principal do
+        jogo, que cria um sprite para cada um. Os presentes que a política
+        CONTAR_PERDIDO descartou entram aqui no contador de perdidos, na thread
+        do jogo (o contador não é protegido por lock).
         """
-        presentes_processados = []  # Lista para armazenar os presentes processados
-        
-        # Processa todos os presentes na fila
-        while not self.fila_presentes_visuais.empty():  # Enquanto houver presentes na fila
-            try:
-                presente_data = self.fila_presentes_visuais.get_nowait() # Tenta obter um presente da fila sem bloquear
-                presentes_processados.append(presente_data) # Adiciona o presente processado à lista
-            except:
-                break
-        
-        return presentes_processados    # Lista de presentes processados
+        perdidos = self.fila_presentes_visuais.tomar_perdidos()
+        if perdidos:
+            self.presentes_perdidos += perdidos
+            metrica_perdidos.incrementar(perdidos, motivo="fila")
+        return self.fila_presentes_visuais.retirar_lote(max_itens)
     
     def elfo_tentar_coletar(self, elfo):
         """
@@ -331,7 +590,8 @@ class GameMechanics:
         sucesso = self.gerenciador_mesa.adicionar_presente(presente_data)   # Tenta adicionar o presente à mesa
         if not sucesso:   # Se não conseguiu adicionar (mesa cheia)
             self.presentes_perdidos += 1    # Incrementa o contador de presentes perdidos
-            print("[PENALIDADE] Presente perdido! Mesa cheia.") 
+            metrica_perdidos.incrementar(motivo="mesa_cheia")
+            log_mesa.info("Presente perdido! Mesa cheia.", penalidade=10)
         return sucesso  # Retorna True se conseguiu adicionar, False se mesa cheia
     
     def get_estatisticas(self): # Método para obter estatísticas do jogo
@@ -342,7 +602,28 @@ class GameMechanics:
             'presentes_perdidos': self.presentes_perdidos,
             'nivel_dificuldade': self.escalonador.nivel_dificuldade,
             'mesa_status': mesa_status,
+            'fila_presentes': self.fila_presentes_visuais.get_estatisticas(),
             'produtores_ativos': sum(1 for p in self.produtores if p.is_alive())
         }
+
+    def _coletar_metricas(self):
+        """
+        Copia o estado da partida para os medidores exportados. Chamado pela
+        exportação (thread do servidor HTTP ou do JSONL), não pelo loop de frames.
+        """
+        if not self.iniciado:   # Uma coleta que começou antes de 'parar_sistema' não republica a partida
+            return
+        estatisticas = self.get_estatisticas()
+        metrica_pontuacao.definir(estatisticas['pontuacao'])
+        metrica_nivel.definir(estatisticas['nivel_dificuldade'])
+        metrica_perdidos_partida.definir(estatisticas['presentes_perdidos'])
+        metrica_mesa.definir(estatisticas['mesa_status']['presentes_na_mesa'])
+        metrica_mesa_capacidade.definir(estatisticas['mesa_status']['capacidade'])
+        metrica_fila.definir(estatisticas['fila_presentes']['na_fila'])
+        metrica_fila_capacidade.definir(estatisticas['fila_presentes']['capacidade'])
+        metrica_produtores_ativos.definir(estatisticas['produtores_ativos'])
+        metrica_intervalo.limpar()  # Só as esteiras desta partida
+        for produtor in self.produtores:
+            metrica_intervalo.definir(produtor.intervalo_producao, esteira=produtor.esteira_id)
     
 
@@ -0,0 +1,138 @@
+#   game/renderizador.py
+"""
+Renderização da cena de jogo por retângulos sujos (dirty rectangles).
+Em vez de redesenhar o fundo 800x600 e todos os sprites a cada frame, cada
+sprite marca 'dirty = 1' quando sua imagem ou posição muda. O grupo
+'LayeredDirty' redesenha apenas essas áreas (fundo + sprites que as cruzam)
+e a tela é atualizada com 'pygame.display.update(retangulos)'. Quando a área
+alterada passa de FRACAO_AREA_SUJA_FLIP da tela, faz um 'flip' completo.
+"""
+import pygame   # Importa o Pygame para sprites, superfícies e atualização da tela
+from ..settings import FRACAO_AREA_SUJA_FLIP
+
+# --- Camadas de desenho (maior = desenhado por cima) ---
+CAMADA_CENARIO = 0  # Esteiras e mesa
+CAMADA_ELFO = 1
+CAMADA_PRESENTES = 2
+CAMADA_HUD = 3
+CAMADA_POPUP = 4
+CAMADA_DEPURACAO = 5    # Sobreposição de desempenho (F1)
+
+
+def _unir_sobrepostos(retangulos):
+    """Junta os retângulos que se cruzam, devolvendo uma lista sem sobreposições."""
+    unidos = []
+    for rect in retangulos:
+        rect = pygame.Rect(rect)
+        i = rect.collidelist(unidos)
+        while i > -1:   # Absorve todos os que cruzam o retângulo (que cresce a cada união)
+            rect.union_ip(unidos.pop(i))
+            i = rect.collidelist(unidos)
+        unidos.append(rect)
+    return unidos
+
+
+class SpriteTexto(pygame.sprite.DirtySprite):
+    """
+    Um texto que só é renderizado novamente quando o conteúdo ou a cor mudam,
+    e só marca a área como suja quando algo visível mudou.
+    """
+    def __init__(self, fonte):
+        super().__init__()
+        self.fonte = fonte  # Fonte usada para renderizar o texto
+        self._conteudo = None   # (texto, cor) renderizado por último
+        self.image = pygame.Surface((0, 0), pygame.SRCALPHA)
+        self.rect = self.image.get_rect()
+        self.visible = 0    # Começa escondido até receber um texto
+
+    def set_texto(self, texto, cor, **posicao):
+        """
+        Define o texto exibido e sua posição.
+        Args:
+            texto (str): Texto a exibir.
+            cor (tuple): Cor RGB do texto.
+            **posicao: Âncora do retângulo, como em get_rect (ex.: topleft=(10, 10), center=(x, y)).
+        """
+        conteudo = (texto, cor)
+        if conteudo != self._conteudo:
+            self._conteudo = conteudo
+            self.image = self.fonte.render(texto, True, cor)
+            self.dirty = 1
+        novo_rect = self.image.get_rect(**posicao)
+        if novo_rect != self.rect:
+            self.rect = novo_rect
+            self.dirty = 1
+        self.visible = 1    # Alterar 'visible' já marca o sprite como sujo
+
+    def esconder(self):
+        """Esconde o texto (a área que ele ocupava é redesenhada com o fundo)."""
+        self.visible = 0
+
+
+class RenderizadorCena:
+    """
+    Desenha um grupo de DirtySprites sobre um fundo fixo, atualizando na tela
+    apenas os retângulos que mudaram.
+    """
+    def __init__(self, screen, fundo):
+        """
+        Args:
+            screen (pygame.Surface): Superfície da janela.
+            fundo (pygame.Surface): Imagem de fundo, do tamanho da tela.
+        """
+        self.screen = screen
+        self.grupo = pygame.sprite.LayeredDirty()
+        self.grupo.clear(screen, fundo)
+        # A troca automática por tempo do LayeredDirty é desligada: a decisão
+        # entre 'update' e 'flip' é tomada pela área suja (ver 'desenhar').
+        self.grupo.set_timing_threshold(float('inf'))
+        self.area_tela = screen.get_width() * screen.get_height()
+        self.fracao_flip = FRACAO_AREA_SUJA_FLIP
+        self._tela_inteira = True   # O primeiro frame precisa redesenhar tudo
+        # --- Estatísticas ---
+        self.fracao_suja = 1.0  # Fração da tela atualizada no último frame
+        self.frames_flip = 0    # Frames em que a tela inteira foi atualizada
+        self.frames_parciais = 0    # Frames atualizados só por retângulos
+
+    def adicionar(self, sprites, camada):
+        """Adiciona um sprite (ou lista de sprites) na camada indicada."""
+        self.grupo.add(sprites, layer=camada)
+
+    def redesenhar_tudo(self):
+        """Força o próximo frame a redesenhar e atualizar a tela inteira."""
+        self._tela_inteira = True
+
+    def desenhar(self):
+        """
+        Redesenha as áreas sujas e atualiza a janela.
+        Returns:
+            list: Retângulos da tela que foram atualizados.
+        """
+        return self.apresentar(self.compor())
+
+    def compor(self):
+        """
+        Redesenha as áreas sujas na superfície da tela, sem enviá-las à janela.
+        Returns:
+            list: Retângulos da tela que foram redesenhados.
+        """
+        if self._tela_inteira:
+            self.grupo.repaint_rect(self.screen.get_rect())
+        # Um sprite removido deixa dois retângulos sobrepostos (posição antiga e
+        # atual). Sem juntá-los, um sprite parado que cruze os dois seria
+        # desenhado duas vezes ali, e as bordas semitransparentes ficariam mais escuras.
+        self.grupo.lostsprites[:] = _unir_sobrepostos(self.grupo.lostsprites)
+        return self.grupo.draw(self.screen)
+
+    def apresentar(self, retangulos):
+        """Envia à janela os retângulos compostos (com 'update', ou 'flip' se a área suja for grande)."""
+        area_suja = sum(r.width * r.height for r in retangulos)
+        self.fracao_suja = area_suja / self.area_tela
+        if self._tela_inteira or self.fracao_suja > self.fracao_flip:
+            pygame.display.flip()
+            self.frames_flip += 1
+            self._tela_inteira = False
+        elif retangulos:
+            pygame.display.update(retangulos)
+            self.frames_parciais += 1
+        return retangulos
@@ -0,0 +1,299 @@
+#   game/reproducao.py
+"""
+Modo determinístico: gravação compacta das ações do jogador e reprodução
+exata de uma partida.
+No modo determinístico, o relógio da partida é a contagem de passos. Cada
+frame executa exatamente PASSOS_POR_FRAME passos fixos, seja qual for o
+tempo real do frame. Os produtores são disparados pelo 'AgendadorSimulado',
+no relógio da simulação, e não pela thread do agendador. Assim, a partida
+depende só da semente ('FluxosAleatorios') e das ações de cada passo.
+A gravação guarda a semente, a configuração da oficina e as ações, cada uma
+com o passo em que entrou, em um arquivo binário de poucos bytes por ação:
+    cabeçalho: struct FORMATO_CABECALHO (identificador, versão, semente, esteiras,
+               passos por frame, física, total de passos, assinatura do estado
+               final e número de ações)
+    ações:     distância (em passos) até a ação anterior, em varint, e o código da ação (1 byte)
+A reprodução roda na janela, no ritmo normal (main.py --reproduzir), ou sem
+janela, tão rápido quanto a CPU permitir; assim, uma partida lenta vinda de
+outra máquina pode ser perfilada aqui. Ao fim, a assinatura do estado
+('assinatura_estado') é comparada com a gravada.
+Uso:
+    python -m so_projeto_final.game.reproducao partida.onrp
+    python -m so_projeto_final.game.reproducao partida.onrp --perfil
+ANALOGIA: É o registro e reexecução (record/replay) usado para depurar
+sistemas concorrentes: fixadas as fontes de não determinismo (relógio,
+sorteios, ordem dos eventos), basta gravar as entradas para repetir a execução.
+"""
+import struct   # Importa struct para o formato binário da gravação
+import zlib # Importa zlib para o CRC-32 da assinatura do estado
+from ..settings import FPS, PASSOS_SIMULACAO_POR_SEGUNDO, FISICA_PRESENTES
+from .simulacao import (SimulacaoPartida, LayoutOficina, ACAO_ESQUERDA, ACAO_DIREITA,
+                        ACAO_ESPACO, ACAO_PROCESSAR)
+from ..registro import obter_registro, JOGO # Registro não bloqueante
+
+log_jogo = obter_registro(JOGO)
+
+PASSOS_POR_FRAME = max(1, round(PASSOS_SIMULACAO_POR_SEGUNDO / FPS))    # Relógio por passos: fixo por frame
+IDENTIFICADOR = b"ONRP" # Início de todo arquivo de gravação
+VERSAO = 1
+FORMATO_CABECALHO = "<4sBqHBBIII"
+CODIGOS_ACOES = {ACAO_ESQUERDA: 1, ACAO_DIREITA: 2, ACAO_ESPACO: 3, ACAO_PROCESSAR: 4}
+ACOES_POR_CODIGO = {codigo: acao for acao, codigo in CODIGOS_ACOES.items()}
+FISICAS = ("python", "numpy")   # Índice gravado no cabeçalho
+
+
+def assinatura_estado(simulacao):
+    """
+    CRC-32 dos contadores da partida e da posição de cada presente em queda.
+    Duas execuções com a mesma assinatura no mesmo passo chegaram ao mesmo estado.
+    """
+    mecanicas = simulacao.mecanicas
+    valores = (simulacao.passos, mecanicas.pontuacao, mecanicas.presentes_perdidos,
+               mecanicas.escalonador.nivel_dificuldade, simulacao.mesa.presentes_processados_total,
+               simulacao.presentes_gerados, simulacao.presentes_coletados, simulacao.presentes_entregues,
+               simulacao.entregas_recusadas, simulacao.elfo.position_index, simulacao.elfo.presentes_carregados,
+               len(simulacao.mesa.itens), len(simulacao.presentes))
+    assinatura = zlib.crc32(struct.pack(f"<{len(valores)}q", *valores))
+    for id_presente, x, y in simulacao.presentes.posicoes_interpoladas(1.0):
+        assinatura = zlib.crc32(struct.pack("<qqq", int(id_presente), int(x), int(y)), assinatura)
+    for tipo in simulacao.mesa.itens:   # Tipos sorteados pelo fluxo da mesa
+        assinatura = zlib.crc32(tipo.encode(), assinatura)
+    return assinatura
+
+
+def _escrever_varint(saida, valor):
+    """Inteiro não negativo em 7 bits por byte (o bit mais alto indica que há mais bytes)."""
+    while valor >= 0x80:
+        saida.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    saida.append(valor)
+
+
+def _ler_varint(dados, posicao):
+    valor = deslocamento = 0
+    while True:
+        if posicao >= len(dados):
+            raise ValueError("Gravação truncada")
+        byte = dados[posicao]
+        posicao += 1
+        valor |= (byte & 0x7F) << deslocamento
+        if byte < 0x80:
+            return valor, posicao
+        deslocamento += 7
+
+
+class Gravacao:
+    """Semente, configuração da oficina e ações de uma partida, com o passo de cada ação."""
+
+    def __init__(self, semente, num_esteiras=3, passos_por_frame=PASSOS_POR_FRAME, fisica=FISICA_PRESENTES,
+                 entradas=None, total_passos=0, assinatura=0):
+        self.semente = semente
+        self.num_esteiras = num_esteiras
+        self.passos_por_frame = passos_por_frame
+        self.fisica = fisica
+        self.entradas = entradas if entradas is not None else []  # (passo, ação), em ordem de passo
+        self.total_passos = total_passos    # Passos executados até o fim da partida
+        self.assinatura = assinatura    # 'assinatura_estado' no último passo
+
+    def acoes_por_passo(self):
+        """Dicionário passo -> lista de ações, na ordem em que foram gravadas."""
+        acoes = {}
+        for passo, acao in self.entradas:
+            acoes.setdefault(passo, []).append(acao)
+        return acoes
+
+    def para_bytes(self):
+        saida = bytearray(struct.pack(FORMATO_CABECALHO, IDENTIFICADOR, VERSAO, self.semente, self.num_esteiras,
+                                      self.passos_por_frame, FISICAS.index(self.fisica), self.total_passos,
+                                      self.assinatura, len(self.entradas)))
+        passo_anterior = 0
+        for passo, acao in self.entradas:
+            _escrever_varint(saida, passo - passo_anterior)
+            saida.append(CODIGOS_ACOES[acao])
+            passo_anterior = passo
+        return bytes(saida)
+
+    @classmethod
+    def de_bytes(cls, dados):
+        tamanho = struct.calcsize(FORMATO_CABECALHO)
+        if len(dados) < tamanho:
+            raise ValueError("Gravação truncada")
+        (identificador, versao, semente, num_esteiras, passos_por_frame, fisica, total_passos,
+         assinatura, num_entradas) = struct.unpack_from(FORMATO_CABECALHO, dados)
+        if identificador != IDENTIFICADOR:
+            raise ValueError("O arquivo não é uma gravação da Oficina do Noel")
+        if versao != VERSAO:
+            raise ValueError(f"Versão de gravação não suportada: {versao}")
+        entradas = []
+        posicao = tamanho
+        passo = 0
+        for _ in range(num_entradas):
+            distancia, posicao = _ler_varint(dados, posicao)
+            if posicao >= len(dados):
+                raise ValueError("Gravação truncada")
+            passo += distancia
+            entradas.append((passo, ACOES_POR_CODIGO[dados[posicao]]))
+            posicao += 1
+        return cls(semente, num_esteiras, passos_por_frame, FISICAS[fisica], entradas, total_passos, assinatura)
+
+    def salvar(self, caminho):
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(self.para_bytes())
+
+    @classmethod
+    def carregar(cls, caminho):
+        with open(caminho, "rb") as arquivo:
+            return cls.de_bytes(arquivo.read())
+
+
+class ModoDeterministico:
+    """
+    Liga uma partida ao relógio por passos e grava (ou reproduz) as ações.
+    Um objeto por partida: 'criar_simulacao', um 'avancar_frame' por frame e
+    'finalizar' no fim (grava o arquivo ou confere a assinatura).
+    """
+
+    def __init__(self, semente=None, caminho_gravacao=None, reproducao=None):
+        """
+        Args:
+            semente (int, optional): Semente da partida (sorteada se omitida; a usada vai para a gravação).
+            caminho_gravacao (str, optional): Arquivo onde a gravação é salva em 'finalizar'.
+            reproducao (Gravacao, optional): Gravação a reproduzir; as ações do jogador são ignoradas.
+        """
+        self.reproducao = reproducao
+        self.semente = reproducao.semente if reproducao is not None else semente
+        self.caminho_gravacao = caminho_gravacao
+        self.passos_por_frame = reproducao.passos_por_frame if reproducao is not None else PASSOS_POR_FRAME
+        self.gravacao = None    # Criada em 'criar_simulacao', com a semente efetiva
+        self._acoes_gravadas = reproducao.acoes_por_passo() if reproducao is not None else {}
+        self._finalizado = False
+
+    @property
+    def reproduzindo(self):
+        return self.reproducao is not None
+
+    def criar_simulacao(self, game_mechanics=None, layout=None):
+        """
+        Cria a 'SimulacaoPartida' da partida. As mecânicas não podem ter sido
+        iniciadas: os produtores precisam do agendador simulado.
+        """
+        if game_mechanics is not None and game_mechanics.iniciado:
+            raise ValueError("O modo determinístico precisa de mecânicas ainda não iniciadas")
+        num_esteiras = self.reproducao.num_esteiras if self.reproduzindo else 3
+        if layout is None:
+            layout = LayoutOficina(num_esteiras)
+        elif layout.num_esteiras != num_esteiras:
+            raise ValueError("A gravação foi feita com outro número de esteiras")
+        fisica = self.reproducao.fisica if self.reproduzindo else FISICA_PRESENTES
+        simulacao = SimulacaoPartida(game_mechanics, layout=layout, semente=self.semente, fisica=fisica)
+        if not self.reproduzindo:
+            self.gravacao = Gravacao(simulacao.semente, layout.num_esteiras, self.passos_por_frame, fisica)
+        return simulacao
+
+    def acoes_do_passo(self, passo, acoes_jogador):
+        """Ações do passo 'passo': as gravadas (reprodução) ou as do jogador, que são gravadas."""
+        if self.reproduzindo:
+            return self._acoes_gravadas.get(passo, ())
+        self.gravacao.entradas.extend((passo, acao) for acao in acoes_jogador)
+        return acoes_jogador
+
+    def avancar_frame(self, simulacao, acoes_jogador=()):
+        """
+        Executa os passos de um frame. As ações do jogador entram no primeiro passo.
+        Returns:
+            tuple: (resultado do último passo, eventos de todos os passos do frame)
+        """
+        simulacao.iniciar_frame()
+        resultado = None
+        eventos = []
+        for _ in range(self.passos_por_frame):
+            if resultado is not None or self.terminou(simulacao):
+                break
+            resultado = simulacao.passo(self.acoes_do_passo(simulacao.passos + 1, acoes_jogador))
+            acoes_jogador = ()
+            eventos.extend(simulacao.eventos)
+        return resultado, eventos
+
+    def terminou(self, simulacao):
+        """True quando a reprodução chegou ao último passo gravado."""
+        return self.reproduzindo and simulacao.passos >= self.reproducao.total_passos
+
+    def finalizar(self, simulacao):
+        """
+        Fecha a partida: salva a gravação ou, na reprodução, confere o passo e a assinatura finais.
+        Só a primeira chamada tem efeito.
+        Returns:
+            bool: False se a reprodução divergiu da gravação.
+        """
+        if self._finalizado:
+            return True
+        self._finalizado = True
+        assinatura = assinatura_estado(simulacao)
+        if self.reproduzindo:
+            confere = simulacao.passos == self.reproducao.total_passos and assinatura == self.reproducao.assinatura
+            if confere:
+                log_jogo.info("Reprodução idêntica à gravação", passos=simulacao.passos)
+            else:
+                log_jogo.aviso("A reprodução divergiu da gravação", passos=simulacao.passos,
+                               passos_gravados=self.reproducao.total_passos)
+            return confere
+        self.gravacao.total_passos = simulacao.passos
+        self.gravacao.assinatura = assinatura
+        if self.caminho_gravacao is not None:
+            self.gravacao.salvar(self.caminho_gravacao)
+            log_jogo.info("Partida gravada em %s", self.caminho_gravacao, semente=self.gravacao.semente,
+                          passos=simulacao.passos, acoes=len(self.gravacao.entradas))
+        return True
+
+
+def reproduzir_sem_janela(gravacao):
+    """
+    Reproduz a gravação sem janela, tão rápido quanto a CPU permitir.
+    Returns:
+        tuple: (SimulacaoPartida ao fim, True se a reprodução é idêntica à gravação)
+    """
+    modo = ModoDeterministico(reproducao=gravacao)
+    simulacao = modo.criar_simulacao()
+    try:
+        while simulacao.resultado is None and not modo.terminou(simulacao):
+            modo.avancar_frame(simulacao)
+    finally:
+        simulacao.mecanicas.parar_sistema()
+    return simulacao, modo.finalizar(simulacao)
+
+
+# Execução standalone: reprodução sem janela (opcionalmente com o perfilador)
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description="Reproduz sem janela uma partida gravada da Oficina do Noel.")
+    parser.add_argument("gravacao", help="Arquivo gravado com main.py --gravar")
+    parser.add_argument("--perfil", action="store_true", help="Roda sob o cProfile e mostra as funções mais caras")
+    parser.add_argument("--linhas-perfil", type=int, default=25, help="Quantas funções mostrar no perfil")
+    args = parser.parse_args()
+
+    gravacao = Gravacao.carregar(args.gravacao)
+    inicio = time.perf_counter()
+    if args.perfil:
+        import cProfile
+        import pstats
+        perfilador = cProfile.Profile()
+        simulacao, confere = perfilador.runcall(reproduzir_sem_janela, gravacao)
+    else:
+        simulacao, confere = reproduzir_sem_janela(gravacao)
+    duracao = time.perf_counter() - inicio
+
+    print("=" * 30)
+    print(f"Semente: {gravacao.semente} | Esteiras: {gravacao.num_esteiras} | Física: {gravacao.fisica}")
+    print(f"Ações gravadas: {len(gravacao.entradas)} | Passos: {simulacao.passos}/{gravacao.total_passos}")
+    print(f"Tempo de jogo: {simulacao.tempo_ms / 1000.0:.1f}s reproduzido em {duracao:.2f}s "
+          f"({simulacao.tempo_ms / 1000.0 / max(duracao, 1e-9):.0f}x)")
+    print(f"Resultado: {simulacao.resultado} | Pontuação: {simulacao.mecanicas.pontuacao} | "
+          f"Perdidos: {simulacao.mecanicas.presentes_perdidos}")
+    print("Reprodução idêntica à gravação" if confere else "ATENÇÃO: a reprodução divergiu da gravação")
+    print("=" * 30)
+    if args.perfil:
+        pstats.Stats(perfilador).sort_stats("cumulative").print_stats(args.linhas_perfil)
+    sys.exit(0 if confere else 1)
@@ -0,0 +1,726 @@
+#   game/simulacao.py
+"""
+Núcleo de simulação de uma partida, independente de janela, de sprites e do
+relógio real do Pygame.
+Aqui ficam as regras que antes estavam espalhadas entre o 'game_loop' e as
+classes de sprite: spawn de presentes, queda, coleta pelo elfo, entrega na
+mesa, processamento automático e condições de vitória/derrota.
+Os presentes que caem são os criados pelos produtores (esteiras) de
+'GameMechanics': a simulação retira da fila de presentes visuais no máximo
+MAX_PRESENTES_POR_FRAME por frame. Sem janela, os produtores são disparados
+por um 'AgendadorSimulado', no relógio da própria simulação.
+A partida avança por passos ('passo'), cada um com uma duração em ms. Sem
+janela, os passos rodam tão rápido quanto a CPU permite, o que permite simular
+milhares de partidas para balancear o 'EscalonadorJogo' e a regra de derrota
+de 'GameMechanics'. O 'game_loop' apenas traduz teclas em ações, chama
+'passo' e desenha o estado resultante.
+Os passos têm duração fixa (PASSOS_SIMULACAO_POR_SEGUNDO) e as velocidades
+são em px/s, então a partida se comporta igual a 30, 60 ou 144 FPS: o
+'game_loop' acumula o tempo real do frame e executa quantos passos couberem
+('AcumuladorPassoFixo'), desenhando os presentes interpolados entre o passo
+anterior e o atual.
+Toda a aleatoriedade da partida sai de 'FluxosAleatorios': um gerador por
+subsistema (cada esteira, a mesa), todos derivados da semente da partida.
+Com a mesma semente e as mesmas ações nos mesmos passos, a partida se repete
+exatamente (ver game/reproducao.py).
+"""
+import random   # Importa random para as escolhas aleatórias da partida
+from collections import deque   # Fila O(1) nas pontas, usada em cada faixa do índice de presentes
+from ..settings import (LARGURA_TELA, ALTURA_TELA, VAGAS_NA_MESA, PONTUACAO_VITORIA,
+                        PONTUACAO_AUDIO_INTERMEDIARIO, PASSOS_SIMULACAO_POR_SEGUNDO,
+                        MAX_ATRASO_SIMULACAO_MS, MAX_PRESENTES_POR_FRAME, FISICA_PRESENTES)
+from .mechanics import GameMechanics, metrica_perdidos
+from .agendador import AgendadorSimulado    # Dispara os produtores no relógio da simulação
+from .fisica_vetorizada import PresentesVetorizados, NUMPY_DISPONIVEL  # Física opcional com NumPy
+from .latencia import LatenciasPresentes    # Latência de cada etapa do caminho de um presente
+from ..registro import obter_registro, QUEDA, JOGO  # Registro não bloqueante
+from ..metricas import metricas # Métricas exportadas (Prometheus/JSONL)
+
+log_queda = obter_registro(QUEDA)
+log_jogo = obter_registro(JOGO)
+metrica_processamento = metricas.histograma("oficina_processamento_segundos",
+                                            "Duração do processamento de um presente na mesa",
+                                            (0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 5.0, 10.0))
+
+# --- Tipos e dimensões dos objetos da oficina ---
+TIPOS_PRESENTE = ["presente_visual_1", "presente_visual_2", "presente_visual_3", "presente_visual_4"]
+TAMANHO_PRESENTE = 80   # Lado (px) do sprite de um presente em queda
+TAMANHO_ESTEIRA = 200   # Largura máxima (px) do sprite de uma esteira
+ESPACAMENTO_ESTEIRAS = 180  # Distância máxima (px) entre os cantos de duas esteiras vizinhas
+ESPACO_MESA = 170   # Largura (px) reservada à direita das esteiras para a mesa
+ALTURA_ELFO = 100   # Altura (px) do sprite do elfo
+LIMITE_PRESENTES_CAINDO = 6 # Máximo de presentes caindo ao mesmo tempo
+PASSO_SIMULACAO_MS = 1000.0 / PASSOS_SIMULACAO_POR_SEGUNDO  # Duração de um passo fixo
+
+# --- Ações que o jogador (ou uma política) pode executar em um passo ---
+ACAO_ESQUERDA = "esquerda"
+ACAO_DIREITA = "direita"
+ACAO_ESPACO = "espaco"  # Coletar (na esteira) ou entregar (na mesa)
+ACAO_PROCESSAR = "processar"    # Forçar o processamento (na mesa)
+
+
+class FluxosAleatorios:
+    """
+    Geradores aleatórios independentes, um por subsistema, derivados de uma semente.
+    Cada subsistema consome só o seu fluxo: uma esteira a mais (ou uma escolha
+    a mais da mesa) não muda a sequência que os outros subsistemas recebem.
+    """
+    def __init__(self, semente=None):
+        """
+        Args:
+            semente (int, optional): Semente da partida. Se omitida, é sorteada (e fica em 'self.semente',
+                para que a partida possa ser gravada e repetida).
+        """
+        self.semente = semente if semente is not None else random.SystemRandom().getrandbits(63)
+        self._fluxos = {}
+
+    def fluxo(self, nome):
+        """Gerador do subsistema 'nome' (sempre o mesmo objeto para o mesmo nome)."""
+        gerador = self._fluxos.get(nome)
+        if gerador is None:
+            # Semente em texto: a derivação não depende do PYTHONHASHSEED nem da ordem de criação
+            gerador = self._fluxos[nome] = random.Random(f"{self.semente}/{nome}")
+        return gerador
+
+
+class LayoutOficina:
+    """
+    Posições das esteiras, da mesa e do elfo na tela.
+    Usado tanto pela simulação (geometria da coleta e da queda) quanto pelo
+    'game_loop' (onde posicionar cada sprite).
+    Com até 3 esteiras, elas ficam a 180 px uma da outra e têm 200 px de
+    largura; com mais (modo de estresse), o espaçamento e a largura diminuem
+    para que todas as esteiras e a mesa caibam na tela. A mesa é sempre uma
+    só, depois da última esteira (ver game/estresse.py).
+    """
+    def __init__(self, num_esteiras=3, largura=LARGURA_TELA, altura=ALTURA_TELA):
+        if num_esteiras < 1:
+            raise ValueError("A oficina precisa de pelo menos uma esteira")
+        self.num_esteiras = num_esteiras
+        self.largura = largura
+        self.altura = altura
+        espacamento = min(ESPACAMENTO_ESTEIRAS, (largura - ESPACO_MESA) / num_esteiras)
+        self.largura_esteira = int(min(TAMANHO_ESTEIRA, espacamento + 20))  # Vizinhas se sobrepõem 20 px
+        extensao = espacamento * (num_esteiras - 1) + self.largura_esteira  # Da primeira à última esteira
+        x_inicial = -60 + (largura - extensao) / 2   # Canto esquerdo da primeira esteira
+        # Canto superior esquerdo de cada esteira
+        self.posicoes_esteiras = [(x_inicial + espacamento * i, altura / 4) for i in range(num_esteiras)]
+        self.centros_esteiras = [int(x) + self.largura_esteira // 2 for x, _ in self.posicoes_esteiras]
+        self.topo_esteiras = int(altura / 4)
+        # Centro da mesa, logo após a última esteira
+        self.posicao_mesa = (x_inicial + espacamento * (num_esteiras - 1) + self.largura_esteira + 10, altura * 0.8)
+        self.y_elfo = altura * 0.85 # Posição vertical do elfo, um pouco acima da mesa
+        # Uma posição do elfo abaixo de cada esteira e a última na mesa
+        self.posicoes_elfo = [(cx, self.y_elfo) for cx in self.centros_esteiras]
+        self.posicoes_elfo.append((self.posicao_mesa[0], self.y_elfo))
+        self.indice_mesa = num_esteiras # Índice da posição do elfo que fica na mesa
+
+
+class PresenteLogico:
+    """Estado de um presente em queda: esteira de origem, tipo e posição do centro."""
+    __slots__ = ('id', 'esteira', 'tipo', 'x', 'y', 'y_anterior', 'velocidade')
+
+    def __init__(self, id, esteira, tipo, x, y, velocidade):
+        self.id = id    # Identificador único na partida
+        self.esteira = esteira  # Índice da esteira de origem
+        self.tipo = tipo    # Um dos TIPOS_PRESENTE
+        self.x = x  # Centro horizontal (px)
+        self.y = float(y)  # Centro vertical (px)
+        self.y_anterior = self.y    # Centro vertical no passo anterior, para interpolar o desenho
+        self.velocidade = velocidade    # Velocidade de queda (px/s)
+
+    def y_interpolado(self, alpha):
+        """Posição vertical entre o passo anterior (alpha=0) e o atual (alpha=1)."""
+        return self.y_anterior + (self.y - self.y_anterior) * alpha
+
+
+class IndicePorEsteira:
+    """
+    Presentes em queda agrupados pela esteira (faixa) de origem. Cada faixa é
+    um 'deque' ordenado do presente mais baixo (mais perto do chão, maior y)
+    para o mais alto, de modo que:
+        - o presente coletável sob o elfo só pode ser o primeiro da faixa
+          em que ele está (O(1));
+        - os presentes que passaram do chão saem do início das faixas (O(1));
+        - um presente novo nasce no topo e entra no fim da faixa (O(1)).
+    Presentes criados depois de uma subida de nível caem mais rápido e podem
+    ultrapassar os anteriores; 'mover' detecta isso e reordena a faixa.
+    Iterar sobre o índice percorre todos os presentes, faixa por faixa.
+    """
+    def __init__(self, num_esteiras):
+        self.faixas = [deque() for _ in range(num_esteiras)]
+        self.total = 0  # Presentes em todas as faixas
+
+    def criar(self, id, esteira, tipo, x, y, velocidade):
+        """Cria um 'PresenteLogico' em queda e o coloca no índice."""
+        return self.adicionar(PresenteLogico(id, esteira, tipo, x, y, velocidade))
+
+    def adicionar(self, presente):
+        """Coloca um presente na faixa da sua esteira, mantendo a ordem por y."""
+        faixa = self.faixas[presente.esteira]
+        faixa.append(presente)
+        if len(faixa) > 1 and faixa[-2].y < presente.y:    # Nasceu abaixo do último (raro): reordena
+            self._ordenar(presente.esteira)
+        self.total += 1
+        return presente
+
+    def mais_baixo(self, esteira):
+        """Retorna o presente mais perto do chão na faixa 'esteira', ou None."""
+        faixa = self.faixas[esteira]
+        return faixa[0] if faixa else None
+
+    def remover_mais_baixo(self, esteira):
+        """Retira e retorna o presente mais perto do chão na faixa 'esteira'."""
+        self.total -= 1
+        return self.faixas[esteira].popleft()
+
+    def mover(self, dt_s, limite):
+        """
+        Faz todos os presentes caírem 'dt_s' segundos e retira os que passaram de 'limite'.
+        Returns:
+            list: Presentes que passaram do chão.
+        """
+        caidos = []
+        for esteira, faixa in enumerate(self.faixas):
+            y_anterior = float('inf')
+            fora_de_ordem = False
+            for presente in faixa:
+                presente.y_anterior = presente.y
+                presente.y += presente.velocidade * dt_s
+                fora_de_ordem |= presente.y > y_anterior    # Ultrapassou o presente da frente
+                y_anterior = presente.y
+            if fora_de_ordem:
+                self._ordenar(esteira)
+            while faixa and faixa[0].y > limite:
+                caidos.append(faixa.popleft())
+        self.total -= len(caidos)
+        return caidos
+
+    def _ordenar(self, esteira):
+        """Reordena a faixa no lugar (do maior y para o menor)."""
+        faixa = self.faixas[esteira]
+        ordenada = sorted(faixa, key=lambda p: p.y, reverse=True)
+        faixa.clear()
+        faixa.extend(ordenada)
+
+    def posicoes_interpoladas(self, alpha):
+        """Tuplas (id, x, y) com a posição de desenho de cada presente, em pixels."""
+        for faixa in self.faixas:
+            for presente in faixa:
+                yield presente.id, presente.x, round(presente.y_interpolado(alpha))
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        for faixa in self.faixas:
+            yield from faixa
+
+
+def criar_indice_presentes(num_esteiras, fisica=FISICA_PRESENTES):
+    """
+    Cria o índice dos presentes em queda com a física escolhida.
+    Args:
+        fisica (str): "python" ('IndicePorEsteira') ou "numpy" ('PresentesVetorizados').
+            Sem NumPy instalado, "numpy" volta para "python" com um aviso.
+    """
+    if fisica == "numpy":
+        if NUMPY_DISPONIVEL:
+            return PresentesVetorizados(num_esteiras)
+        log_jogo.aviso("NumPy não está instalado; usando a física em Python.")
+    elif fisica != "python":
+        raise ValueError(f"Física desconhecida: {fisica!r} (use 'python' ou 'numpy')")
+    return IndicePorEsteira(num_esteiras)
+
+
+class ElfoLogico:
+    """
+    Estado do elfo (o CONSUMIDOR): posição atual e carga.
+    O sprite 'Elfo' apenas desenha este estado.
+    """
+    def __init__(self, num_posicoes, start_index=0, capacidade_carga=10):
+        self.num_posicoes = num_posicoes    # Quantas posições fixas o elfo pode ocupar
+        self.position_index = start_index   # Índice da posição atual
+        self.capacidade_carga = capacidade_carga    # Capacidade máxima de carga do Elfo
+        self.presentes_carregados = 0   # Contador de presentes atualmente carregados pelo Elfo
+
+    def move(self, direction):
+        """Move o elfo uma posição para a esquerda ("left") ou direita ("right"), respeitando os limites."""
+        if direction == "right" and self.position_index < self.num_posicoes - 1:
+            self.position_index += 1
+        elif direction == "left" and self.position_index > 0:
+            self.position_index -= 1
+
+    def carregar_presente(self):
+        """Incrementa a contagem de presentes carregados se não atingir a capacidade."""
+        if self.presentes_carregados < self.capacidade_carga:
+            self.presentes_carregados += 1
+            return True
+        return False
+
+    def descarregar_presente(self):
+        """Decrementa a contagem de presentes carregados."""
+        if self.presentes_carregados > 0:
+            self.presentes_carregados -= 1
+            return True
+        return False
+
+    def aumentar_capacidade(self, aumento):
+        """Aumenta a capacidade de carga do elfo (chamado por GameMechanics.verificar_levelup)."""
+        self.capacidade_carga += aumento
+        log_jogo.info("LEVEL UP! Capacidade do elfo aumentada para: %d", self.capacidade_carga)
+
+
+class MesaLogica:
+    """
+    Estado visível da mesa de embrulhos: itens sobre ela e o processamento em
+    andamento. A exclusão mútua e a espera por vagas continuam em 'GerenciadorMesa';
+    esta classe cuida apenas do tempo de processamento.
+    """
+    def __init__(self, capacidade=VAGAS_NA_MESA, tempo_processamento=2000):
+        self.capacidade = capacidade
+        self.itens = [] # Tipos dos presentes na mesa, em ordem de chegada (FIFO)
+        # --- Variáveis para Processamento Automático ---
+        self.processamento_ativo = True  # Se a mesa deve processar automaticamente
+        self.tempo_processamento = tempo_processamento  # Tempo em ms para processar um presente
+        self.ultimo_processamento = 0  # Inicializa com 0 para começar imediatamente
+        self.presentes_processados_total = 0
+        # --- Estado do processamento ---
+        self.processando = False
+        self.tempo_inicio_processamento = 0
+
+    def adicionar_item(self, tipo):
+        """Coloca um presente na mesa, se houver espaço. Retorna True se sucesso."""
+        if len(self.itens) < self.capacidade:
+            self.itens.append(tipo)
+            return True
+        return False
+
+    def processar_presente(self, agora):
+        """Inicia o processamento do primeiro presente. Retorna False se a mesa está vazia ou ocupada."""
+        if self.itens and not self.processando:
+            self.processando = True
+            self.tempo_inicio_processamento = agora
+            return True
+        return False
+
+    def verificar_processamento_concluido(self, agora):
+        """Retorna True se o processamento em andamento já durou 'tempo_processamento'."""
+        return self.processando and agora - self.tempo_inicio_processamento >= self.tempo_processamento
+
+    def finalizar_processamento(self):
+        """Retira da mesa o presente que estava sendo processado. Retorna True se havia um."""
+        if self.processando and self.itens:
+            self.itens.pop(0)  # Remove o primeiro presente (FIFO)
+            self.presentes_processados_total += 1
+            self.processando = False
+            return True
+        self.processando = False    # Estava processando mas não há itens
+        return False
+
+    def atualizar(self, agora):
+        """Inicia o processamento automático quando chega a hora."""
+        if self.processamento_ativo and self.itens and not self.processando:
+            if agora - self.ultimo_processamento >= self.tempo_processamento:
+                self.processar_presente(agora)
+        elif not self.itens and not self.processando:
+            # Sem presentes, reseta o timer para evitar processamento imediato
+            # ao adicionar o próximo item.
+            self.ultimo_processamento = agora
+
+
+class AcumuladorPassoFixo:
+    """
+    Converte o tempo real (variável) de cada frame em passos de duração fixa.
+    O tempo que sobra (menor que um passo) fica acumulado para o próximo frame
+    e define o fator 'alpha' usado para interpolar o desenho.
+    """
+    def __init__(self, passo_ms=PASSO_SIMULACAO_MS, atraso_maximo_ms=MAX_ATRASO_SIMULACAO_MS):
+        self.passo_ms = passo_ms    # Duração de cada passo da simulação
+        self.atraso_maximo_ms = atraso_maximo_ms    # Limite do tempo acumulado após uma travada longa
+        self.acumulado_ms = 0.0 # Tempo real ainda não simulado
+
+    def adicionar(self, dt_ms):
+        """Soma o tempo real do frame. Atrasos acima do limite são descartados."""
+        self.acumulado_ms = min(self.acumulado_ms + dt_ms, self.atraso_maximo_ms)
+
+    def consumir_passo(self):
+        """Retorna True (e desconta um passo) se há tempo acumulado para mais um passo."""
+        if self.acumulado_ms >= self.passo_ms:
+            self.acumulado_ms -= self.passo_ms
+            return True
+        return False
+
+    @property
+    def alpha(self):
+        """Fração do próximo passo já decorrida (0 a 1), usada na interpolação."""
+        return self.acumulado_ms / self.passo_ms
+
+
+class SimulacaoPartida:
+    """
+    Executa as regras de uma partida passo a passo, sem depender de janela.
+    Quem chama 'passo' diretamente deve chamar 'iniciar_frame' uma vez por
+    frame: é ele que renova a cota de presentes retirados da fila.
+    A cada passo, a lista 'eventos' registra o que aconteceu, como tuplas
+    (nome, dado). O 'game_loop' usa esses eventos para criar e remover
+    sprites, exibir popups e tocar sons:
+        ('spawn', PresenteLogico), ('coleta', PresenteLogico), ('queda', PresenteLogico),
+        ('entrega', None), ('mesa_cheia', None), ('processado', None), ('marco_intermediario', None)
+    """
+    def __init__(self, game_mechanics=None, layout=None, semente=None, dt_ms=PASSO_SIMULACAO_MS,
+                 max_presentes_por_frame=MAX_PRESENTES_POR_FRAME, fisica=FISICA_PRESENTES,
+                 limite_presentes=LIMITE_PRESENTES_CAINDO, verificar_fim=True):
+        """
+        Args:
+            game_mechanics (GameMechanics, optional): Mecânicas da partida. Uma nova instância é criada se omitido.
+                Se ela ainda não foi iniciada, os produtores passam a ser disparados no relógio da simulação.
+            layout (LayoutOficina, optional): Posições da oficina. Usa o layout padrão de 3 esteiras se omitido.
+            semente (int, optional): Semente dos geradores aleatórios ('FluxosAleatorios'). Se omitida,
+                é sorteada; a usada fica em 'self.semente'.
+            dt_ms (float): Duração de um passo, em milissegundos.
+            max_presentes_por_frame (int): Presentes retirados da fila dos produtores por frame, no máximo.
+            fisica (str): Física dos presentes em queda: "python" ou "numpy" (ver 'criar_indice_presentes').
+            limite_presentes (int, optional): Máximo de presentes caindo ao mesmo tempo (None: sem limite).
+            verificar_fim (bool): False desliga a vitória e a derrota (a partida só termina por fora).
+        """
+        self.mecanicas = game_mechanics if game_mechanics is not None else GameMechanics()
+        self.layout = layout if layout is not None else LayoutOficina()
+        self.fluxos = FluxosAleatorios(semente) # Um gerador aleatório por subsistema
+        self.semente = self.fluxos.semente
+        self.rng = self.fluxos.fluxo("mesa")    # Tipo do presente colocado na mesa
+        self.dt_ms = dt_ms
+        self.elfo = ElfoLogico(len(self.layout.posicoes_elfo))
+        self.mesa = MesaLogica(self.mecanicas.gerenciador_mesa.capacidade)
+        self.presentes = criar_indice_presentes(self.layout.num_esteiras, fisica)  # Presentes em queda, por esteira
+        self.tempo_ms = 0.0 # Relógio da simulação
+        self.passos = 0 # Quantos passos já foram executados
+        self.max_presentes_por_frame = max_presentes_por_frame
+        self.limite_presentes = limite_presentes
+        self.verificar_fim = verificar_fim
+        self.cota_spawn = max_presentes_por_frame   # Presentes que ainda podem sair da fila neste frame
+        # Sem o agendador com thread (partida sem janela), os produtores seguem o relógio simulado
+        self.agendador_simulado = None
+        if not self.mecanicas.iniciado:
+            self.agendador_simulado = AgendadorSimulado()
+            self.mecanicas.iniciar_sistema(self.agendador_simulado, self.fluxos)
+        self.eventos = []   # Eventos do último passo
+        self.resultado = None   # None enquanto a partida não terminou; 'VITORIA' ou 'DERROTA' depois
+        self.marco_intermediario_atingido = False
+        self._proximo_id = 0
+        # --- Latência por etapa: a viagem de cada presente acompanha o presente até o fim do processamento ---
+        self.latencias = LatenciasPresentes()
+        self._viagens = {}  # id do presente em queda -> ViagemPresente
+        self._viagens_carga = deque()   # Presentes carregados pelo elfo, em ordem de coleta
+        self._viagens_mesa = deque()    # Presentes sobre a mesa, na mesma ordem (FIFO) de 'mesa.itens'
+        # --- Estatísticas ---
+        self.presentes_gerados = 0
+        self.presentes_coletados = 0
+        self.presentes_entregues = 0
+        self.entregas_recusadas = 0
+
+    # --- Geometria ---
+    def presente_coletavel(self):
+        """
+        Retorna o presente ao alcance do elfo, ou None.
+        Cada posição do elfo (fora a mesa) fica sob uma esteira, então só o
+        presente mais baixo da faixa dessa esteira pode estar ao alcance.
+        """
+        indice = self.elfo.position_index
+        if indice >= self.layout.indice_mesa:
+            return None
+        presente = self.presentes.mais_baixo(indice)
+        if presente is None:
+            return None
+        limite = self.layout.y_elfo - ALTURA_ELFO / 2 - 20  # 20 px acima da cabeça do elfo
+        return presente if presente.y + TAMANHO_PRESENTE / 2 >= limite else None
+
+    # --- Ações ---
+    def aplicar_acao(self, acao):
+        """Executa uma ação do jogador (ACAO_ESQUERDA, ACAO_DIREITA, ACAO_ESPACO ou ACAO_PROCESSAR)."""
+        if acao == ACAO_ESQUERDA:
+            self.elfo.move("left")
+        elif acao == ACAO_DIREITA:
+            self.elfo.move("right")
+        elif acao == ACAO_ESPACO:
+            if self.elfo.position_index == self.layout.indice_mesa:
+                # Tenta colocar um item no buffer (recurso compartilhado),
+                # operação controlada pelo monitor (mutex + condições) de 'GerenciadorMesa'.
+                if self.elfo.presentes_carregados > 0:
+                    viagem = self._viagens_carga[0] if self._viagens_carga else None
+                    if self.mecanicas.adicionar_presente_mesa(viagem):
+                        self.mesa.adicionar_item(self.rng.choice(TIPOS_PRESENTE))
+                        self.elfo.descarregar_presente()
+                        if viagem is not None:
+                            self._viagens_carga.popleft()
+                            self.latencias.entrega(viagem, self.tempo_ms)
+                            self._viagens_mesa.append(viagem)
+                        self.presentes_entregues += 1
+                        self.eventos.append(('entrega', None))
+                    else:
+                        self.entregas_recusadas += 1
+                        self.eventos.append(('mesa_cheia', None))
+            elif self.elfo.presentes_carregados < self.elfo.capacidade_carga:
+                presente = self.presente_coletavel()
+                if presente is not None:
+                    self.presentes.remover_mais_baixo(presente.esteira)
+                    self.elfo.carregar_presente()
+                    viagem = self._viagens.pop(presente.id)
+                    self.latencias.coleta(viagem, self.tempo_ms)
+                    self._viagens_carga.append(viagem)
+                    self.presentes_coletados += 1
+                    self.eventos.append(('coleta', presente))
+        elif acao == ACAO_PROCESSAR:
+            if self.elfo.position_index == self.layout.indice_mesa:
+                self.mesa.processar_presente(self.tempo_ms)
+
+    # --- Passo da simulação ---
+    def iniciar_frame(self):
+        """Renova a cota de presentes retirados da fila dos produtores (uma vez por frame)."""
+        self.cota_spawn = self.max_presentes_por_frame
+
+    def passo(self, acoes=(), dt_ms=None):
+        """
+        Avança a partida em um passo.
+        Args:
+            acoes (iterable): Ações do jogador neste passo, na ordem em que ocorreram.
+            dt_ms (float, optional): Duração do passo; usa 'self.dt_ms' se omitido.
+        Returns:
+            None enquanto a partida continua, ou 'VITORIA'/'DERROTA' quando ela termina.
+        """
+        if self.resultado is not None:
+            return self.resultado
+        self.tempo_ms += self.dt_ms if dt_ms is None else dt_ms
+        self.passos += 1
+        self.eventos = []
+        agora = self.tempo_ms
+
+        for acao in acoes:
+            self.aplicar_acao(acao)
+
+        if self.agendador_simulado is not None:
+            self.agendador_simulado.avancar(agora / 1000.0)  # Produtores cujo intervalo venceu produzem agora
+        self._spawnar_presentes()
+        self.mesa.atualizar(agora)
+        self._mover_presentes(self.dt_ms if dt_ms is None else dt_ms)
+
+        # ANALOGIA: Verifica se o processamento no buffer (Mesa) terminou.
+        if self.mesa.verificar_processamento_concluido(agora):
+            # Simula o consumo final do item, liberando uma vaga na mesa e pontuando.
+            if self.mecanicas.elfo_tentar_coletar(self.elfo):
+                self.mesa.ultimo_processamento = agora
+            inicio_processamento = self.mesa.tempo_inicio_processamento
+            if self.mesa.finalizar_processamento():
+                metrica_processamento.observar((agora - inicio_processamento) / 1000.0)
+                if self._viagens_mesa:
+                    self.latencias.processado(self._viagens_mesa.popleft(), inicio_processamento, agora)
+                self.eventos.append(('processado', None))
+
+        if not self.marco_intermediario_atingido and self.mecanicas.pontuacao >= PONTUACAO_AUDIO_INTERMEDIARIO:
+            self.marco_intermediario_atingido = True
+            self.eventos.append(('marco_intermediario', None))
+
+        # --- Condições de Fim de Jogo ---
+        if not self.verificar_fim:
+            return None
+        if self.mecanicas.pontuacao >= PONTUACAO_VITORIA:
+            self.resultado = 'VITORIA'
+        elif self.mecanicas.verificar_derrota():
+            self.resultado = 'DERROTA'
+        return self.resultado
+
+    def _spawnar_presentes(self):
+        """
+        Cria um presente para cada item retirado da fila dos produtores, na
+        esteira de origem, respeitando a cota do frame e o limite na tela.
+        O que não couber continua na fila (e a política dela decide o excesso).
+        """
+        vagas = self.cota_spawn
+        if self.limite_presentes is not None:
+            vagas = min(vagas, self.limite_presentes - len(self.presentes))
+        if vagas <= 0:
+            return
+        lote = self.mecanicas.processar_novos_presentes(vagas)
+        self.cota_spawn -= len(lote)
+        velocidade = self.mecanicas.escalonador.velocidade_queda_atual
+        agora_agendador = self.mecanicas.agendador.instante()   # Relógio em que os produtores carimbaram os presentes
+        for presente_data in lote:
+            esteira = (presente_data['esteira_origem'] - 1) % self.layout.num_esteiras  # IDs das esteiras começam em 1
+            presente = self.presentes.criar(self._proximo_id, esteira, presente_data['tipo'],
+                                            self.layout.centros_esteiras[esteira], self.layout.topo_esteiras + 30,
+                                            velocidade)
+            self._viagens[presente.id] = self.latencias.spawn(presente_data.get('produzido_em', agora_agendador),
+                                                              agora_agendador, self.tempo_ms)
+            self._proximo_id += 1
+            self.presentes_gerados += 1
+            self.eventos.append(('spawn', presente))
+
+    def _mover_presentes(self, dt_ms):
+        """Faz os presentes caírem 'dt_ms' e contabiliza os que passaram do chão."""
+        limite = self.layout.altura + TAMANHO_PRESENTE / 2  # O topo do presente passou da borda inferior
+        caidos = self.presentes.mover(dt_ms / 1000.0, limite)
+        if caidos:  # Contabilizados de uma vez: com milhares de presentes, vários caem no mesmo passo
+            self.mecanicas.presentes_perdidos += len(caidos)
+            metrica_perdidos.incrementar(len(caidos), motivo="queda")
+            log_queda.info("%d presente(s) caíram no chão! Total de perdidos: %d",
+                           len(caidos), self.mecanicas.presentes_perdidos)
+            self.eventos.extend(('queda', presente) for presente in caidos)
+            for presente in caidos:
+                self._viagens.pop(presente.id, None)
+
+    # --- Consulta de estado ---
+    def estado(self):
+        """Retorna um retrato (dict) do estado atual da partida."""
+        return {
+            'passo': self.passos,
+            'tempo_ms': self.tempo_ms,
+            'pontuacao': self.mecanicas.pontuacao,
+            'presentes_perdidos': self.mecanicas.presentes_perdidos,
+            'nivel_dificuldade': self.mecanicas.escalonador.nivel_dificuldade,
+            'posicao_elfo': self.elfo.position_index,
+            'carga_elfo': self.elfo.presentes_carregados,
+            'presentes_na_mesa': len(self.mesa.itens),
+            'presentes_caindo': len(self.presentes),
+            'eventos': [nome for nome, _ in self.eventos],
+            'resultado': self.resultado
+        }
+
+    def get_estatisticas(self):
+        """Retorna as estatísticas finais (ou parciais) da partida."""
+        estatisticas = self.mecanicas.get_estatisticas()
+        estatisticas.update({
+            'resultado': self.resultado,
+            'tempo_ms': self.tempo_ms,
+            'passos': self.passos,
+            'presentes_gerados': self.presentes_gerados,
+            'presentes_coletados': self.presentes_coletados,
+            'presentes_entregues': self.presentes_entregues,
+            'entregas_recusadas': self.entregas_recusadas,
+            'presentes_processados': self.mesa.presentes_processados_total,
+            'latencias': self.latencias.resumo()
+        })
+        return estatisticas
+
+    def rodar(self, politica=None, duracao_max_ms=10 * 60 * 1000, registrar_estados=False):
+        """
+        Executa a partida até o fim (ou até 'duracao_max_ms' de tempo simulado),
+        sem nenhuma espera: roda tão rápido quanto a CPU permitir.
+        Args:
+            politica (callable, optional): Função politica(simulacao) que devolve as ações do passo
+                (uma ação, uma lista de ações ou None).
+            duracao_max_ms (float): Tempo simulado máximo; a partida termina com resultado None se atingido.
+            registrar_estados (bool): Se True, inclui em 'estados' o retrato de cada passo.
+        Returns:
+            dict: Estatísticas finais (ver 'get_estatisticas'), mais 'estados' se solicitado.
+        """
+        estados = []
+        try:
+            while self.resultado is None and self.tempo_ms < duracao_max_ms:
+                acoes = politica(self) if politica is not None else None
+                if acoes is None:
+                    acoes = ()
+                elif isinstance(acoes, str):
+                    acoes = (acoes,)
+                self.iniciar_frame()    # Sem janela, cada passo é um frame
+                self.passo(acoes)
+                if registrar_estados:
+                    estados.append(self.estado())
+            estatisticas = self.get_estatisticas()
+        finally:
+            if self.agendador_simulado is not None: # Mecânicas iniciadas aqui: parar também tira o coletor de métricas
+                self.mecanicas.parar_sistema()
+        if registrar_estados:
+            estatisticas['estados'] = estados
+        return estatisticas
+
+
+class PoliticaGulosa:
+    """
+    Política automática simples, usada para simular partidas em lote:
+    entrega quando está na mesa com carga e há vaga, coleta quando há um
+    presente ao alcance e, caso contrário, anda em direção ao presente mais
+    próximo do chão (ou à mesa, se estiver carregando).
+    """
+    def __init__(self, tempo_reacao_ms=150):
+        self.tempo_reacao_ms = tempo_reacao_ms  # Intervalo mínimo entre duas ações, como um jogador humano
+        self.ultima_acao = float('-inf')
+
+    def __call__(self, simulacao):
+        if simulacao.tempo_ms - self.ultima_acao < self.tempo_reacao_ms:
+            return None
+        acao = self._decidir(simulacao)
+        if acao is not None:
+            self.ultima_acao = simulacao.tempo_ms
+        return acao
+
+    def _decidir(self, simulacao):
+        elfo = simulacao.elfo
+        indice_mesa = simulacao.layout.indice_mesa
+        mesa_tem_vaga = len(simulacao.mesa.itens) < simulacao.mesa.capacidade
+        if elfo.position_index == indice_mesa and elfo.presentes_carregados > 0 and mesa_tem_vaga:
+            return ACAO_ESPACO
+        if elfo.presentes_carregados < elfo.capacidade_carga:
+            if simulacao.presente_coletavel() is not None:
+                return ACAO_ESPACO
+            # O presente mais perto do chão é o primeiro de alguma faixa
+            mais_baixos = [p for p in map(simulacao.presentes.mais_baixo, range(indice_mesa)) if p is not None]
+            if mais_baixos:
+                alvo = max(mais_baixos, key=lambda p: p.y).esteira
+                return self._andar_para(elfo.position_index, alvo)
+        if elfo.presentes_carregados > 0 and mesa_tem_vaga:
+            return self._andar_para(elfo.position_index, indice_mesa)
+        return None
+
+    @staticmethod
+    def _andar_para(origem, destino):
+        if destino > origem:
+            return ACAO_DIREITA
+        if destino < origem:
+            return ACAO_ESQUERDA
+        return None
+
+
+def simular_partidas(num_partidas, criar_politica=PoliticaGulosa, semente=None, **kwargs):
+    """
+    Simula várias partidas sem janela e retorna a lista de estatísticas finais.
+    Args:
+        num_partidas (int): Quantas partidas simular.
+        criar_politica (callable): Fábrica que devolve uma política nova para cada partida.
+        semente (int, optional): Semente base; a partida i usa semente + i.
+        **kwargs: Repassados para 'SimulacaoPartida.rodar'.
+    """
+    resultados = []
+    for i in range(num_partidas):
+        simulacao = SimulacaoPartida(semente=None if semente is None else semente + i)
+        resultados.append(simulacao.rodar(criar_politica(), **kwargs))
+    return resultados
+
+
+# Execução standalone: simula partidas em lote e mostra um resumo
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Simula partidas da Oficina do Noel sem janela.")
+    parser.add_argument("--partidas", type=int, default=100, help="Quantidade de partidas a simular")
+    parser.add_argument("--semente", type=int, default=None, help="Semente base do gerador aleatório")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    resultados = simular_partidas(args.partidas, semente=args.semente)
+    duracao = time.perf_counter() - inicio
+
+    vitorias = sum(1 for r in resultados if r['resultado'] == 'VITORIA')
+    derrotas = sum(1 for r in resultados if r['resultado'] == 'DERROTA')
+    tempo_medio = sum(r['tempo_ms'] for r in resultados) / max(1, len(resultados)) / 1000.0
+    print("=" * 30)
+    print(f"Partidas: {len(resultados)} em {duracao:.2f}s de CPU")
+    print(f"Vitórias: {vitorias} | Derrotas: {derrotas} | Sem resultado: {len(resultados) - vitorias - derrotas}")
+    print(f"Duração média (tempo simulado): {tempo_medio:.1f}s")
+    print("Latência por etapa (média entre as partidas):")
+    for etapa in resultados[0]['latencias'] if resultados else ():
+        por_partida = [r['latencias'][etapa] for r in resultados]
+        p50 = sum(l['p50_ms'] for l in por_partida) / len(por_partida) / 1000.0
+        p95 = sum(l['p95_ms'] for l in por_partida) / len(por_partida) / 1000.0
+        print(f"  {etapa:<14} p50={p50:6.2f}s p95={p95:6.2f}s")
+    print("=" * 30)
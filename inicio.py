@@ -0,0 +1,76 @@
+#   inicio.py
+"""
+Relatório do tempo de inicialização do jogo (opção --startup-report).
+Cada etapa (importação de módulos, inicialização dos subsistemas do Pygame,
+construção de telas, carregamento de sons) é medida com o relógio de alta
+resolução. O relógio começa quando este módulo é importado, então ele deve
+ser o primeiro import do ponto de entrada.
+As medições são sempre registradas (custam duas leituras de relógio cada);
+o relatório só é impresso com a opção ligada. As telas construídas sob
+demanda depois do primeiro frame do menu são impressas na hora, uma linha cada.
+"""
+import time # Importa time para o relógio de alta resolução (perf_counter)
+from contextlib import contextmanager   # Importa contextmanager para o 'with relatorio_inicio.medir(...)'
+
+INICIO = time.perf_counter()    # Instante em que o ponto de entrada começou a importar o jogo
+
+
+class RelatorioInicio:
+    """Etapas da inicialização, em ordem, com a duração (ms) de cada uma."""
+
+    def __init__(self, inicio=INICIO):
+        self.inicio = inicio
+        self.etapas = []    # (categoria, descrição, duração em ms)
+        self.ativo = False  # Imprime o relatório (--startup-report)
+        self.primeiro_frame_ms = None   # Tempo até o primeiro frame do menu, desde 'inicio'
+        self._ultima_marca = inicio
+
+    def marcar(self, categoria, descricao):
+        """Registra o tempo desde a marca anterior (usado entre grupos de imports)."""
+        agora = time.perf_counter()
+        self.etapas.append((categoria, descricao, (agora - self._ultima_marca) * 1000.0))
+        self._ultima_marca = agora
+
+    @contextmanager
+    def medir(self, categoria, descricao):
+        """Mede o bloco 'with'. Depois do primeiro frame, a etapa é impressa na hora (se ativo)."""
+        comeco = time.perf_counter()
+        try:
+            yield
+        finally:
+            fim = time.perf_counter()
+            ms = (fim - comeco) * 1000.0
+            self.etapas.append((categoria, descricao, ms))
+            self._ultima_marca = fim
+            if self.ativo and self.primeiro_frame_ms is not None:
+                print(f"[inicio] {categoria}: {descricao} {ms:.1f} ms (sob demanda)")
+
+    def primeiro_frame(self):
+        """Marca o primeiro frame do menu na tela e imprime o relatório (se ativo)."""
+        if self.primeiro_frame_ms is not None:
+            return
+        self.primeiro_frame_ms = (time.perf_counter() - self.inicio) * 1000.0
+        if self.ativo:
+            self.imprimir()
+
+    def totais_por_categoria(self):
+        totais = {}
+        for categoria, _, ms in self.etapas:
+            totais[categoria] = totais.get(categoria, 0.0) + ms
+        return totais
+
+    def imprimir(self):
+        """Mostra uma linha por etapa, os totais por categoria e o tempo até o primeiro frame."""
+        print("=" * 64)
+        print(f"{'categoria':<12} {'etapa':<38} {'ms':>10}")
+        for categoria, descricao, ms in self.etapas:
+            print(f"{categoria:<12} {descricao:<38} {ms:>10.1f}")
+        print("-" * 64)
+        for categoria, ms in self.totais_por_categoria().items():
+            print(f"{categoria:<12} {'(total)':<38} {ms:>10.1f}")
+        print(f"{'':<12} {'até o primeiro frame do menu':<38} {self.primeiro_frame_ms:>10.1f}")
+        print("=" * 64)
+
+
+# Instância única, compartilhada por todo o processo
+relatorio_inicio = RelatorioInicio()
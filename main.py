@@ -2,74 +2,155 @@
 # Ponto de entrada da aplicação. Gerencia a máquina de estados principal do jogo,
 # controlando o fluxo entre Menu, Telas de Carregamento, Jogo e Telas de Fim de Jogo.
 # Também é responsável por criar e destruir a instância de 'GameMechanics'.
+# Antes do primeiro frame do menu só é feito o que o menu usa: as demais telas
+# e os módulos da partida são criados na primeira entrada no estado que os usa.
+# Os áudios passam pelo gerenciador de áudio (canais por categoria e streaming). Com --startup-report, o tempo de cada etapa é impresso no terminal.
 
+from .inicio import relatorio_inicio    # Primeiro import: o relógio do relatório começa aqui
+import argparse # Importa argparse para as opções de linha de comando
+import os   # Importa os para montar o nome do arquivo de cada partida gravada
 import pygame   # Importa a biblioteca Pygame para manipulação de gráficos, som e eventos
-import os   # Importa a biblioteca os para manipulação de caminhos de arquivos e diretórios
+relatorio_inicio.marcar("importação", "pygame")
 
-from .settings import (LARGURA_TELA, ALTURA_TELA, FPS, PASTA_AUDIO, AUDIO_START,
+from .settings import (LARGURA_TELA, ALTURA_TELA, FPS, AUDIO_START,
                        AUDIO_LOADING_1, AUDIO_LOADING_2, AUDIO_LOADING_3, AUDIO_LOADING_4,
-                       AUDIO_EXPLICACAO_JOGO, AUDIO_MUSICA_FUNDO,
-                       FONTE_BOLD_PATH, FONTE_PATH, BRANCO, VERMELHO)
+                       AUDIO_EXPLICACAO_JOGO, AUDIO_MUSICA_FUNDO, AUDIO_VITORIA,
+                       FONTE_BOLD_PATH, FONTE_PATH, CAMINHO_README, BRANCO, VERMELHO)
+from .recursos import recursos    # Cache compartilhado de imagens, fontes e sons
+from .audio import audio, MUSICA, VOZ   # Canais por categoria e streaming das faixas longas
+relatorio_inicio.marcar("importação", "settings, recursos, registro e áudio")
 from .ui.menu import MainMenu
 from .ui.screens import LoadingScreenToGame, EndScreen, GameBackground, ReadmeScreen
-from .game.main_game import game_loop   # Importa a função game_loop do módulo main_game, que contém a lógica principal do jogo
-from .game.mechanics import GameMechanics
-
-def main(): 
-    pygame.init() # Inicializa todos os módulos do Pygame
-    pygame.mixer.init() # Inicializa o mixer de som do Pygame
-    screen = pygame.display.set_mode((LARGURA_TELA, ALTURA_TELA))   # Cria a janela do jogo com as dimensões especificadas
-    pygame.display.set_caption("Oficina do Noel")   # Define o título da janela do jogo
+relatorio_inicio.marcar("importação", "ui")
+from .game.ciclo_vida import ciclo_vida    # Parada das threads de segundo plano e verificação de vazamentos
+from .metricas import exportacao as exportacao_metricas # Endpoint Prometheus e JSONL (se configurados)
+relatorio_inicio.marcar("importação", "ciclo_vida e metricas")
+
+
+def _importar_modulos_partida():
+    """Mecânicas, preparação da cena e loop da partida: importados só quando a primeira partida começa."""
+    from .game.mechanics import GameMechanics
+    from .game.cena import PreparacaoCena   # Monta a cena da partida em segundo plano durante o carregamento
+    from .game.main_game import game_loop   # Importa a função game_loop do módulo main_game, que contém a lógica principal do jogo
+    return GameMechanics, PreparacaoCena, game_loop
+
+
+def caminho_gravacao(caminho, indice):
+    """
+    Arquivo da partida 'indice' (0, 1, ...) da sessão com --gravar: a primeira
+    usa 'caminho' e as seguintes ganham um número ('partida_2.onrp', 'partida_3.onrp', ...).
+    """
+    if caminho is None or indice == 0:
+        return caminho
+    raiz, extensao = os.path.splitext(caminho)
+    return f"{raiz}_{indice + 1}{extensao}"
+
+
+def reproduzir_na_janela(screen, clock, caminho):
+    """
+    Reproduz na janela, no ritmo normal, uma partida gravada com --gravar.
+    Returns:
+        bool: True se a reprodução foi idêntica à gravação.
+    """
+    from .game.reproducao import Gravacao, ModoDeterministico
+    _, _, game_loop = _importar_modulos_partida()
+    modo = ModoDeterministico(reproducao=Gravacao.carregar(caminho))
+    simulacao = modo.criar_simulacao()  # Mecânicas próprias, com os produtores no agendador simulado
+    try:
+        game_loop(screen, clock, simulacao.mecanicas, simulacao=simulacao, modo_deterministico=modo)
+    finally:
+        simulacao.mecanicas.parar_sistema()
+    confere = modo.finalizar(simulacao)
+    print(f"Reprodução de {caminho}: {'idêntica à gravação' if confere else 'DIVERGIU da gravação'}")
+    return confere
+
+
+def iniciar_pygame():
+    """
+    Inicializa só os subsistemas usados pelo jogo (vídeo e eventos, fontes e
+    áudio), sem o pygame.init(), que também liga joystick e freetype.
+    """
+    with relatorio_inicio.medir("pygame", "display.init"):
+        pygame.display.init()
+    with relatorio_inicio.medir("pygame", "font.init"):
+        pygame.font.init()
+    with relatorio_inicio.medir("pygame", "mixer.init"):
+        pygame.mixer.init() # Inicializa o mixer de som do Pygame
+        audio.iniciar() # Reserva os canais de cada categoria de áudio
+
+
+def main(argv=None): 
+    parser = argparse.ArgumentParser(description="Oficina do Noel")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="Mostra o tempo de cada etapa da inicialização até o primeiro frame do menu")
+    parser.add_argument("--semente", type=int, default=None,
+                        help="Joga com o relógio por passos; a N-ésima partida da sessão usa a semente + N - 1")
+    parser.add_argument("--gravar", metavar="ARQUIVO", default=None,
+                        help="Grava a semente e as ações de cada partida (implica o relógio por passos): a primeira "
+                             "em ARQUIVO, as seguintes numeradas (ex.: partida_2.onrp)")
+    parser.add_argument("--reproduzir", metavar="ARQUIVO", default=None,
+                        help="Reproduz na janela uma partida gravada com --gravar e sai")
+    args = parser.parse_args(argv)
+    deterministico = args.semente is not None or args.gravar is not None   # Partidas pelo ModoDeterministico
+    relatorio_inicio.ativo = args.startup_report
+
+    iniciar_pygame()
+    with relatorio_inicio.medir("pygame", "janela"):
+        screen = pygame.display.set_mode((LARGURA_TELA, ALTURA_TELA))   # Cria a janela do jogo com as dimensões especificadas
+        pygame.display.set_caption("Oficina do Noel")   # Define o título da janela do jogo
     clock = pygame.time.Clock() # Cria um objeto Clock para controlar a taxa de quadros do jogo
+    clock.tick()    # O primeiro tick também liga o temporizador do SDL (get_ticks devolve 0 antes disso)
+    ciclo_vida.marcar_linha_de_base()   # Threads vivas antes da primeira partida
+    with relatorio_inicio.medir("métricas", "exportação"):
+        exportacao_metricas.iniciar()   # METRICAS_PORTA / METRICAS_ARQUIVO_JSONL em settings.py
+
+    if args.reproduzir is not None: # Só a reprodução: sem menu nem carregamento
+        reproduzir_na_janela(screen, clock, args.reproduzir)
+        ciclo_vida.parar()
+        exportacao_metricas.parar()
+        pygame.quit()
+        return
 
     # --- Instâncias das Telas ---
-    menu = MainMenu()
-    loading_screen = LoadingScreenToGame(
-        images=["loading1.png", "loading2.png", "loading2.png", "loading3.png"],
-        durations=[13.0, 18.0, 39.8, 88.9],
-        # durations = [0.3,0.3,0.3,0.3],
-        audio_path=[AUDIO_LOADING_1, AUDIO_LOADING_2, AUDIO_LOADING_3, AUDIO_LOADING_4],
-        initial_audio_delay=1.5
-    )
-    end_screen = EndScreen()    # Cria uma instância da tela de fim de jogo
-    game_background = GameBackground()  # Cria uma instância do fundo do jogo
-    readme_screen = ReadmeScreen("README.md")
-    # --- Carregamento de Recursos ---  
-    font_fim_titulo = pygame.font.Font(FONTE_BOLD_PATH, 60)     # Fonte para o título da tela de fim de jogo
-    font_fim_instrucao = pygame.font.Font(FONTE_PATH, 28)   # Fonte para as instruções da tela de fim de jogo
-    
-    path_explicacao = os.path.join(PASTA_AUDIO, AUDIO_EXPLICACAO_JOGO)  # Caminho para o áudio de explicação do jogo    
-    sound_explicacao = None # Inicializa a variável de som de explicação como None
-    if os.path.exists(path_explicacao): # Verifica se o arquivo de áudio de explicação existe
-        sound_explicacao = pygame.mixer.Sound(path_explicacao)  # Carrega o áudio de explicação do jogo
-    
-    sound_vitoria = None  # Inicializa a variável de som de vitória como None
-    try:
-        from .settings import AUDIO_VITORIA # Importa o nome do arquivo de áudio de vitória do módulo settings
-        path_vitoria = os.path.join(PASTA_AUDIO, AUDIO_VITORIA) # Caminho para o áudio de vitória
-        if os.path.exists(path_vitoria):    # Verifica se o arquivo de áudio de vitória existe
-            sound_vitoria = pygame.mixer.Sound(path_vitoria)    # Carrega o áudio de vitória
-    except (ImportError, pygame.error) as e:    # Captura erros de importação ou carregamento do áudio
-        print(f"AVISO: Não foi possível carregar o áudio de vitória: {e}")  
-
-
-    path_musica_fundo = os.path.join(PASTA_AUDIO, AUDIO_MUSICA_FUNDO)
-    if os.path.exists(path_musica_fundo):   # Verifica se o arquivo de música de fundo existe
-        pygame.mixer.music.load(path_musica_fundo)  # Carrega a música de fundo
-        pygame.mixer.music.play(-1) # Reproduz a música de fundo em loop
-        pygame.mixer.music.set_volume(0.25) # Define o volume da música de fundo
-    else:
-        print(f"AVISO: Música de fundo não encontrada em {path_musica_fundo}")
-
-    path_intro_audio = os.path.join(PASTA_AUDIO, AUDIO_START)
-    if os.path.exists(path_intro_audio):
-        intro_sound = pygame.mixer.Sound(path_intro_audio)
-        intro_sound.play() # Toca uma única vez
-    else:
-        print(f"AVISO: Áudio de introdução não encontrado em {path_intro_audio}")
+    with relatorio_inicio.medir("tela", "menu"):
+        menu = MainMenu()
+    # Demais telas e módulos: construídos na primeira vez em que são usados
+    fabricas = {
+        "carregamento": ("tela", lambda: LoadingScreenToGame(
+            images=["loading1.png", "loading2.png", "loading2.png", "loading3.png"],
+            durations=[13.0, 18.0, 39.8, 88.9],
+            # durations = [0.3,0.3,0.3,0.3],
+            audio_path=[AUDIO_LOADING_1, AUDIO_LOADING_2, AUDIO_LOADING_3, AUDIO_LOADING_4],
+            initial_audio_delay=1.5
+        )),
+        "fim de jogo": ("tela", EndScreen),
+        "fundo do jogo": ("tela", GameBackground),
+        "readme": ("tela", lambda: ReadmeScreen(CAMINHO_README)),
+        "fonte do título": ("fonte", lambda: recursos.fonte(FONTE_BOLD_PATH, 60)),  # Título da tela de fim de jogo
+        "fonte das instruções": ("fonte", lambda: recursos.fonte(FONTE_PATH, 28)),  # Instruções e aviso de mudo
+        "módulos da partida": ("importação", _importar_modulos_partida),
+    }
+    construidos = {}
+
+    def sob_demanda(nome):
+        """Retorna o objeto 'nome', construindo-o (e medindo a construção) na primeira chamada."""
+        if nome not in construidos:
+            categoria, fabrica = fabricas[nome]
+            with relatorio_inicio.medir(categoria, nome):
+                construidos[nome] = fabrica()
+        return construidos[nome]
+
+    with relatorio_inicio.medir("som", "música de fundo"):
+        audio.volume_musica = 0.25  # Define o volume da música de fundo
+        audio.tocar(AUDIO_MUSICA_FUNDO, MUSICA, loops=-1)   # Reproduz a música de fundo em loop (aviso se não existir)
+
+    with relatorio_inicio.medir("som", "áudio de abertura"):
+        audio.tocar(AUDIO_START, VOZ)   # Toca uma única vez
     # --- Máquina de Estados ---    
     game_state = "MENU" # Estado inicial do jogo, começa no menu principal
     game_mechanics_instance = None  # Inicializa a instância de GameMechanics como None, será criada quando o jogo for iniciado
+    preparacao_cena = None  # Cena da próxima partida, montada enquanto as telas de carregamento são exibidas
+    partidas_deterministicas = 0    # Partidas já jogadas no relógio por passos (numeram semente e gravação)
     running = True  # Variável de controle do loop principal do jogo
     is_muted = False    # Variável para controlar o estado de mudo do jogo
     audio_vitoria_tocado = False  # Flag para indicar se o áudio de vitória foi tocado
@@ -84,13 +165,11 @@ def main():
             if event.type == pygame.KEYDOWN:    
                 if event.key == pygame.K_m: # Alterna o estado de mudo do jogo
                     is_muted = not is_muted
-                    if is_muted: pygame.mixer.music.pause()
-                    else: pygame.mixer.music.unpause()
+                    audio.silenciar_musica(is_muted)
                 elif event.key == pygame.K_v:   # Aumenta o volume da música de fundo
-                    current_volume = pygame.mixer.music.get_volume()
-                    new_volume = current_volume + 0.25
+                    new_volume = audio.volume_musica + 0.25
                     if new_volume > 1.0: new_volume = 0.25
-                    pygame.mixer.music.set_volume(new_volume)
+                    audio.volume_musica = new_volume
 
             if game_state == "MENU":
                 if event.type == pygame.KEYDOWN:    
@@ -101,44 +180,49 @@ def main():
                     elif event.key == pygame.K_RETURN:
                         selected_text = menu.options[menu.selected_option]
                         if selected_text == "Iniciar Jogo":
-                            if intro_sound and intro_sound.get_num_channels() > 0:
-                                intro_sound.stop()
-                                
+                            audio.parar(VOZ)    # Interrompe o áudio de abertura, se ainda estiver tocando
+
+                            if game_mechanics_instance:  # Garante que a partida anterior não deixou threads
+                                game_mechanics_instance.parar_sistema()
+                            GameMechanics, PreparacaoCena, _ = sob_demanda("módulos da partida")
                             game_mechanics_instance = GameMechanics()
                             game_state = "LOADING"
-                            loading_screen.start()
+                            sob_demanda("carregamento").start()
+                            preparacao_cena = PreparacaoCena(screen).iniciar()  # Depois do 1º slide, que já está na fila
                         elif selected_text == "Readme":
                             game_state = "README"
                         elif selected_text == "Sair":
                             running = False
 
             elif game_state == "README":
-                readme_screen.handle_event(event) # Passa eventos para a tela de readme gerenciar a rolagem
+                sob_demanda("readme").handle_event(event) # Passa eventos para a tela de readme gerenciar a rolagem
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     game_state = "MENU" # ESC para voltar ao menu
 
             elif game_state == "LOADING":
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
                     print("Pulando carregamento...")
-                    loading_screen.finished = True
-                    pygame.mixer.stop() 
+                    sob_demanda("carregamento").finish() # Para o áudio e libera os slides (inclusive os pré-carregados)
             
             elif game_state == "EXPLAINING":
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
                     print("Pulando explicação...")
-                    if sound_explicacao:
-                        sound_explicacao.stop()
+                    audio.parar(VOZ)
 
             elif game_state in ["GAME_OVER_VITORIA", "GAME_OVER_DERROTA"]:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_RETURN:
+                        game_mechanics_instance.parar_sistema()  # Não faz nada se já foi parada
+                        GameMechanics, PreparacaoCena, _ = sob_demanda("módulos da partida")
                         game_mechanics_instance = GameMechanics()
                         game_state = "LOADING"
-                        loading_screen.start()
+                        sob_demanda("carregamento").start()
+                        preparacao_cena = PreparacaoCena(screen).iniciar()
                     elif event.key == pygame.K_ESCAPE:
                         game_state = "MENU"
 
         # --- Lógica de Atualização e Renderização por Estado ---
+        audio.atualizar()   # Devolve o stream à música quando uma voz longa termina
         screen.fill((0, 0, 0))
 
         if game_state == "MENU":    # Desenha o menu principal
@@ -146,28 +230,47 @@ def main():
             menu.draw(screen)
 
         elif game_state == "README":
-            readme_screen.draw(screen)
+            sob_demanda("readme").draw(screen)
 
         elif game_state == "LOADING":   # Desenha a tela de carregamento
+            loading_screen = sob_demanda("carregamento")
             loading_screen.update()
             loading_screen.draw(screen)
             if loading_screen.finished:
                 game_state = "EXPLAINING"   # Muda para o estado de explicação após o carregamento
-                if sound_explicacao:
-                    sound_explicacao.play() # Reproduz o áudio de explicação do jogo
+                audio.tocar(AUDIO_EXPLICACAO_JOGO, VOZ) # Reproduz o áudio de explicação do jogo
 
         elif game_state == "EXPLAINING":    # Desenha a tela de explicação do jogo
-            game_background.draw(screen)
-            if not pygame.mixer.get_busy(): # Verifica se o áudio de explicação terminou
+            sob_demanda("fundo do jogo").draw(screen)
+            if preparacao_cena is not None and not preparacao_cena.pronta:  # Só aparece se a preparação atrasar
+                texto_preparo = sob_demanda("fonte das instruções").render(
+                    f"Preparando a oficina... {preparacao_cena.progresso():.0%}", True, BRANCO)
+                screen.blit(texto_preparo, texto_preparo.get_rect(center=(LARGURA_TELA/2, ALTURA_TELA - 40)))
+            if not audio.tocando(VOZ):  # Verifica se o áudio de explicação terminou (a música não conta)
                 game_state = "PLAYING"  # Muda para o estado de jogo após a explicação
-                if game_mechanics_instance:
+                if game_mechanics_instance and not deterministico:  # No modo determinístico, os produtores vão para o agendador simulado
                     game_mechanics_instance.iniciar_sistema()
 
         elif game_state == "PLAYING":   # Executa o loop principal do jogo
-            resultado = game_loop(screen, clock, game_mechanics_instance)
+            # Espera só o que ainda faltar da preparação (normalmente já terminou durante o carregamento)
+            cena = preparacao_cena.obter() if preparacao_cena is not None else None
+            preparacao_cena = None
+            _, _, game_loop = sob_demanda("módulos da partida")
+            modo = simulacao = None
+            if deterministico:  # Relógio por passos, aleatoriedade pela semente e gravação das ações
+                from .game.reproducao import ModoDeterministico
+                semente = args.semente + partidas_deterministicas if args.semente is not None else None
+                modo = ModoDeterministico(semente, caminho_gravacao(args.gravar, partidas_deterministicas))
+                partidas_deterministicas += 1
+                simulacao = modo.criar_simulacao(game_mechanics_instance, cena.layout if cena is not None else None)
+            resultado = game_loop(screen, clock, game_mechanics_instance, simulacao=simulacao, cena=cena,
+                                  modo_deterministico=modo)
+            if modo is not None:
+                modo.finalizar(simulacao)   # Salva a gravação (se a janela fechou, o game_loop já salvou)
             
             if game_mechanics_instance: # Se a instância de GameMechanics existir, para o sistema
                 game_mechanics_instance.parar_sistema() #   Para o sistema de mecânicas do jogo
+            ciclo_vida.verificar_linha_de_base(levantar=False)  # Nenhuma thread da partida pode sobreviver a ela (se sobrar, só vai para o registro)
             
             if resultado in ['VITORIA', 'DERROTA']: # Se o resultado do jogo for vitória ou derrota, muda o estado do jogo
                 game_state = "GAME_OVER_" + resultado   #   Concatena o resultado para definir o estado de fim de jogo
@@ -176,31 +279,34 @@ def main():
 
         elif game_state == "GAME_OVER_VITORIA": # Desenha a tela de fim de jogo para vitória
             # Toca o som de vitória uma única vez
-            if not audio_vitoria_tocado and sound_vitoria:
-                sound_vitoria.play()    
+            if not audio_vitoria_tocado:
+                audio.tocar(AUDIO_VITORIA, VOZ)
                 audio_vitoria_tocado = True  # Marca que o áudio de vitória foi tocado
 
-            end_screen.draw(screen)
-            texto_titulo = font_fim_titulo.render("VITÓRIA!", True, BRANCO)
-            texto_instrucao = font_fim_instrucao.render("Pressione ENTER para jogar de novo ou ESC para o menu", True, BRANCO)
+            sob_demanda("fim de jogo").draw(screen)
+            texto_titulo = sob_demanda("fonte do título").render("VITÓRIA!", True, BRANCO)
+            texto_instrucao = sob_demanda("fonte das instruções").render("Pressione ENTER para jogar de novo ou ESC para o menu", True, BRANCO)
             screen.blit(texto_titulo, texto_titulo.get_rect(center=(LARGURA_TELA/2, ALTURA_TELA/2 - 50)))
             screen.blit(texto_instrucao, texto_instrucao.get_rect(center=(LARGURA_TELA/2, ALTURA_TELA/2 + 50)))
 
         elif game_state == "GAME_OVER_DERROTA": # Desenha a tela de fim de jogo para derrota
-            end_screen.draw(screen)
-            texto_titulo = font_fim_titulo.render("FIM DE JOGO", True, VERMELHO)
-            texto_instrucao = font_fim_instrucao.render("Pressione ENTER para jogar de novo ou ESC para o menu", True, BRANCO)
+            sob_demanda("fim de jogo").draw(screen)
+            texto_titulo = sob_demanda("fonte do título").render("FIM DE JOGO", True, VERMELHO)
+            texto_instrucao = sob_demanda("fonte das instruções").render("Pressione ENTER para jogar de novo ou ESC para o menu", True, BRANCO)
             screen.blit(texto_titulo, texto_titulo.get_rect(center=(LARGURA_TELA/2, ALTURA_TELA/2 - 50)))
             screen.blit(texto_instrucao, texto_instrucao.get_rect(center=(LARGURA_TELA/2, ALTURA_TELA/2 + 50)))
 
         # Lógica de Mudo (desenha por cima de tudo)
         if is_muted:
-            texto_mudo = font_fim_instrucao.render("Mudo (M)", True, BRANCO)
+            texto_mudo = sob_demanda("fonte das instruções").render("Mudo (M)", True, BRANCO)
             pos_x = LARGURA_TELA - texto_mudo.get_width() - 10
             pos_y = ALTURA_TELA - texto_mudo.get_height() - 10
             screen.blit(texto_mudo, (pos_x, pos_y))
         pygame.display.flip()
+        relatorio_inicio.primeiro_frame()   # Só a primeira chamada conta (e imprime o relatório, se pedido)
         clock.tick(FPS)
     if game_mechanics_instance:
         game_mechanics_instance.parar_sistema()
+    ciclo_vida.parar()  # Qualquer thread ainda registrada recebe o sinal de parada
+    exportacao_metricas.parar() # Grava o último retrato JSONL e fecha a porta
     pygame.quit()
\ No newline at end of file
@@ -0,0 +1,362 @@
+#   metricas.py
+"""
+Métricas do jogo (contadores, medidores e histogramas) e sua exportação.
+Cada subsistema declara as métricas que atualiza, como faz com o registro:
+    PRODUZIDOS = metricas.contador("oficina_presentes_produzidos_total", "...", ("esteira",))
+    PRODUZIDOS.incrementar(esteira=1)
+Atualizar uma métrica custa um lock e uma soma, em qualquer thread. Valores
+que já existem no estado do jogo (pontuação, ocupação da mesa, profundidade
+da fila) não são copiados a cada mudança: um "coletor" os lê só na hora da
+exportação.
+Exportação (desligada por padrão, ver METRICAS_PORTA e METRICAS_ARQUIVO_JSONL):
+    - HTTP em 127.0.0.1, no formato de texto do Prometheus ('GET /metrics');
+    - um retrato em JSON por linha, acrescentado a um arquivo a cada
+      METRICAS_INTERVALO_JSONL_S por uma thread em segundo plano.
+"""
+import bisect   # Importa bisect para achar o intervalo (bucket) de um histograma
+import json # Importa json para os retratos em JSONL
+import math # Importa math para o limite infinito dos histogramas
+import threading    # Importa threading para os locks e as threads de exportação
+import time # Importa time para o horário dos retratos
+from .settings import METRICAS_PORTA, METRICAS_ARQUIVO_JSONL, METRICAS_INTERVALO_JSONL_S
+from .registro import obter_registro, METRICAS  # Registro não bloqueante
+from .game.ciclo_vida import ciclo_vida    # As threads de exportação são serviços do processo
+
+log_metricas = obter_registro(METRICAS)
+
+CONTADOR = "counter"
+MEDIDOR = "gauge"
+HISTOGRAMA = "histogram"
+
+PRAZO_LEITURA_HTTP_S = 5.0  # Espera máxima por dados de um cliente do endpoint antes de fechar a conexão
+
+
+def _escapar(valor):
+    """Escapa o valor de um rótulo no formato de texto do Prometheus."""
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _formatar_numero(valor):
+    if valor == math.inf:
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Metrica:
+    """
+    Uma família de métricas: um valor por combinação de rótulos.
+    Sem rótulos, há um único valor (chave vazia).
+    """
+    tipo = None
+
+    def __init__(self, nome, ajuda, rotulos=()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)   # Nomes dos rótulos, ex.: ("esteira",)
+        self._valores = {}  # tupla de valores dos rótulos -> valor
+        self._lock = threading.Lock()   # Atualizações podem vir de qualquer thread
+
+    def _chave(self, rotulos):
+        if len(rotulos) != len(self.rotulos):
+            raise ValueError(f"{self.nome} espera os rótulos {self.rotulos}, recebeu {tuple(rotulos)}")
+        return tuple(str(rotulos[nome]) for nome in self.rotulos)
+
+    def _texto_rotulos(self, chave, extra=()):
+        pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(self.rotulos, chave)]
+        pares.extend(f'{nome}="{_escapar(valor)}"' for nome, valor in extra)
+        return "{" + ",".join(pares) + "}" if pares else ""
+
+    def valores(self):
+        """Cópia dos valores atuais: chave dos rótulos -> valor."""
+        with self._lock:
+            return dict(self._valores)
+
+    def linhas_prometheus(self):
+        """Linhas das amostras no formato de texto do Prometheus."""
+        return [f"{self.nome}{self._texto_rotulos(chave)} {_formatar_numero(valor)}"
+                for chave, valor in sorted(self.valores().items())]
+
+    def retrato(self):
+        """Valor (sem rótulos) ou dict 'rótulo=valor,...' -> valor, para o JSONL."""
+        valores = self.valores()
+        if not self.rotulos:
+            return valores.get((), 0)
+        return {",".join(f"{n}={v}" for n, v in zip(self.rotulos, chave)): valor
+                for chave, valor in sorted(valores.items())}
+
+
+class Contador(Metrica):
+    """Valor que só aumenta (ex.: presentes produzidos)."""
+    tipo = CONTADOR
+
+    def incrementar(self, quantidade=1, **rotulos):
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + quantidade
+
+
+class Medidor(Metrica):
+    """Valor que sobe e desce (ex.: ocupação da mesa)."""
+    tipo = MEDIDOR
+
+    def definir(self, valor, **rotulos):
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = valor
+
+    def limpar(self):
+        """Remove todos os valores (ex.: as esteiras de uma partida que acabou)."""
+        with self._lock:
+            self._valores.clear()
+
+
+class Histograma(Metrica):
+    """
+    Distribuição de valores em intervalos fixos (buckets), como no Prometheus:
+    na exportação, cada bucket 'le' conta as observações <= seu limite.
+    """
+    tipo = HISTOGRAMA
+
+    def __init__(self, nome, ajuda, limites, rotulos=()):
+        super().__init__(nome, ajuda, rotulos)
+        self.limites = tuple(sorted(limites)) + (math.inf,)
+
+    def observar(self, valor, **rotulos):
+        chave = self._chave(rotulos)
+        i = bisect.bisect_left(self.limites, valor)
+        with self._lock:
+            contagens, soma = self._valores.get(chave) or ([0] * len(self.limites), 0.0)
+            contagens[i] += 1
+            self._valores[chave] = (contagens, soma + valor)
+
+    def valores(self):
+        with self._lock:
+            return {chave: (list(contagens), soma) for chave, (contagens, soma) in self._valores.items()}
+
+    def linhas_prometheus(self):
+        linhas = []
+        for chave, (contagens, soma) in sorted(self.valores().items()):
+            acumulado = 0
+            for limite, contagem in zip(self.limites, contagens):
+                acumulado += contagem
+                linhas.append(f"{self.nome}_bucket{self._texto_rotulos(chave, (('le', _formatar_numero(limite)),))} "
+                              f"{acumulado}")
+            linhas.append(f"{self.nome}_sum{self._texto_rotulos(chave)} {_formatar_numero(soma)}")
+            linhas.append(f"{self.nome}_count{self._texto_rotulos(chave)} {acumulado}")
+        return linhas
+
+    def retrato(self):
+        retratos = {}
+        for chave, (contagens, soma) in sorted(self.valores().items()):
+            retratos[",".join(f"{n}={v}" for n, v in zip(self.rotulos, chave))] = {
+                'buckets': {_formatar_numero(limite): contagem for limite, contagem in zip(self.limites, contagens)},
+                'soma': soma,
+                'contagem': sum(contagens)
+            }
+        return retratos.get("", {'buckets': {}, 'soma': 0.0, 'contagem': 0}) if not self.rotulos else retratos
+
+
+class RegistroMetricas:
+    """Todas as métricas do processo e os coletores chamados antes de cada exportação."""
+
+    def __init__(self):
+        self._metricas = {} # nome -> Metrica (em ordem de criação)
+        self._coletores = {}    # nome -> função sem argumentos que atualiza medidores
+        self._lock = threading.Lock()
+
+    def _obter(self, classe, nome, *args):
+        with self._lock:
+            metrica = self._metricas.get(nome)
+            if metrica is None:
+                metrica = self._metricas[nome] = classe(nome, *args)
+            elif not isinstance(metrica, classe):
+                raise ValueError(f"A métrica {nome} já existe com outro tipo")
+            return metrica
+
+    def contador(self, nome, ajuda, rotulos=()):
+        """Contador 'nome' (criado na primeira chamada)."""
+        return self._obter(Contador, nome, ajuda, rotulos)
+
+    def medidor(self, nome, ajuda, rotulos=()):
+        """Medidor 'nome' (criado na primeira chamada)."""
+        return self._obter(Medidor, nome, ajuda, rotulos)
+
+    def histograma(self, nome, ajuda, limites, rotulos=()):
+        """Histograma 'nome' com os limites de bucket 'limites' (criado na primeira chamada)."""
+        return self._obter(Histograma, nome, ajuda, limites, rotulos)
+
+    def definir_coletor(self, nome, coletor):
+        """
+        Registra (ou troca, ou remove com None) o coletor 'nome'. Um coletor
+        lê o estado do jogo e atualiza medidores; é chamado antes de cada exportação.
+        """
+        with self._lock:
+            if coletor is None:
+                self._coletores.pop(nome, None)
+            else:
+                self._coletores[nome] = coletor
+
+    def coletar(self):
+        """Chama os coletores (um coletor com erro não impede os outros)."""
+        with self._lock:
+            coletores = list(self._coletores.values())
+        for coletor in coletores:
+            try:
+                coletor()
+            except Exception as e:
+                log_metricas.erro("Coletor de métricas falhou: %s", e)
+
+    def texto_prometheus(self):
+        """Todas as métricas no formato de texto do Prometheus (versão 0.0.4)."""
+        self.coletar()
+        with self._lock:
+            metricas = list(self._metricas.values())
+        linhas = []
+        for metrica in metricas:
+            linhas.append(f"# HELP {metrica.nome} {metrica.ajuda}")
+            linhas.append(f"# TYPE {metrica.nome} {metrica.tipo}")
+            linhas.extend(metrica.linhas_prometheus())
+        return "\n".join(linhas) + "\n"
+
+    def retrato(self):
+        """Retrato (dict) de todas as métricas, para o JSONL."""
+        self.coletar()
+        with self._lock:
+            metricas = list(self._metricas.values())
+        return {'tempo': time.time(), 'metricas': {m.nome: m.retrato() for m in metricas}}
+
+
+def _classe_tratador(registro):
+    """
+    Cria o tratador HTTP que responde 'GET /metrics' com o texto do Prometheus.
+    O http.server só é importado aqui: sem METRICAS_PORTA, o jogo não paga a importação.
+    """
+    from http.server import BaseHTTPRequestHandler # Servidor HTTP da biblioteca padrão
+
+    class TratadorMetricas(BaseHTTPRequestHandler):
+        timeout = PRAZO_LEITURA_HTTP_S  # Um cliente parado não prende a thread do tratador para sempre
+
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            corpo = registro.texto_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, formato, *args):
+            log_metricas.debug("HTTP " + formato, *args)    # Sem escrever no terminal a cada coleta
+
+    return TratadorMetricas
+
+
+def _classe_servidor():
+    """
+    Cria o servidor HTTP com uma thread por requisição, cada uma registrada
+    como serviço do processo: uma coleta em andamento (ou um cliente ocioso)
+    no fim de uma partida não é um vazamento da partida.
+    """
+    from http.server import ThreadingHTTPServer
+
+    class ServidorHTTPMetricas(ThreadingHTTPServer):
+        daemon_threads = True
+
+        def process_request(self, request, endereco_cliente):
+            thread = threading.Thread(target=self.process_request_thread, args=(request, endereco_cliente),
+                                      name="TratadorMetricas", daemon=True)
+            ciclo_vida.registrar_servico(thread)
+            thread.start()
+
+    return ServidorHTTPMetricas
+
+
+class ServidorMetricas(threading.Thread):
+    """Servidor HTTP local (127.0.0.1) das métricas, em uma thread de segundo plano."""
+
+    def __init__(self, registro, porta, endereco="127.0.0.1"):
+        super().__init__(name="ServidorMetricas")
+        self.daemon = True
+        ciclo_vida.registrar_servico(self)  # Vive o processo inteiro: não conta como vazamento de uma partida
+        self.servidor = _classe_servidor()((endereco, porta), _classe_tratador(registro))
+        self.porta = self.servidor.server_address[1]    # Porta real (útil com porta=0)
+
+    def run(self):
+        self.servidor.serve_forever(poll_interval=0.5)
+
+    def parar(self, timeout=1.0):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+        self.join(timeout)
+
+
+class EscritorJSONL(threading.Thread):
+    """Acrescenta um retrato das métricas (uma linha JSON) a um arquivo a cada 'intervalo' segundos."""
+
+    def __init__(self, registro, caminho, intervalo):
+        super().__init__(name="EscritorMetricasJSONL")
+        self.daemon = True
+        ciclo_vida.registrar_servico(self)
+        self.registro = registro
+        self.caminho = caminho
+        self.intervalo = intervalo
+        self._parar = threading.Event()  # Interrompe a espera na hora, sem esperar o intervalo acabar
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            self.escrever()
+        self.escrever() # Último retrato ao encerrar
+
+    def escrever(self):
+        try:
+            with open(self.caminho, "a", encoding="utf-8") as arquivo:
+                arquivo.write(json.dumps(self.registro.retrato(), ensure_ascii=False) + "\n")
+        except OSError as e:
+            log_metricas.erro("Não foi possível escrever as métricas em %s: %s", self.caminho, e)
+
+    def parar(self, timeout=1.0):
+        self._parar.set()
+        self.join(timeout)
+
+
+class ExportacaoMetricas:
+    """Liga e desliga o servidor HTTP e o escritor JSONL."""
+
+    def __init__(self, registro):
+        self.registro = registro
+        self.servidor = None
+        self.escritor_jsonl = None
+
+    def iniciar(self, porta=METRICAS_PORTA, arquivo_jsonl=METRICAS_ARQUIVO_JSONL,
+                intervalo_jsonl=METRICAS_INTERVALO_JSONL_S):
+        """
+        Inicia o que estiver configurado (porta e/ou arquivo; None desliga cada um).
+        Uma porta ocupada não impede o jogo de rodar: o erro vai para o registro.
+        """
+        if porta is not None and self.servidor is None:
+            try:
+                self.servidor = ServidorMetricas(self.registro, porta)
+            except OSError as e:
+                log_metricas.erro("Não foi possível abrir a porta %s para as métricas: %s", porta, e)
+            else:
+                self.servidor.start()
+                log_metricas.info("Métricas em http://127.0.0.1:%d/metrics", self.servidor.porta)
+        if arquivo_jsonl is not None and self.escritor_jsonl is None:
+            self.escritor_jsonl = EscritorJSONL(self.registro, arquivo_jsonl, intervalo_jsonl)
+            self.escritor_jsonl.start()
+            log_metricas.info("Métricas gravadas em %s a cada %.0fs", arquivo_jsonl, intervalo_jsonl)
+
+    def parar(self):
+        if self.servidor is not None:
+            self.servidor.parar()
+            self.servidor = None
+        if self.escritor_jsonl is not None:
+            self.escritor_jsonl.parar()
+            self.escritor_jsonl = None
+
+
+# Instância única, compartilhada por todo o processo
+metricas = RegistroMetricas()
+exportacao = ExportacaoMetricas(metricas)
@@ -0,0 +1,336 @@
+#   recursos.py
+"""
+Gerenciador central de recursos (imagens, fontes e sons) do jogo.
+Cada arquivo é carregado do disco uma única vez, convertido para o formato
+da tela (convert/convert_alpha) e compartilhado entre todas as instâncias que
+o utilizam. As variantes reescaladas também ficam em cache, com a chave
+(caminho, tamanho), de modo que criar um sprite novo custa apenas uma busca
+em dicionário.
+O cache possui um limite de memória: quando ele é ultrapassado, os recursos
+usados há mais tempo são descartados primeiro (política LRU). Os sons têm,
+além disso, um orçamento próprio para o PCM decodificado: um som novo
+despeja os sons usados há mais tempo, e um som maior que o orçamento inteiro
+não fica no cache.
+IMPORTANTE: as superfícies devolvidas são compartilhadas. Quem precisar
+desenhar sobre uma delas deve trabalhar em uma cópia (surface.copy()).
+A decodificação acontece fora do lock do cache: enquanto uma thread decodifica
+um MP3 ou um PNG grande, as outras continuam sendo atendidas pelo cache. Dois
+pedidos simultâneos do mesmo arquivo não o decodificam duas vezes: o segundo
+espera o primeiro terminar.
+'pre_carregar' entrega o carregamento a uma thread de segundo plano
+('FilaCarregamento') e devolve um 'PedidoCarregamento', consultado sem
+bloquear. 'descartar_imagem' e 'descartar_som' liberam um recurso que não
+será mais usado (ex.: um slide da tela de carregamento que já passou).
+"""
+import os   # Importa o módulo os para manipulação de caminhos
+import threading    # Importa threading para proteger o cache contra acesso concorrente
+from collections import OrderedDict, deque  # Dicionário ordenado (lista LRU) e fila de pedidos
+import pygame   # Importa o Pygame para carregar imagens, fontes e sons
+from .settings import PASTA_IMAGENS, PASTA_AUDIO, LIMITE_MEMORIA_RECURSOS_MB, ORCAMENTO_AUDIO_DECODIFICADO_MB
+from .registro import obter_registro, RECURSOS  # Registro não bloqueante
+from .game.ciclo_vida import ciclo_vida    # A fila de carregamento é um serviço do processo
+
+log_recursos = obter_registro(RECURSOS)
+
+CUSTO_FONTE_PADRAO = 64 * 1024  # Custo estimado (bytes) de uma fonte sem arquivo associado
+
+
+class PedidoCarregamento:
+    """Um carregamento entregue à 'FilaCarregamento'. 'pronto' indica que terminou (com ou sem erro)."""
+    __slots__ = ('funcao', 'args', 'resultado', 'erro', 'cancelado', '_evento')
+
+    def __init__(self, funcao, args):
+        self.funcao = funcao
+        self.args = args
+        self.resultado = None
+        self.erro = None
+        self.cancelado = False  # Cancelado antes de começar: não será executado
+        self._evento = threading.Event()
+
+    @property
+    def pronto(self):
+        return self._evento.is_set()
+
+    def esperar(self, timeout=None):
+        """Espera o carregamento terminar e devolve o resultado (None se falhou, foi cancelado ou o prazo acabou)."""
+        self._evento.wait(timeout)
+        return self.resultado
+
+    def cancelar(self):
+        """Desiste do pedido se ele ainda não começou (um carregamento em andamento termina normalmente)."""
+        self.cancelado = True
+
+
+class FilaCarregamento(threading.Thread):
+    """
+    Thread de segundo plano que executa os carregamentos pedidos, em ordem.
+    """
+    def __init__(self):
+        super().__init__(name="FilaCarregamento")
+        self.daemon = True
+        ciclo_vida.registrar_servico(self)  # Vive o processo inteiro: não conta como vazamento de uma partida
+        self._pedidos = deque() # Pedidos ainda não iniciados, em ordem de chegada
+        self._condicao = threading.Condition()  # Acorda a thread quando chega um pedido
+
+    def pedir(self, funcao, *args):
+        """Coloca um carregamento na fila e devolve o 'PedidoCarregamento'."""
+        pedido = PedidoCarregamento(funcao, args)
+        with self._condicao:
+            self._pedidos.append(pedido)
+            self._condicao.notify()
+        return pedido
+
+    def pendentes(self):
+        """Quantos pedidos ainda não começaram."""
+        with self._condicao:
+            return len(self._pedidos)
+
+    def run(self):
+        while True:
+            with self._condicao:
+                while not self._pedidos:
+                    self._condicao.wait()
+                pedido = self._pedidos.popleft()
+            if not pedido.cancelado:
+                try:
+                    pedido.resultado = pedido.funcao(*pedido.args)
+                except Exception as e:  # Um carregamento com erro não derruba a fila
+                    pedido.erro = e
+                    log_recursos.erro("Carregamento em segundo plano falhou: %s", e)
+            pedido._evento.set()
+
+
+class GerenciadorRecursos:
+    """
+    Cache de recursos compartilhados com limite de memória e despejo LRU.
+    Todas as operações são protegidas por um lock, permitindo que telas de
+    carregamento pré-carreguem recursos em threads auxiliares; o lock não é
+    mantido durante a leitura e a decodificação dos arquivos.
+    """
+
+    def __init__(self, limite_bytes=LIMITE_MEMORIA_RECURSOS_MB * 1024 * 1024,
+                 limite_bytes_som=ORCAMENTO_AUDIO_DECODIFICADO_MB * 1024 * 1024):
+        self.limite_bytes = limite_bytes    # Limite de memória estimada do cache
+        self.limite_bytes_som = limite_bytes_som    # Orçamento do áudio decodificado (parte de 'limite_bytes')
+        self._cache = OrderedDict() # chave -> (recurso, custo em bytes); o fim da ordem é o mais recente
+        self._bytes_em_uso = 0  # Memória estimada ocupada pelos recursos em cache
+        self._bytes_som = 0 # Parte de '_bytes_em_uso' ocupada por sons decodificados
+        self._lock = threading.RLock()  # Protege o cache contra acesso concorrente
+        self._em_carregamento = {}  # chave -> Event de quem está decodificando (fora do lock)
+        self._fila = None   # FilaCarregamento, criada no primeiro 'pre_carregar'
+        # --- Estatísticas ---
+        self.acertos = 0    # Quantas buscas foram atendidas pelo cache
+        self.falhas = 0 # Quantas buscas precisaram carregar do disco
+        self.despejos = 0   # Quantos recursos foram descartados pelo limite de memória
+
+    # --- Acesso genérico ao cache ---
+    def _buscar(self, chave):
+        """Retorna o recurso em cache (marcando-o como usado recentemente) ou None."""
+        entrada = self._cache.get(chave)
+        if entrada is None:
+            self.falhas += 1
+            return None
+        self._cache.move_to_end(chave)  # Marca como o mais recentemente usado
+        self.acertos += 1
+        return entrada[0]
+
+    def _obter(self, chave, carregar):
+        """
+        Retorna o recurso em cache ou o carrega com 'carregar() -> (recurso, custo)'.
+        A decodificação roda fora do lock; quem pedir a mesma chave enquanto
+        isso espera pelo resultado em vez de decodificar de novo.
+        Um recurso None (ex.: som inexistente) não entra no cache.
+        """
+        while True:
+            with self._lock:
+                recurso = self._buscar(chave)
+                if recurso is not None:
+                    return recurso
+                evento = self._em_carregamento.get(chave)
+                if evento is None:  # Ninguém está carregando: esta thread carrega
+                    evento = self._em_carregamento[chave] = threading.Event()
+                    break
+            evento.wait()   # Outra thread está decodificando a mesma chave; depois, tenta o cache de novo
+        custo = 0
+        try:
+            recurso, custo = carregar()
+        finally:
+            with self._lock:
+                del self._em_carregamento[chave]
+                if recurso is not None:
+                    self._guardar(chave, recurso, custo)
+            evento.set()
+        return recurso
+
+    def _guardar(self, chave, recurso, custo):
+        """Insere um recurso no cache e despeja os menos usados se o limite (ou o orçamento de áudio) for excedido."""
+        if chave[0] == 'som':
+            if custo > self.limite_bytes_som:   # Sozinho já estoura o orçamento: quem pediu usa e descarta
+                log_recursos.aviso("Áudio %s (%.1f MB decodificado) maior que o orçamento de áudio; fora do cache",
+                                   chave[1], custo / 2 ** 20)
+                return recurso
+            self._despejar_sons(self.limite_bytes_som - custo)
+            self._bytes_som += custo
+        self._cache[chave] = (recurso, custo)
+        self._bytes_em_uso += custo
+        # Despeja do início (menos recente), mas nunca o recurso que acabou de entrar
+        while self._bytes_em_uso > self.limite_bytes and len(self._cache) > 1:
+            chave_antiga, (_, custo_antigo) = self._cache.popitem(last=False)
+            self._bytes_em_uso -= custo_antigo
+            if chave_antiga[0] == 'som':
+                self._bytes_som -= custo_antigo
+            self.despejos += 1
+        return recurso
+
+    def _despejar_sons(self, limite):
+        """Despeja os sons usados há mais tempo até o áudio decodificado caber em 'limite' bytes."""
+        for chave in [c for c in self._cache if c[0] == 'som']: # Do menos para o mais recente
+            if self._bytes_som <= limite:
+                break
+            _, custo = self._cache.pop(chave)
+            self._bytes_em_uso -= custo
+            self._bytes_som -= custo
+            self.despejos += 1
+
+    # --- Imagens ---
+    def imagem(self, nome, tamanho=None, alpha=True):
+        """
+        Retorna uma superfície compartilhada para a imagem pedida.
+        Args:
+            nome (str): Nome do arquivo em PASTA_IMAGENS (ou caminho absoluto).
+            tamanho (tuple, optional): Tamanho (largura, altura) da variante reescalada.
+            alpha (bool): Usa convert_alpha() se True; convert() (mais rápido de desenhar) se False.
+        """
+        caminho = nome if os.path.isabs(nome) else os.path.join(PASTA_IMAGENS, nome)
+        tamanho = tuple(int(v) for v in tamanho) if tamanho is not None else None
+        return self._obter(('imagem', caminho, tamanho, alpha), lambda: self._carregar_imagem(caminho, tamanho, alpha))
+
+    def _carregar_imagem(self, caminho, tamanho, alpha):
+        """
+        Lê a imagem do disco, reescala e converte para o formato da tela.
+        A imagem original (em geral muito maior que a variante usada no jogo)
+        não é guardada no cache quando só a variante reescalada foi pedida.
+        Retorna (superfície, custo em bytes).
+        """
+        try:
+            surface = pygame.image.load(caminho)
+        except (pygame.error, FileNotFoundError) as e:
+            log_recursos.aviso("Imagem não encontrada em %s: %s", caminho, e)
+            surface = pygame.Surface(tamanho or (80, 80))  # Fallback se a imagem não existir
+            surface.fill((255, 0, 0))   # Vermelho como fallback
+        else:
+            if tamanho is not None:
+                surface = pygame.transform.scale(surface, tamanho)
+            if pygame.display.get_surface() is not None:    # convert() exige uma janela criada
+                surface = surface.convert_alpha() if alpha else surface.convert()
+        return surface, surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def descartar_imagem(self, nome, tamanho=None, alpha=True):
+        """Tira do cache a variante pedida de uma imagem que não será mais usada."""
+        caminho = nome if os.path.isabs(nome) else os.path.join(PASTA_IMAGENS, nome)
+        tamanho = tuple(int(v) for v in tamanho) if tamanho is not None else None
+        self._descartar(('imagem', caminho, tamanho, alpha))
+
+    # --- Fontes ---
+    def fonte(self, caminho, tamanho):
+        """Retorna uma fonte compartilhada. 'caminho' None usa a fonte padrão do Pygame."""
+        def carregar():
+            try:
+                fonte = pygame.font.Font(caminho, tamanho)
+            except (pygame.error, FileNotFoundError, OSError) as e:
+                log_recursos.aviso("Fonte não encontrada em %s: %s", caminho, e)
+                fonte = pygame.font.Font(None, tamanho) # Fonte padrão do Pygame como fallback
+            custo = os.path.getsize(caminho) if caminho and os.path.exists(caminho) else CUSTO_FONTE_PADRAO
+            return fonte, custo
+        return self._obter(('fonte', caminho, tamanho), carregar)
+
+    # --- Sons ---
+    def som(self, nome):
+        """
+        Retorna um pygame.mixer.Sound compartilhado, ou None se o arquivo não
+        existir ou o mixer não estiver disponível.
+        """
+        caminho = nome if os.path.isabs(nome) else os.path.join(PASTA_AUDIO, nome)
+        def carregar():
+            if not os.path.exists(caminho):
+                log_recursos.aviso("Áudio não encontrado em %s", caminho)
+                return None, 0
+            try:
+                som = pygame.mixer.Sound(caminho)
+            except pygame.error as e:
+                log_recursos.aviso("Não foi possível carregar o áudio %s: %s", caminho, e)
+                return None, 0
+            return som, self._custo_som(som)
+        return self._obter(('som', caminho), carregar)
+
+    def descartar_som(self, nome):
+        """Tira do cache um som que não será mais tocado."""
+        self._descartar(('som', nome if os.path.isabs(nome) else os.path.join(PASTA_AUDIO, nome)))
+
+    @staticmethod
+    def _custo_som(som):
+        """Estima quantos bytes de PCM decodificado o som ocupa."""
+        formato_mixer = pygame.mixer.get_init()
+        if not formato_mixer:
+            return 0
+        frequencia, formato, canais = formato_mixer
+        return int(som.get_length() * frequencia * canais * (abs(formato) // 8))
+
+    # --- Recursos derivados ---
+    def derivado(self, chave, criar):
+        """
+        Retorna um recurso calculado a partir de outros (ex.: um ciclo de
+        animação pré-renderizado), criando-o apenas na primeira vez.
+        Args:
+            chave (tuple): Identifica o recurso; deve incluir todos os parâmetros usados para criá-lo.
+            criar (callable): criar() -> (recurso, custo em bytes).
+        """
+        return self._obter(('derivado',) + tuple(chave), criar)
+
+    # --- Carregamento em segundo plano ---
+    def pre_carregar(self, funcao, *args):
+        """
+        Executa 'funcao(*args)' (ex.: recursos.imagem, nome, tamanho) na
+        'FilaCarregamento' e devolve o 'PedidoCarregamento' sem esperar.
+        """
+        with self._lock:
+            if self._fila is None:  # A thread só nasce no primeiro pedido
+                self._fila = FilaCarregamento()
+                self._fila.start()
+            fila = self._fila
+        return fila.pedir(funcao, *args)
+
+    # --- Manutenção ---
+    def _descartar(self, chave):
+        """Remove uma entrada do cache (quem ainda a referencia continua com um objeto válido)."""
+        with self._lock:
+            entrada = self._cache.pop(chave, None)
+            if entrada is not None:
+                self._bytes_em_uso -= entrada[1]
+                if chave[0] == 'som':
+                    self._bytes_som -= entrada[1]
+
+    def limpar(self):
+        """Esvazia o cache (os recursos ainda referenciados por sprites continuam válidos)."""
+        with self._lock:
+            self._cache.clear()
+            self._bytes_em_uso = 0
+            self._bytes_som = 0
+
+    def get_estatisticas(self):
+        """Retorna estatísticas de uso do cache."""
+        with self._lock:
+            return {
+                'itens': len(self._cache),
+                'bytes_em_uso': self._bytes_em_uso,
+                'limite_bytes': self.limite_bytes,
+                'bytes_som': self._bytes_som,
+                'limite_bytes_som': self.limite_bytes_som,
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'despejos': self.despejos
+            }
+
+
+# Instância única, compartilhada por todo o processo
+recursos = GerenciadorRecursos()
@@ -0,0 +1,272 @@
+#   registro.py
+"""
+Registro (log) estruturado e não bloqueante do jogo.
+Cada subsistema (MESA, PRODUTOR, ESCALONADOR, QUEDA, ...) obtém o seu
+'RegistroSubsistema' com 'obter_registro(nome)'. Emitir uma mensagem apenas
+guarda o registro em um buffer circular de tamanho fixo; uma thread
+escritora em segundo plano esvazia o buffer e faz a E/S (terminal, arquivo).
+Assim, nenhuma escrita no terminal acontece dentro de uma seção crítica
+(mutex da mesa) nem no loop de frames.
+ANALOGIA: É outro produtor-consumidor. As threads do jogo produzem registros,
+a thread escritora os consome. Se o buffer encher, os registros mais antigos
+são descartados (e contados) em vez de bloquear quem produz.
+Um nível desabilitado custa apenas a chamada de uma função vazia: os
+métodos 'debug', 'info', 'aviso' e 'erro' são trocados por uma função que
+não faz nada quando o nível é alterado. Os argumentos da mensagem só são
+formatados na thread escritora.
+"""
+import sys  # Importa sys para escrever no terminal (sys.stdout)
+import time # Importa time para o horário de cada registro
+import atexit   # Importa atexit para esvaziar o buffer ao encerrar o programa
+import threading    # Importa threading para a thread escritora e a sincronização do buffer
+from collections import deque, namedtuple   # deque com 'maxlen' é o buffer circular
+from functools import partial   # partial fixa o nível nos métodos de emissão
+from .settings import NIVEL_REGISTRO, NIVEIS_REGISTRO_SUBSISTEMAS, CAPACIDADE_BUFFER_REGISTRO
+
+# --- Níveis ---
+DEBUG = 10
+INFO = 20
+AVISO = 30
+ERRO = 40
+NOMES_NIVEIS = {DEBUG: "DEBUG", INFO: "INFO", AVISO: "AVISO", ERRO: "ERRO"}
+NIVEIS_POR_NOME = {nome: nivel for nivel, nome in NOMES_NIVEIS.items()}
+_METODOS_POR_NIVEL = {DEBUG: 'debug', INFO: 'info', AVISO: 'aviso', ERRO: 'erro'}
+
+# --- Subsistemas ---
+MESA = "MESA"
+PRODUTOR = "PRODUTOR"
+ESCALONADOR = "ESCALONADOR"
+QUEDA = "QUEDA"
+SISTEMA = "SISTEMA"
+JOGO = "JOGO"
+RECURSOS = "RECURSOS"
+METRICAS = "METRICAS"
+AUDIO = "AUDIO"
+
+# Um registro: 'mensagem' só é combinada com 'args' e 'campos' na hora da escrita
+RegistroLog = namedtuple('RegistroLog', 'tempo nivel subsistema thread mensagem args campos')
+
+
+def nivel_de(nivel):
+    """Aceita um nível numérico ou pelo nome ('DEBUG', 'INFO', 'AVISO', 'ERRO')."""
+    if isinstance(nivel, str):
+        return NIVEIS_POR_NOME[nivel.upper()]
+    return int(nivel)
+
+
+def formatar(registro):
+    """
+    Texto de um registro, no formato das mensagens do jogo:
+    '[MESA] Presente adicionado. Total: 1/3' (avisos e erros recebem o nível).
+    Campos estruturados (palavras-chave) são acrescentados como chave=valor.
+    """
+    texto = registro.mensagem % registro.args if registro.args else registro.mensagem
+    if registro.campos:
+        texto += " " + " ".join(f"{chave}={valor}" for chave, valor in registro.campos.items())
+    if registro.nivel >= AVISO:
+        return f"[{registro.subsistema}] {NOMES_NIVEIS.get(registro.nivel, registro.nivel)}: {texto}"
+    return f"[{registro.subsistema}] {texto}"
+
+
+class DestinoTerminal:
+    """Escreve os registros formatados em um fluxo de texto (por padrão, sys.stdout)."""
+    def __init__(self, fluxo=None):
+        self.fluxo = fluxo  # None: usa o sys.stdout do momento da escrita
+
+    def __call__(self, registros):
+        fluxo = self.fluxo or sys.stdout
+        fluxo.write("".join(formatar(r) + "\n" for r in registros))
+        fluxo.flush()
+
+
+class EscritorRegistros(threading.Thread):
+    """
+    Thread que esvazia o buffer circular e entrega os registros, em lotes,
+    para cada destino ('destino(lista_de_registros)').
+    """
+    def __init__(self, capacidade=CAPACIDADE_BUFFER_REGISTRO, destinos=None):
+        super().__init__(name="EscritorRegistros")
+        self.daemon = True  # Não impede o programa de terminar (o atexit esvazia o buffer)
+        from .game.ciclo_vida import ciclo_vida    # Importado aqui: o ciclo_vida usa o registro
+        ciclo_vida.registrar_servico(self)  # Vive o processo inteiro: não conta como vazamento de uma partida
+        self.buffer = deque(maxlen=capacidade)  # Buffer circular: cheio, descarta o mais antigo
+        self.condicao = threading.Condition()   # Protege o buffer e acorda a escritora
+        self.destinos = list(destinos) if destinos is not None else [DestinoTerminal()]
+        self.descartados = 0    # Registros perdidos porque o buffer estava cheio
+        self.escritos = 0   # Registros já entregues aos destinos
+        self._escrevendo = False    # True enquanto um lote está sendo entregue (fora do lock)
+        self._parar = False
+
+    def emitir(self, registro):
+        """Coloca um registro no buffer sem nunca bloquear por E/S."""
+        with self.condicao:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.descartados += 1
+            self.buffer.append(registro)
+            self.condicao.notify()
+
+    def run(self):
+        descartados_informados = 0
+        while True:
+            with self.condicao:
+                while not self.buffer and not self._parar:
+                    self.condicao.wait()
+                if not self.buffer and self._parar:
+                    return
+                lote = list(self.buffer)
+                self.buffer.clear()
+                descartados = self.descartados
+                self._escrevendo = True
+            # --- E/S fora do lock: quem emite nunca espera pelo terminal ---
+            if descartados > descartados_informados:
+                lote.insert(0, RegistroLog(time.time(), AVISO, "REGISTRO", self.name,
+                                           "%d registros descartados (buffer cheio)",
+                                           (descartados - descartados_informados,), None))
+                descartados_informados = descartados
+            for destino in self.destinos:
+                try:
+                    destino(lote)
+                except Exception as e:  # Um destino com problema não derruba a escritora
+                    sys.stderr.write(f"[REGISTRO] Falha ao escrever registros: {e}\n")
+            with self.condicao:
+                self.escritos += len(lote)
+                self._escrevendo = False
+                self.condicao.notify_all()  # Acorda quem espera em 'descarregar'
+
+    def descarregar(self, timeout=1.0):
+        """Espera (até 'timeout' segundos) todos os registros pendentes serem escritos."""
+        limite = time.monotonic() + timeout
+        with self.condicao:
+            while (self.buffer or self._escrevendo) and self.is_alive():
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    return False
+                self.condicao.wait(restante)
+        return True
+
+    def parar(self, timeout=1.0):
+        """Escreve o que estiver pendente e encerra a thread."""
+        with self.condicao:
+            self._parar = True
+            self.condicao.notify_all()
+        if self.is_alive():
+            self.join(timeout)
+
+
+def _ignorar(*args, **kwargs):
+    """Método usado no lugar dos níveis desabilitados: não faz nada."""
+
+
+class RegistroSubsistema:
+    """
+    Registro de um subsistema. Uso:
+        registro = obter_registro(MESA)
+        registro.info("Presente adicionado. Total: %d/%d", total, capacidade)
+    """
+    def __init__(self, nome, nivel, central):
+        self.nome = nome
+        self._central = central
+        self.nivel = INFO
+        self.definir_nivel(nivel)
+
+    def definir_nivel(self, nivel):
+        """Troca o nível mínimo; os métodos dos níveis abaixo dele passam a não fazer nada."""
+        self.nivel = nivel_de(nivel)
+        for nivel_metodo, nome_metodo in _METODOS_POR_NIVEL.items():
+            if nivel_metodo >= self.nivel:
+                setattr(self, nome_metodo, partial(self._emitir, nivel_metodo))
+            else:
+                setattr(self, nome_metodo, _ignorar)
+
+    def habilitado(self, nivel):
+        """True se mensagens do nível seriam registradas (útil antes de montar argumentos caros)."""
+        return nivel_de(nivel) >= self.nivel
+
+    def _emitir(self, nivel, mensagem, *args, **campos):
+        self._central.emitir(RegistroLog(time.time(), nivel, self.nome, threading.current_thread().name,
+                                         mensagem, args, campos or None))
+
+
+class CentralRegistros:
+    """
+    Mantém os registros de cada subsistema e a thread escritora, que só é
+    criada na primeira mensagem emitida.
+    """
+    def __init__(self, nivel_padrao=NIVEL_REGISTRO, niveis=NIVEIS_REGISTRO_SUBSISTEMAS,
+                 capacidade=CAPACIDADE_BUFFER_REGISTRO):
+        self.nivel_padrao = nivel_de(nivel_padrao)
+        self.niveis = {nome: nivel_de(nivel) for nome, nivel in niveis.items()}
+        self.capacidade = capacidade
+        self.destinos = [DestinoTerminal()]
+        self._registros = {}    # nome -> RegistroSubsistema
+        self._escritor = None
+        self._lock = threading.Lock()   # Protege a criação dos registros e da escritora
+
+    def obter(self, nome):
+        """Registro do subsistema 'nome' (criado na primeira chamada)."""
+        with self._lock:
+            registro = self._registros.get(nome)
+            if registro is None:
+                registro = RegistroSubsistema(nome, self.niveis.get(nome, self.nivel_padrao), self)
+                self._registros[nome] = registro
+            return registro
+
+    def definir_nivel(self, nivel, nome=None):
+        """Altera o nível de um subsistema ou, sem 'nome', de todos."""
+        with self._lock:
+            if nome is None:
+                self.nivel_padrao = nivel_de(nivel)
+                self.niveis.clear()
+                alvos = self._registros.values()
+            else:
+                self.niveis[nome] = nivel_de(nivel)
+                alvos = [self._registros[nome]] if nome in self._registros else []
+            for registro in alvos:
+                registro.definir_nivel(nivel)
+
+    def adicionar_destino(self, destino):
+        """Acrescenta um destino (callable que recebe uma lista de RegistroLog)."""
+        with self._lock:
+            self.destinos.append(destino)
+            if self._escritor is not None:
+                self._escritor.destinos = list(self.destinos)
+
+    def emitir(self, registro):
+        escritor = self._escritor
+        if escritor is None:
+            escritor = self._iniciar_escritor()
+        escritor.emitir(registro)
+
+    def _iniciar_escritor(self):
+        with self._lock:
+            if self._escritor is None:
+                self._escritor = EscritorRegistros(self.capacidade, self.destinos)
+                self._escritor.start()
+            return self._escritor
+
+    def descarregar(self, timeout=1.0):
+        """Espera os registros pendentes serem escritos."""
+        if self._escritor is not None:
+            return self._escritor.descarregar(timeout)
+        return True
+
+    def encerrar(self, timeout=1.0):
+        """Escreve os registros pendentes e para a thread escritora."""
+        with self._lock:
+            escritor, self._escritor = self._escritor, None
+        if escritor is not None:
+            escritor.parar(timeout)
+
+    def get_estatisticas(self):
+        escritor = self._escritor
+        return {
+            'pendentes': len(escritor.buffer) if escritor else 0,
+            'escritos': escritor.escritos if escritor else 0,
+            'descartados': escritor.descartados if escritor else 0
+        }
+
+
+# Instância única, compartilhada por todo o processo
+central = CentralRegistros()
+obter_registro = central.obter
+atexit.register(central.encerrar)   # Nada do que foi registrado se perde ao sair
@@ -11,6 +11,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
+    from so_projeto_final.inicio import relatorio_inicio    # Começa a medir a inicialização (--startup-report)
     from so_projeto_final.main import main
     
     if __name__ == "__main__":
@@ -11,6 +11,7 @@ PASTA_ASSETS = os.path.join(PASTA_RAIZ, "assets")           # Pasta de assets
 PASTA_IMAGENS = os.path.join(PASTA_ASSETS, "images")        # Pasta de imagens
 PASTA_AUDIO = os.path.join(PASTA_ASSETS, "audio")           # Pasta de áudio
 PASTA_FONTS = os.path.join(PASTA_ASSETS, "fonts")           # Pasta de fontes
+CAMINHO_README = os.path.join(PASTA_RAIZ, "README.md")     # README exibido pelo menu (independe da pasta de onde o jogo é executado)
 # --- Caminho para as fontes utilizadas ---
 FONTE_PATH = os.path.join(PASTA_FONTS, "pixel_operator", "PixelOperator.ttf")           
 FONTE_BOLD_PATH = os.path.join(PASTA_FONTS, "pixel_operator", "PixelOperator-Bold.ttf")
@@ -18,8 +19,33 @@ FONTE_BOLD_PATH = os.path.join(PASTA_FONTS, "pixel_operator", "PixelOperator-Bol
 LARGURA_TELA = 800  # Largura da tela
 ALTURA_TELA = 600  # Altura da tela
 FPS = 60  # Frames por segundo
+PASSOS_SIMULACAO_POR_SEGUNDO = 120  # Frequência fixa da simulação, independente do FPS
+MAX_ATRASO_SIMULACAO_MS = 250   # Atraso máximo compensado após uma travada (evita a "espiral da morte")
+FRACAO_AREA_SUJA_FLIP = 0.5 # Acima desta fração da tela alterada, atualiza a tela inteira (flip)
 # --- Configurações de Gameplay ---
 VAGAS_NA_MESA = 3 # Número de vagas na mesa de jogo
+PONTUACAO_VITORIA = 300 # Pontuação necessária para vencer a partida
+PONTUACAO_AUDIO_INTERMEDIARIO = 100 # Pontuação que dispara o áudio do meio da partida
+# --- Fila entre os produtores (esteiras) e o jogo ---
+CAPACIDADE_FILA_PRESENTES = 10  # Presentes produzidos que podem esperar para aparecer na tela
+POLITICA_FILA_PRESENTES = "descartar_antigo"  # Fila cheia: "descartar_antigo", "descartar_novo", "bloquear" ou "contar_perdido"
+ESPERA_MAXIMA_FILA_S = 0.25 # Espera máxima de um produtor pela vaga na política "bloquear"
+MAX_PRESENTES_POR_FRAME = 2 # Presentes retirados da fila (e criados na tela) por frame, no máximo
+FISICA_PRESENTES = "python"   # Física dos presentes em queda: "python" ou "numpy" (opcional, para milhares de presentes)
+# --- Recursos ---
+LIMITE_MEMORIA_RECURSOS_MB = 96  # Limite de memória do cache de imagens, fontes e sons (MB)
+# --- Áudio ---
+ORCAMENTO_AUDIO_DECODIFICADO_MB = 8 # Máximo de PCM decodificado (sons curtos) mantido no cache (MB)
+LIMITE_SOM_CURTO_KB = 256   # Arquivos maiores tocam em streaming (mixer.music), sem decodificar tudo na memória
+CANAIS_AUDIO = {"voz": 1, "efeito": 4}  # Canais reservados por categoria; a música (e as faixas longas) usa o stream
+# --- Registro (log) ---
+NIVEL_REGISTRO = "INFO"   # Nível mínimo das mensagens: "DEBUG", "INFO", "AVISO" ou "ERRO"
+NIVEIS_REGISTRO_SUBSISTEMAS = {}    # Nível por subsistema, ex.: {"MESA": "DEBUG", "PRODUTOR": "DEBUG"}
+CAPACIDADE_BUFFER_REGISTRO = 4096   # Registros pendentes antes de descartar os mais antigos
+# --- Métricas (exportação para painéis de monitoramento) ---
+METRICAS_PORTA = None   # Porta local (ex.: 9464) do endpoint Prometheus em http://127.0.0.1:<porta>/metrics; None desliga
+METRICAS_ARQUIVO_JSONL = None   # Arquivo onde acrescentar um retrato das métricas por linha; None desliga
+METRICAS_INTERVALO_JSONL_S = 10.0   # Intervalo entre dois retratos no arquivo JSONL
 # --- Cores ---
 BRANCO = (255, 255, 255)  # Branco
 PRETO = (0, 0, 0)  # Preto
@@ -0,0 +1,272 @@
+# ui/documento.py
+"""
+Leitura de documentos markdown para a tela de README.
+O texto é interpretado em blocos (títulos, listas, código, parágrafos,
+separadores) e diagramado em linhas que cabem na largura da tela, só até
+onde a rolagem já chegou ('DocumentoDiagramado'). A diagramação só mede o
+texto (font.size); quem desenha ('CacheLinhas') rasteriza apenas as linhas
+dentro da janela visível (e uma margem em volta) e descarta as que ficaram
+longe, então o custo de abrir e a memória não crescem com o tamanho do documento.
+ANALOGIA: É a memória virtual: o documento inteiro tem endereço (a posição
+y de cada linha), mas só as "páginas" perto da rolagem ficam residentes.
+"""
+import re   # Expressões regulares para a marcação inline (negrito, código, links)
+from bisect import bisect_right # Busca da primeira linha visível pela posição y
+from collections import namedtuple
+import pygame   # Importa o Pygame para desenhar os separadores
+
+# --- Estilos dos blocos ---
+TITULO_1 = "titulo1"
+TITULO_2 = "titulo2"
+TITULO_3 = "titulo3"
+TEXTO = "texto"
+LISTA = "lista"
+CODIGO = "codigo"
+SEPARADOR = "separador"
+VAZIO = "vazio"
+
+MARCADOR_LISTA = "• "
+RECUO_NIVEL = 20    # Recuo (px) por nível de lista ou de texto indentado
+ESPACO_VAZIO = 10   # Altura (px) de uma linha em branco do documento
+
+# Um bloco lógico do documento; 'nivel' é a indentação (listas aninhadas, texto recuado)
+Bloco = namedtuple('Bloco', 'estilo texto nivel')
+# Uma linha já diagramada: posição na página (y cresce para baixo) e altura
+LinhaDiagramada = namedtuple('LinhaDiagramada', 'estilo texto x y altura')
+
+_NEGRITO = re.compile(r"\*\*(.+?)\*\*|__(.+?)__")
+_CODIGO_INLINE = re.compile(r"`([^`]*)`")
+_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_ITEM_LISTA = re.compile(r"^(\s*)(?:[-*+]|\d+[.)])\s+(.*)$")
+_TITULO = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_SEPARADOR = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+
+
+def texto_inline(texto):
+    """Remove a marcação inline: **negrito**, `código` e [links](url) viram só o texto."""
+    texto = _LINK.sub(r"\1", texto)
+    texto = _NEGRITO.sub(lambda m: m.group(1) or m.group(2), texto)
+    return _CODIGO_INLINE.sub(r"\1", texto)
+
+
+def interpretar_markdown(linhas):
+    """
+    Converte as linhas de um arquivo markdown em blocos, sob demanda (gerador).
+    Cada linha do arquivo é um bloco (as quebras de linha do autor são mantidas).
+    Args:
+        linhas (iterable): Linhas do arquivo, com ou sem o '\\n'.
+    Yields:
+        Bloco
+    """
+    em_codigo = False
+    for linha in linhas:
+        linha = linha.rstrip("\r\n").expandtabs(4)
+        if linha.lstrip().startswith("```"):    # Cerca de bloco de código: abre ou fecha
+            em_codigo = not em_codigo
+            continue
+        if em_codigo:
+            yield Bloco(CODIGO, linha, 0)   # Código: espaços e marcação preservados
+            continue
+        if not linha.strip():
+            yield Bloco(VAZIO, "", 0)
+            continue
+        titulo = _TITULO.match(linha)
+        if titulo:
+            nivel = len(titulo.group(1))
+            estilo = TITULO_1 if nivel == 1 else TITULO_2 if nivel == 2 else TITULO_3
+            yield Bloco(estilo, texto_inline(titulo.group(2)), 0)
+            continue
+        if _SEPARADOR.match(linha):
+            yield Bloco(SEPARADOR, "", 0)
+            continue
+        item = _ITEM_LISTA.match(linha)
+        if item:
+            nivel = len(item.group(1)) // 2 # Dois espaços por nível de aninhamento
+            yield Bloco(LISTA, texto_inline(item.group(2)), nivel)
+            continue
+        recuo = len(linha) - len(linha.lstrip())
+        yield Bloco(TEXTO, texto_inline(linha.strip()), recuo // 4)
+
+
+class DocumentoDiagramado:
+    """
+    Linhas de um documento distribuídas na largura da tela, calculadas aos
+    poucos: 'diagramar_ate(y)' só interpreta e mede os blocos necessários para
+    cobrir a página até 'y'. Abrir um documento longo custa o mesmo que abrir
+    um curto; o resto é diagramado à medida que a rolagem avança.
+    """
+
+    def __init__(self, blocos, fontes, largura, espacamento=1.25):
+        """
+        Args:
+            blocos (iterable[Bloco]): Normalmente o gerador de 'interpretar_markdown'.
+            fontes (dict): estilo -> pygame.font.Font (TEXTO é usado para os estilos que faltarem).
+            largura (int): Largura útil, em pixels.
+            espacamento (float): Altura de cada linha em relação à altura da fonte.
+        """
+        self.fontes = fontes
+        self.largura = largura
+        self.espacamento = espacamento
+        self.linhas = []    # LinhaDiagramada, em ordem de y
+        self.ys = []    # y de cada linha (busca binária da primeira linha visível)
+        self.altura = 0 # Altura já diagramada; a total quando 'completo'
+        self.completo = False
+        self._blocos = iter(blocos)
+        self._larguras = {} # (estilo, palavra) -> largura em pixels: palavras repetidas são medidas uma vez
+
+    def _largura(self, estilo, fonte, texto):
+        chave = (estilo, texto)
+        largura = self._larguras.get(chave)
+        if largura is None:
+            largura = self._larguras[chave] = fonte.size(texto)[0]
+        return largura
+
+    def _quebrar(self, estilo, fonte, texto, largura):
+        """Quebra 'texto' em linhas de até 'largura' pixels (por palavra; palavras longas demais, por caractere)."""
+        espaco = self._largura(estilo, fonte, " ")
+        linhas = []
+        atual = None    # None: nenhuma palavra na linha ainda (espaços iniciais do código são mantidos)
+        largura_atual = 0
+        for palavra in texto.split(" "):
+            largura_palavra = self._largura(estilo, fonte, palavra)
+            if atual is None and largura_palavra <= largura:
+                atual, largura_atual = palavra, largura_palavra
+                continue
+            if atual is not None and largura_atual + espaco + largura_palavra <= largura:
+                atual += " " + palavra
+                largura_atual += espaco + largura_palavra
+                continue
+            if atual is not None:
+                linhas.append(atual)
+            while fonte.size(palavra)[0] > largura and len(palavra) > 1:    # Palavra maior que a linha inteira
+                corte = len(palavra) - 1
+                while corte > 1 and fonte.size(palavra[:corte])[0] > largura:
+                    corte -= 1
+                linhas.append(palavra[:corte])
+                palavra = palavra[corte:]
+            atual, largura_atual = palavra, fonte.size(palavra)[0]
+        linhas.append(atual)
+        return linhas
+
+    def _adicionar(self, estilo, texto, x, altura):
+        self.linhas.append(LinhaDiagramada(estilo, texto, x, self.altura, altura))
+        self.ys.append(self.altura)
+        self.altura += altura
+
+    def _diagramar_bloco(self, bloco):
+        if bloco.estilo == VAZIO:
+            self.altura += ESPACO_VAZIO
+            return
+        fonte = self.fontes.get(bloco.estilo, self.fontes[TEXTO])
+        altura = int(fonte.get_linesize() * self.espacamento)
+        if bloco.estilo == SEPARADOR:
+            self._adicionar(SEPARADOR, "", 0, altura)
+            return
+        if bloco.estilo in (TITULO_1, TITULO_2):
+            self.altura += altura // 3  # Respiro antes dos títulos principais
+        x = bloco.nivel * RECUO_NIVEL
+        texto = bloco.texto
+        recuo_continuacao = 0
+        if bloco.estilo == LISTA:
+            texto = MARCADOR_LISTA + texto
+            recuo_continuacao = fonte.size(MARCADOR_LISTA)[0]   # As linhas seguintes alinham com o texto do item
+        trechos = self._quebrar(bloco.estilo, fonte, texto, max(1, self.largura - x - recuo_continuacao))
+        for i, trecho in enumerate(trechos):
+            self._adicionar(bloco.estilo, trecho, x + (recuo_continuacao if i else 0), altura)
+
+    def diagramar_ate(self, y):
+        """Diagrama blocos até a página cobrir 'y' (ou o documento acabar)."""
+        while not self.completo and self.altura < y:
+            bloco = next(self._blocos, None)
+            if bloco is None:
+                self.completo = True
+            else:
+                self._diagramar_bloco(bloco)
+
+    def diagramar_tudo(self):
+        """Diagrama o restante do documento (ex.: para ir direto ao fim)."""
+        self.diagramar_ate(float('inf'))
+
+
+class CacheLinhas:
+    """
+    Superfícies das linhas diagramadas, criadas só quando uma linha chega
+    perto da janela visível e descartadas quando ela se afasta.
+    """
+
+    def __init__(self, documento, cores, margem_linhas=20):
+        """
+        Args:
+            documento (DocumentoDiagramado): Documento a desenhar (diagramado aos poucos).
+            cores (dict): estilo -> cor do texto.
+            margem_linhas (int): Linhas rasterizadas antes e depois da parte visível (rolagem sem atraso).
+        """
+        self.documento = documento
+        self.cores = cores
+        self.margem_linhas = margem_linhas
+        self._superficies = {}  # índice da linha -> pygame.Surface
+        # --- Estatísticas ---
+        self.renderizadas = 0   # Linhas rasterizadas (inclui as que voltaram depois de descartadas)
+        self.descartadas = 0
+        self.maior_residente = 0    # Maior número de superfícies guardadas ao mesmo tempo
+
+    def intervalo_visivel(self, topo, altura):
+        """Índices [inicio, fim) das linhas que aparecem entre 'topo' e 'topo + altura'."""
+        self.documento.diagramar_ate(topo + altura)
+        inicio = max(0, bisect_right(self.documento.ys, topo) - 1)
+        fim = bisect_right(self.documento.ys, topo + altura)
+        return inicio, fim
+
+    def superficie(self, indice):
+        """Superfície da linha 'indice', rasterizada na primeira vez que é pedida."""
+        superficie = self._superficies.get(indice)
+        if superficie is None:
+            linha = self.documento.linhas[indice]
+            fonte = self.documento.fontes.get(linha.estilo, self.documento.fontes[TEXTO])
+            superficie = fonte.render(linha.texto, True, self.cores.get(linha.estilo, self.cores[TEXTO]))
+            self._superficies[indice] = superficie
+            self.renderizadas += 1
+            self.maior_residente = max(self.maior_residente, len(self._superficies))
+        return superficie
+
+    def preparar(self, inicio, fim):
+        """Rasteriza as linhas da margem em volta de [inicio, fim) e descarta as que estão além dela."""
+        documento = self.documento
+        primeira = max(0, inicio - self.margem_linhas)
+        while not documento.completo and len(documento.linhas) < fim + self.margem_linhas:
+            documento.diagramar_ate(documento.altura + 1)   # A margem abaixo também precisa estar diagramada
+        ultima = min(len(documento.linhas), fim + self.margem_linhas)
+        for indice in [i for i in self._superficies if i < primeira or i >= ultima]:
+            del self._superficies[indice]
+            self.descartadas += 1
+        for indice in range(primeira, ultima):
+            if documento.linhas[indice].estilo != SEPARADOR:
+                self.superficie(indice)
+
+    def desenhar(self, screen, x, y_tela, topo, altura, cor_separador=(90, 90, 90)):
+        """
+        Desenha a parte do documento entre 'topo' e 'topo + altura' a partir de (x, y_tela).
+        A tela é recortada nessa faixa para que as linhas parciais não invadam as margens.
+        """
+        inicio, fim = self.intervalo_visivel(topo, altura)
+        self.preparar(inicio, fim)
+        recorte_anterior = screen.get_clip()
+        screen.set_clip(pygame.Rect(0, y_tela, screen.get_width(), altura))
+        largura = screen.get_width() - 2 * x
+        for indice in range(inicio, fim):
+            linha = self.documento.linhas[indice]
+            y = y_tela + linha.y - topo
+            if linha.estilo == SEPARADOR:
+                pygame.draw.line(screen, cor_separador, (x, y + linha.altura // 2), (x + largura, y + linha.altura // 2))
+            else:
+                screen.blit(self._superficies[indice], (x + linha.x, y))
+        screen.set_clip(recorte_anterior)
+
+    def get_estatisticas(self):
+        return {
+            'linhas_diagramadas': len(self.documento.linhas),
+            'residentes': len(self._superficies),
+            'maior_residente': self.maior_residente,
+            'renderizadas': self.renderizadas,
+            'descartadas': self.descartadas
+        }
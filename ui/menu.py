@@ -4,6 +4,7 @@
 from ..settings import FONTE_PATH, FONTE_BOLD_PATH, VERMELHO, VERMELHO, PRETO, BRANCO
 from .screens import EndScreen
 from .screens import MenuBackground  
+from ..recursos import recursos
 import pygame
 
 class MainMenu:
@@ -11,9 +12,9 @@ class MainMenu:
 
     def __init__(self):
         self.background = MenuBackground()
-        self.font_title = pygame.font.Font(FONTE_BOLD_PATH, 60)
-        self.font_subtitle = pygame.font.Font(FONTE_BOLD_PATH, 30)
-        self.font = pygame.font.Font(FONTE_PATH, 30)
+        self.font_title = recursos.fonte(FONTE_BOLD_PATH, 60)
+        self.font_subtitle = recursos.fonte(FONTE_BOLD_PATH, 30)
+        self.font = recursos.fonte(FONTE_PATH, 30)
         self.options = ["Iniciar Jogo", "Readme" ,"Sair"]
         self.selected_option = 0
 
@@ -1,7 +1,11 @@
 # ui/screens.py
 # Define as classes para as telas de carregamento e final.
 
-from ..settings import LARGURA_TELA, ALTURA_TELA, PASTA_IMAGENS, FONTE_PATH, BRANCO, PRETO
+from ..settings import LARGURA_TELA, ALTURA_TELA, FONTE_PATH, FONTE_BOLD_PATH, BRANCO, PRETO
+from ..recursos import recursos # Cache compartilhado de imagens, fontes e sons
+from ..audio import audio, VOZ  # Os áudios dos slides são narrações longas, tocadas em streaming
+from .documento import (interpretar_markdown, DocumentoDiagramado, CacheLinhas, Bloco,  # Leitura do README
+                        TITULO_1, TITULO_2, TITULO_3, TEXTO, LISTA, CODIGO)
 import pygame   # Importa a biblioteca Pygame para manipulação de gráficos, som e eventos
 import os   # Importa a biblioteca os para manipulação de caminhos de arquivos e diretórios
 
@@ -9,8 +13,8 @@ class MenuBackground:
     """Classe para o fundo do menu principal."""
     
     def __init__(self):
-        self.image = pygame.image.load(os.path.join(PASTA_IMAGENS, "menubackground.png"))   # Carrega a imagem do fundo do menu
-        self.image = pygame.transform.scale(self.image, (LARGURA_TELA, ALTURA_TELA))    # Redimensiona a imagem para o tamanho da tela
+        # Fundo opaco: convert() (sem alpha) deixa o blit de tela cheia bem mais barato
+        self.image = recursos.imagem("menubackground.png", (LARGURA_TELA, ALTURA_TELA), alpha=False)
         self.rect = self.image.get_rect()   # Obtém o retângulo da imagem para posicionamento
 
     def draw(self, screen):
@@ -20,6 +24,13 @@ class LoadingScreenToGame:
     """
     Exibe uma sequência de imagens por durações específicas,
     sincronizada com um áudio.
+    Nada é carregado na construção: start() carrega só o primeiro slide, e
+    a imagem do slide seguinte é pré-carregada em segundo plano
+    (recursos.pre_carregar) enquanto o atual é exibido. Imagens repetidas na
+    lista são carregadas uma única vez, e o que já foi exibido (e não
+    aparece de novo) é liberado do cache. Os áudios tocam pelo gerenciador
+    de áudio, na categoria VOZ: os longos em streaming, sem decodificação
+    prévia, e os curtos decodificados junto com a imagem do slide.
     """
 
     def __init__(self, images, durations, audio_path=None, initial_audio_delay=0.0):
@@ -29,29 +40,16 @@ class LoadingScreenToGame:
             durations (list): Lista de durações em segundos para cada imagem.
             audio_path (str, optional): Caminho para o arquivo de áudio. Defaults to None.
         """
-        # Carrega e escala as imagens para o tamanho da tela
-        self.images = [
-            pygame.transform.scale(
-                pygame.image.load(os.path.join(PASTA_IMAGENS, img)),
-                (LARGURA_TELA, ALTURA_TELA)
-            ) for img in images
-        ]
+        self.nomes_imagens = list(images)   # Só os nomes: o carregamento acontece em start()
         self.durations = durations  # Durações em segundos para cada imagem
-        
-        # O caminho do áudio está pronto para o futuro, mas pode ser None por enquanto
-        self.sounds = []    
-        if audio_path:
-            from .. settings import PASTA_AUDIO
-            for audio_file in audio_path:
-                path = os.path.join(PASTA_AUDIO, audio_file)
-                if os.path.exists(path):
-                    self.sounds.append(pygame.mixer.Sound(path))
-                else:
-                    print(f"Áudio {audio_file} não encontrado em {PASTA_AUDIO}.")
-                    self.sounds.append(None)
+        self.nomes_sons = list(audio_path) if audio_path else []    # Um som (ou nenhum) por imagem
         # Calcula a duração total da animação somando as durações individuais
         self.total_duration = sum(self.durations)
 
+        # Pedidos de carregamento por nome de arquivo (nomes repetidos compartilham o pedido)
+        self._pedidos_imagens = {}
+        self.imagem_atual = None    # Superfície do slide exibido (a anterior, enquanto a nova não fica pronta)
+
         # Variáveis de estado
         self.current_image_index = -1   # Índice da imagem atual, começa em -1 para indicar que nenhuma imagem foi mostrada
         self.start_time = None  # Tempo em que a tela de carregamento foi iniciada
@@ -61,14 +59,66 @@ class LoadingScreenToGame:
         self.audio_start_time = 0 # Tempo em que o áudio deveria começar a tocar (start_time + delay)
         self.first_audio_played = False # Flag para garantir que o primeiro áudio só toque uma vez
 
+    # --- Carregamento sob demanda ---
+    @staticmethod
+    def _carregar_imagem(nome):
+        return recursos.imagem(nome, (LARGURA_TELA, ALTURA_TELA), alpha=False)
+
+    def _pre_carregar(self, indice):
+        """Pede (sem esperar) a imagem do slide 'indice' e, se o áudio dele for curto, a decodificação do áudio."""
+        if indice >= len(self.nomes_imagens):
+            return
+        nome = self.nomes_imagens[indice]
+        if nome not in self._pedidos_imagens:
+            self._pedidos_imagens[nome] = recursos.pre_carregar(self._carregar_imagem, nome)
+        if indice < len(self.nomes_sons):
+            audio.pre_carregar(self.nomes_sons[indice]) # Os longos tocam em streaming e não são pedidos
+
+    def _imagem_pronta(self, indice):
+        """Superfície do slide 'indice', ou None se ainda estiver carregando."""
+        pedido = self._pedidos_imagens.get(self.nomes_imagens[indice])
+        return pedido.resultado if pedido is not None and pedido.pronto else None
+
+    def _tocar_som(self, indice):
+        """Toca o áudio do slide 'indice' (se houver) no lugar do que estiver tocando na categoria VOZ."""
+        audio.parar(VOZ)
+        if indice < len(self.nomes_sons):
+            audio.tocar(self.nomes_sons[indice], VOZ)
+
+    def _liberar(self, indice):
+        """Libera a imagem de um slide que já passou, se não for usada de novo adiante."""
+        nome = self.nomes_imagens[indice]
+        if nome not in self.nomes_imagens[indice + 1:]:
+            pedido = self._pedidos_imagens.pop(nome, None)
+            if pedido is not None:
+                pedido.cancelar()
+            recursos.descartar_imagem(nome, (LARGURA_TELA, ALTURA_TELA), alpha=False)
+
+    def _liberar_tudo(self):
+        """Cancela o que ainda não carregou e libera todos os slides do cache."""
+        for nome, pedido in self._pedidos_imagens.items():
+            pedido.cancelar()
+            recursos.descartar_imagem(nome, (LARGURA_TELA, ALTURA_TELA), alpha=False)
+        self._pedidos_imagens.clear()
+        self.imagem_atual = None
 
     def start(self):    # Inicia a tela de carregamento, resetando o estado e preparando para mostrar as imagens
         print("Iniciando a tela de carregamento...")    # Mensagem de depuração para indicar que a tela de carregamento foi iniciada
+        self._liberar_tudo()    # Sobras de uma execução anterior interrompida
+        self._pre_carregar(0)
+        self._pedidos_imagens[self.nomes_imagens[0]].esperar()  # O primeiro slide precisa estar pronto já no primeiro frame
+        self._pre_carregar(1)
         self.start_time = pygame.time.get_ticks()   # Obtém o tempo atual em milissegundos desde que o Pygame foi iniciado
         self.current_image_index = -1   # Reseta o índice da imagem atual para -1, indicando que nenhuma imagem foi mostrada ainda
         self.finished = False   # Marca a tela como não finalizada, permitindo que o update e draw funcionem
         self.audio_start_time = self.start_time + (self.initial_audio_delay * 1000) # Convertendo segundos para milissegundos
         self.first_audio_played = False # Reseta a flag para uma nova execução
+
+    def finish(self):
+        """Encerra a tela (fim natural ou ESPAÇO): para o áudio e libera os slides."""
+        self.finished = True
+        audio.parar(VOZ)    # Para a narração (a música de fundo continua)
+        self._liberar_tudo()
         
     def update(self):       
         if self.finished or self.start_time is None:
@@ -80,16 +130,13 @@ class LoadingScreenToGame:
         # elapsed_time = (pygame.time.get_ticks() - self.start_time) / 1000
 
         if elapsed_time >= self.total_duration:
-            self.finished = True
-            pygame.mixer.stop() # Para qualquer som que ainda esteja tocando
+            self.finish()
             print("Tela de carregamento finalizada.")
             return
         
-        if not self.first_audio_played and self.sounds and self.sounds[0]:
-            if current_time >= self.audio_start_time:
-                pygame.mixer.stop() # Para qualquer som anterior (como o do menu, se ele não parou)
-                self.sounds[0].play()
-                self.first_audio_played = True # Marca que o primeiro áudio já foi tocado
+        if not self.first_audio_played and current_time >= self.audio_start_time:
+            self._tocar_som(0)  # Também para o som anterior (como o do menu, se ele não parou)
+            self.first_audio_played = True # Marca que o primeiro áudio já foi tocado
 
 
         # Descobre o índice da imagem atual
@@ -103,46 +150,39 @@ class LoadingScreenToGame:
 
         # Se o índice da imagem mudou, toca o novo som
         if target_index != self.current_image_index:
-            # Se for a primeira imagem, e o áudio dela já foi tocado pela lógica de atraso,
-            # ou se não há som para essa imagem, não precisamos pará-lo ou tocá-lo novamente aqui.
-            # Caso contrário, para o som anterior para tocar o novo.
-            if self.current_image_index != -1: # Se não é a primeira atualização
-                pygame.mixer.stop() # Para o som da imagem anterior
+            # O som do primeiro slide é tocado pela lógica de atraso; nos demais,
+            # o som da imagem anterior é parado e o novo começa na troca de slide.
+            anterior = self.current_image_index
+            if target_index > 0:
+                self._tocar_som(target_index)
 
             self.current_image_index = target_index
+            self._pre_carregar(target_index)    # Normalmente já pedido (ou pronto) desde o slide anterior
+            self._pre_carregar(target_index + 1)    # Adianta o próximo enquanto este é exibido
+            if anterior != -1:
+                for indice in range(anterior, target_index):    # Slides pulados também são liberados
+                    self._liberar(indice)
 
-            # Toca o som correspondente, se ele existir e se não for o primeiro áudio já tocado
-            if self.current_image_index < len(self.sounds) and self.sounds[self.current_image_index]:
-                if self.current_image_index == 0: # Se for a primeira imagem
-                    if self.first_audio_played: # E o áudio dela JÁ foi tocado pelo atraso
-                        # Não faz nada, pois o áudio já está tocando ou já terminou
-                        pass
-                    else:
-                        pass
-                else: # Para qualquer outra imagem (índice > 0)
-                    self.sounds[self.current_image_index].play()
+        # Troca de imagem só quando o carregamento em segundo plano terminar: nada bloqueia o frame
+        imagem = self._imagem_pronta(self.current_image_index)
+        if imagem is not None:
+            self.imagem_atual = imagem
                     
     def draw(self, screen):
-        if not self.finished and self.images and self.current_image_index != -1:
-            current_image = self.images[self.current_image_index]
-            screen.blit(current_image, (0, 0))
-            try:
-                from ..settings import FONTE_PATH, BRANCO
-                font_pular = pygame.font.Font(FONTE_PATH, 18)
-                texto_pular = font_pular.render("Pressione ESPAÇO para pular", True, BRANCO)
-                # Posiciona no canto inferior direito
-                pos_x = LARGURA_TELA - texto_pular.get_width() - 20
-                pos_y = ALTURA_TELA - texto_pular.get_height() - 20
-                screen.blit(texto_pular, (pos_x, pos_y))
-            except:
-                pass # Se falhar, simplesmente não desenha o texto
+        if not self.finished and self.imagem_atual is not None:
+            screen.blit(self.imagem_atual, (0, 0))
+            font_pular = recursos.fonte(FONTE_PATH, 18)
+            texto_pular = font_pular.render("Pressione ESPAÇO para pular", True, BRANCO)
+            # Posiciona no canto inferior direito
+            pos_x = LARGURA_TELA - texto_pular.get_width() - 20
+            pos_y = ALTURA_TELA - texto_pular.get_height() - 20
+            screen.blit(texto_pular, (pos_x, pos_y))
 
 class GameBackground:
     """Classe para o fundo do jogo."""
     
     def __init__(self):
-        self.image = pygame.image.load(os.path.join(PASTA_IMAGENS, "gamebackground.png"))
-        self.image = pygame.transform.scale(self.image, (LARGURA_TELA, ALTURA_TELA))
+        self.image = recursos.imagem("gamebackground.png", (LARGURA_TELA, ALTURA_TELA), alpha=False)
         self.rect = self.image.get_rect()
 
     def draw(self, screen):
@@ -153,8 +193,7 @@ class EndScreen:
     """Classe para a tela final do jogo."""
     
     def __init__(self):
-        self.image = pygame.image.load(os.path.join(PASTA_IMAGENS, "gamebackground.png"))
-        self.image = pygame.transform.scale(self.image, (LARGURA_TELA, ALTURA_TELA))
+        self.image = recursos.imagem("gamebackground.png", (LARGURA_TELA, ALTURA_TELA), alpha=False)
         self.rect = self.image.get_rect()
 
     def draw(self, screen):
@@ -165,35 +204,49 @@ class EndScreen:
 
 class ReadmeScreen:
     """
-    Uma tela que exibe o conteúdo de um arquivo de texto com funcionalidade de rolagem.
+    Uma tela que exibe um arquivo markdown com funcionalidade de rolagem.
+    O arquivo é interpretado e diagramado à medida que a rolagem avança
+    (títulos, listas e código, com as linhas longas quebradas na largura da
+    tela); só as linhas perto da parte visível viram superfícies (ver ui/documento.py).
     """
+    MARGEM_X = 50   # Margem esquerda e direita do texto
+    TOPO = 50   # Início da área do texto
+    RODAPE = 40 # Espaço da instrução de navegação
+
     def __init__(self, filepath, font_size=18, line_height=22):
         """
         Inicializa a tela do Readme.
         Args:
-            filepath (str): Caminho para o arquivo .txt a ser lido.
+            filepath (str): Caminho para o arquivo .md a ser lido.
             font_size (int): Tamanho da fonte para o texto.
-            line_height (int): Espaçamento vertical entre as linhas.
+            line_height (int): Espaçamento vertical entre as linhas de texto (também é o passo da rolagem).
         """
-        self.font = pygame.font.Font(FONTE_PATH, font_size) # Carrega a fonte do arquivo especificado
         self.line_height = line_height  # Define a altura de cada linha de texto
-        self.lines_surfaces = []    # Lista para armazenar as superfícies de texto renderizadas
         self.scroll_y = 0  # Deslocamento vertical atual da rolagem
-        self.total_height = 0   # Altura total do texto, usada para limitar a rolagem
-        # Carrega e renderiza cada linha do arquivo de texto
-        try:   
+        self.altura_area = ALTURA_TELA - self.TOPO - self.RODAPE   # Altura da área visível do texto
+        fontes = {
+            TITULO_1: recursos.fonte(FONTE_BOLD_PATH, font_size + 12),
+            TITULO_2: recursos.fonte(FONTE_BOLD_PATH, font_size + 6),
+            TITULO_3: recursos.fonte(FONTE_BOLD_PATH, font_size + 2),
+            TEXTO: recursos.fonte(FONTE_PATH, font_size),
+            CODIGO: recursos.fonte(FONTE_PATH, font_size - 2)
+        }
+        cores = {TITULO_1: (255, 215, 0), TITULO_2: (255, 215, 0), TITULO_3: BRANCO,
+                 TEXTO: BRANCO, LISTA: BRANCO, CODIGO: (170, 220, 170)}
+        # Lê o arquivo; a interpretação e a diagramação acontecem sob demanda, no draw()
+        try:
             with open(filepath, 'r', encoding='utf-8') as f:    # Abre o arquivo de texto para leitura
-                lines = f.readlines()   # Lê todas as linhas do arquivo
-                for line in lines:  # Itera sobre cada linha
-                    line_surface = self.font.render(line.strip(), True, BRANCO) # Renderiza a linha como uma superfície de texto
-                    self.lines_surfaces.append(line_surface)    # Adiciona a superfície renderizada à lista de superfícies
-            self.total_height = len(self.lines_surfaces) * self.line_height # Calcula a altura total do texto baseado no número de linhas e na altura de cada linha
+                blocos = interpretar_markdown(f.read().splitlines())
         except FileNotFoundError:   # Tenta abrir o arquivo, mas captura o erro se não for encontrado
             print(f"AVISO: Arquivo do Readme não encontrado em {filepath}") # Exibe um aviso no console se o arquivo não for encontrado
-            error_msg = "Arquivo README.txt não encontrado na raiz do projeto!" 
-            error_surface = self.font.render(error_msg, True, (255, 100, 100))  # Renderiza uma mensagem de erro em vermelho
-            self.lines_surfaces.append(error_surface)   # Adiciona uma mensagem de erro à lista de superfícies
-            self.total_height = self.line_height    # Define a altura total como a altura de uma linha, pois só há uma mensagem de erro
+            blocos = [Bloco(TEXTO, f"Arquivo {os.path.basename(filepath)} não encontrado na raiz do projeto!", 0)]
+            cores[TEXTO] = (255, 100, 100)  # Mensagem de erro em vermelho
+        espacamento = line_height / fontes[TEXTO].get_linesize()
+        self.documento = DocumentoDiagramado(blocos, fontes, LARGURA_TELA - 2 * self.MARGEM_X, espacamento)
+        self.cache = CacheLinhas(self.documento, cores) # Superfícies só das linhas perto da parte visível
+        # Instrução fixa de como navegar e sair (renderizada uma única vez)
+        self.instrucao_text = recursos.fonte(FONTE_PATH, 16).render(
+            "Use as SETAS ou o SCROLL do mouse para navegar | Pressione ESC para voltar", True, (150, 150, 150))
 
     def handle_event(self, event):
         """Processa eventos de input para rolagem."""
@@ -204,24 +257,25 @@ class ReadmeScreen:
                 self.scroll_y -= scroll_speed   # Rola para cima
             elif event.key == pygame.K_DOWN:    # Se a tecla pressionada for a seta para baixo
                 self.scroll_y += scroll_speed   # Rola para baixo
+            elif event.key == pygame.K_PAGEUP:
+                self.scroll_y -= self.altura_area - self.line_height
+            elif event.key == pygame.K_PAGEDOWN:
+                self.scroll_y += self.altura_area - self.line_height
+            elif event.key == pygame.K_HOME:
+                self.scroll_y = 0
+            elif event.key == pygame.K_END:
+                self.documento.diagramar_tudo() # Único caso em que o documento inteiro é diagramado
+                self.scroll_y = self.documento.altura
         elif event.type == pygame.MOUSEWHEEL:   # Verifica se a roda do mouse foi rolada
             self.scroll_y -= event.y * scroll_speed # Rola para cima ou para baixo baseado na direção da roda do mouse
         # Limita a rolagem para não sair do texto
         self.scroll_y = max(0, self.scroll_y) # Limite superior (não rolar acima do início)
-        max_scroll = self.total_height - ALTURA_TELA + 100 # Limite inferior
+        self.documento.diagramar_ate(self.scroll_y + self.altura_area)  # O fim do texto só é conhecido quando diagramado
+        max_scroll = self.documento.altura - self.altura_area # Limite inferior: a última linha fica no fim da área
         self.scroll_y = min(max_scroll, self.scroll_y) if max_scroll > 0 else 0
+
     def draw(self, screen):
-        """Desenha o texto rolável na tela."""
+        """Desenha a parte visível do texto."""
         screen.fill(PRETO)  # Limpa a tela com a cor preta
-        y_pos = 50 # Margem superior inicial
-        for line_surface in self.lines_surfaces:
-            # Posição de desenho é ajustada pela rolagem atual
-            draw_pos_y = y_pos - self.scroll_y
-            # Verifica se a linha está dentro da área visível da tela
-            if draw_pos_y > -self.line_height and draw_pos_y < ALTURA_TELA:
-                screen.blit(line_surface, (50, draw_pos_y)) # Margem esquerda de 50px
-            y_pos += self.line_height
-        # Instrução fixa de como navegar e sair
-        instrucao_font = pygame.font.Font(FONTE_PATH, 16)
-        instrucao_text = instrucao_font.render("Use as SETAS ou o SCROLL do mouse para navegar | Pressione ESC para voltar", True, (150, 150, 150))
-        screen.blit(instrucao_text, (20, ALTURA_TELA - 30))
\ No newline at end of file
+        self.cache.desenhar(screen, self.MARGEM_X, self.TOPO, self.scroll_y, self.altura_area)
+        screen.blit(self.instrucao_text, (20, ALTURA_TELA - 30))